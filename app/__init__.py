@@ -22,4 +22,8 @@ def create_app():
     app.register_blueprint(master_bp)
     app.register_blueprint(schedule_bp)
 
+    # CLI 명령 (flask --app app reset-defects ...)
+    from .cli import register_commands
+    register_commands(app)
+
     return app
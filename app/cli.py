@@ -0,0 +1,139 @@
+#Flask CLI 명령 (create_app 에서 등록)
+## reset-defects : 테스트 환경 초기화. API 를 거치지 않고 DB 에 set-based UPDATE/DELETE 몇 번, 한 트랜잭션
+##   결함 상태 → pending, 그 결함을 작업 중인 용접공 → available, (--history) 스케쥴 이력 삭제
+##   실행: flask --app app reset-defects --dry-run
+
+import time
+from datetime import datetime, timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import DateTime, select, update, delete, func
+from app.extensions import db
+from app.models import Defect, Welder, ScheduleBatch, ScheduleJob, ScheduledDefect, OptimizationCacheEntry
+
+RESETTABLE_DEFECT_STATUSES = ['in_progress', 'completed']
+
+
+def date_criteria(column, date_from, date_to):
+    """
+    [date_from, date_to] (날짜 포함) 조건 목록. date_from/date_to 는 date
+    Date 컬럼(target_date)은 date 그대로, DateTime 컬럼(created_at)만 그날 자정 datetime 으로 비교
+    """
+    lower = date_from
+    upper = date_to + timedelta(days=1) if date_to else None
+    if isinstance(column.type, DateTime):
+        lower, upper = (datetime.combine(day, datetime.min.time()) if day else None for day in (lower, upper))
+
+    criteria = []
+    if lower:
+        criteria.append(column >= lower)
+    if upper:
+        criteria.append(column < upper)
+    return criteria
+
+
+def reset_steps(statuses, date_from, date_to, reset_welders, reset_history):
+    """[(이름, 대상 행 수 쿼리, 실행할 문장)] 실행 순서대로 (결함 상태가 바뀌기 전에 용접공부터)"""
+    defect_criteria = [Defect.status.in_(statuses)] + date_criteria(Defect.created_at, date_from, date_to)
+    defect_ids = select(Defect.defect_id).where(*defect_criteria)
+
+    steps = []
+    if reset_welders:
+        welder_criteria = [Welder.current_defect_id.in_(defect_ids)]
+        steps.append((
+            'welders',
+            select(func.count()).select_from(Welder).where(*welder_criteria),
+            update(Welder).where(*welder_criteria).values(status='available', current_defect_id=None)
+        ))
+
+    if reset_history:
+        # 스케쥴 이력은 배치 날짜(target_date) 기준. 남는 배치가 지워지는 배치를 parent 로 가리키면 끊음
+        batch_criteria = date_criteria(ScheduleBatch.target_date, date_from, date_to)
+        batch_ids = select(ScheduleBatch.batch_id).where(*batch_criteria)
+
+        steps += [
+            (
+                'optimization cache entries',
+                select(func.count()).select_from(OptimizationCacheEntry).where(OptimizationCacheEntry.batch_id.in_(batch_ids)),
+                delete(OptimizationCacheEntry).where(OptimizationCacheEntry.batch_id.in_(batch_ids))
+            ),
+            (
+                'scheduled defect index rows',
+                select(func.count()).select_from(ScheduledDefect).where(ScheduledDefect.batch_id.in_(batch_ids)),
+                delete(ScheduledDefect).where(ScheduledDefect.batch_id.in_(batch_ids))
+            ),
+            (
+                'schedule jobs',
+                select(func.count()).select_from(ScheduleJob).where(ScheduleJob.batch_id.in_(batch_ids)),
+                delete(ScheduleJob).where(ScheduleJob.batch_id.in_(batch_ids))
+            ),
+            (
+                'batch revisions unlinked',
+                select(func.count()).select_from(ScheduleBatch).where(ScheduleBatch.parent_batch_id.in_(batch_ids)),
+                update(ScheduleBatch).where(ScheduleBatch.parent_batch_id.in_(batch_ids)).values(parent_batch_id=None)
+            ),
+            (
+                'schedule batches',
+                select(func.count()).select_from(ScheduleBatch).where(*batch_criteria),
+                delete(ScheduleBatch).where(*batch_criteria)
+            )
+        ]
+
+    steps.append((
+        'defects',
+        select(func.count()).select_from(Defect).where(*defect_criteria),
+        update(Defect).where(*defect_criteria).values(status='pending')
+    ))
+    return steps
+
+
+@click.command('reset-defects')
+@click.option('--status', 'statuses', multiple=True, type=click.Choice(RESETTABLE_DEFECT_STATUSES),
+              help='pending 으로 되돌릴 결함 상태 (여러 번 지정 가능, 기본: 전부)')
+@click.option('--from', 'date_from', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='이 날짜부터 (결함은 created_at, 스케쥴 이력은 target_date 기준)')
+@click.option('--to', 'date_to', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='이 날짜까지 (포함)')
+@click.option('--welders/--no-welders', 'reset_welders', default=True,
+              help='되돌린 결함을 작업 중인 용접공을 available 로 (기본: 예)')
+@click.option('--history', 'reset_history', is_flag=True,
+              help='스케쥴 이력(배치, 작업, 확정 색인, 결과 캐시)도 삭제')
+@click.option('--dry-run', is_flag=True, help='바꾸지 않고 대상 행 수만 출력')
+@with_appcontext
+def reset_defects_command(statuses, date_from, date_to, reset_welders, reset_history, dry_run):
+    """결함 상태 일괄 초기화 (테스트 환경용)"""
+    # click.DateTime 은 datetime → 날짜만
+    date_from = date_from.date() if date_from else None
+    date_to = date_to.date() if date_to else None
+    if date_from and date_to and date_from > date_to:
+        raise click.BadParameter('--from must not be after --to')
+
+    statuses = list(statuses) or RESETTABLE_DEFECT_STATUSES
+    steps = reset_steps(statuses, date_from, date_to, reset_welders, reset_history)
+
+    started = time.perf_counter()
+    try:
+        for name, count_query, statement in steps:
+            if dry_run:
+                count = db.session.execute(count_query).scalar()
+            else:
+                count = db.session.execute(statement, execution_options={'synchronize_session': False}).rowcount
+            click.echo(f"   {name}: {count:,}")
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    elapsed = time.perf_counter() - started
+    if dry_run:
+        click.echo(f"🔍 Dry run, nothing changed ({elapsed:.2f}s)")
+    else:
+        click.echo(f"✅ Reset committed in {elapsed:.2f}s")
+
+
+def register_commands(app):
+    app.cli.add_command(reset_defects_command)
@@ -9,6 +9,9 @@ from app.models.welder import Welder
 from app.models.welder_skill import WelderSkill
 from app.models.schedule_batch import ScheduleBatch
 from app.models.schedule_job import ScheduleJob
+from app.models.master_data_version import MasterDataVersion
+from app.models.scheduled_defect import ScheduledDefect
+from app.models.optimization_cache import OptimizationCacheEntry
 
 __all__ = [
     'Location',
@@ -21,6 +24,9 @@ __all__ = [
     'Welder',
     'WelderSkill',
     'ScheduleBatch',
-    'ScheduleJob'
+    'ScheduleJob',
+    'MasterDataVersion',
+    'ScheduledDefect',
+    'OptimizationCacheEntry'
 ]
 
@@ -1,4 +1,6 @@
+from sqlalchemy import event
 from app.extensions import db
+from app.services.objective import calculate_severity_score
 from datetime import datetime
 
 class Defect(db.Model):
@@ -13,12 +15,28 @@ class Defect(db.Model):
     required_skill_id = db.Column(db.Integer, db.ForeignKey('skills.skill_id'), nullable=False)
     setup_type_id = db.Column(db.Integer, db.ForeignKey('setup_types.setup_type_id'), nullable=False)
     priority_factor = db.Column(db.Integer, nullable=False, default=1)  # 1-10, 1이 기본. 반장이 10까지 입력 가능
+    severity_score = db.Column(db.Float, nullable=False)  # calculate_severity_score 값, 저장할 때 자동 갱신 (migrations/007)
     rework_time = db.Column(db.Integer, nullable=False)  # 리워크 시간 (분)
     status = db.Column(db.String(20), nullable=False, default='pending')  # pending, in_progress, completed
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
+    # 인덱스 (migrations/003_hot_path_indexes.sql, 007_defect_severity_score.sql)
+    __table_args__ = (
+        db.Index('ix_defects_pending_location', 'location_id', postgresql_where=db.text("status = 'pending'")),  # 스케쥴 후보 선택
+        db.Index('ix_defects_status_created', 'status', 'created_at', 'defect_id'),  # GET /api/defects keyset
+        db.Index('ix_defects_status_severity', 'status', 'severity_score', 'defect_id'),  # GET /api/defects?sort=severity
+    )
+    
     welders = db.relationship('Welder', backref='current_defect_ref', lazy=True)
     schedule_jobs = db.relationship('ScheduleJob', backref='defect', lazy=True)
     
     def __repr__(self):
         return f'<Defect {self.defect_id}: Type {self.defect_type} at Location {self.location_id}>'
+
+
+#심각도 점수는 저장할 때마다 다시 계산 (priority_factor, p_in/p_out, defect_type 변경 반영)
+## 벌크 UPDATE/COPY 처럼 ORM 을 안 거치는 경로는 severity_scores() 로 직접 계산해서 넣어야 함
+@event.listens_for(Defect, 'before_insert')
+@event.listens_for(Defect, 'before_update')
+def update_severity_score(mapper, connection, defect):
+    defect.severity_score = calculate_severity_score(defect)
@@ -0,0 +1,13 @@
+from app.extensions import db
+from datetime import datetime
+
+class MasterDataVersion(db.Model):
+    __tablename__ = 'master_data_version'
+    
+    # 행 하나 (id=1). 기준정보(location, setup_types, skills, travel_matrix, concurrent_restrictions)가 바뀌면 DB 트리거가 version + 1
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<MasterDataVersion {self.version}>'
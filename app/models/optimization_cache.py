@@ -0,0 +1,23 @@
+from app.extensions import db
+from datetime import datetime
+
+class OptimizationCacheEntry(db.Model):
+    __tablename__ = 'optimization_cache'
+    
+    # /optimize2 풀이 입력 fingerprint → 그때 만든 배치 (app/services/result_cache.py)
+    fingerprint = db.Column(db.String(64), primary_key=True)  # sha256 hex
+    batch_id = db.Column(db.BigInteger, db.ForeignKey('schedule_batches.batch_id', ondelete='CASCADE'), nullable=False)
+    target_date = db.Column(db.Date, nullable=False)
+    target_session = db.Column(db.String(10), nullable=False)
+    formulation = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # LRU 기준
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.Index('ix_optimization_cache_slot', 'target_date', 'target_session', 'last_used_at'),  # 같은 슬롯 warm start
+        db.Index('ix_optimization_cache_last_used', 'last_used_at'),  # LRU 정리
+    )
+    
+    def __repr__(self):
+        return f'<OptimizationCacheEntry {self.fingerprint[:12]}: Batch {self.batch_id}>'
@@ -9,6 +9,19 @@ class ScheduleBatch(db.Model):
     target_session = db.Column(db.String(10), nullable=False)  # morning, afternoon, night
     status = db.Column(db.String(20), nullable=False, default='draft')  # draft, confirmed, in_progress
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    parent_batch_id = db.Column(db.BigInteger, db.ForeignKey('schedule_batches.batch_id'), nullable=True)  # repair revision 의 원래 배치
+    
+    # 최적화 결과 지표 (migrations/006_schedule_batch_metrics.sql), 스케쥴러가 안 남기면 NULL
+    total_travel_cost = db.Column(db.Integer, nullable=True)  # 이동 시간 합(분)
+    total_setup_cost = db.Column(db.Integer, nullable=True)  # 셋업 시간 합(분)
+    solver_time = db.Column(db.Float, nullable=True)  # 풀이 시간(초)
+    formulation = db.Column(db.String(20), nullable=True)  # pairwise, circuit (greedy 는 NULL)
+    
+    # 인덱스 (migrations/003_hot_path_indexes.sql, 004_schedule_batch_revisions.sql)
+    __table_args__ = (
+        db.Index('ix_schedule_batches_slot', 'target_date', 'target_session', 'status', 'created_at'),  # 날짜/세션별 최근 배치
+        db.Index('ix_schedule_batches_parent', 'parent_batch_id'),  # repair revision 목록
+    )
     
     schedule_jobs = db.relationship('ScheduleJob', backref='batch', lazy=True)
     
@@ -13,6 +13,12 @@ class ScheduleJob(db.Model):
     estimated_end_time = db.Column(db.DateTime, nullable=False)
     status = db.Column(db.String(20), nullable=False, default='pending')  # pending, started, completed, delayed
     
+    # 인덱스 (migrations/003_hot_path_indexes.sql)
+    __table_args__ = (
+        db.Index('ix_schedule_jobs_batch_order', 'batch_id', 'job_order'),  # 배치 조회
+        db.Index('ix_schedule_jobs_batch_welder', 'batch_id', 'welder_id'),  # 용접공 티켓
+    )
+    
     def __repr__(self):
         return f'<ScheduleJob {self.job_id}: Batch {self.batch_id} Order {self.job_order} ({self.status})>'
 
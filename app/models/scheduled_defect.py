@@ -0,0 +1,15 @@
+from app.extensions import db
+from datetime import datetime
+
+class ScheduledDefect(db.Model):
+    __tablename__ = 'scheduled_defects'
+    
+    # 확정(confirmed) 배치에 들어간 결함 색인. /confirm 때 추가, 같은 날짜/세션의 다른 배치가 확정되면 삭제
+    defect_id = db.Column(db.BigInteger, db.ForeignKey('defects.defect_id'), primary_key=True)
+    batch_id = db.Column(db.BigInteger, db.ForeignKey('schedule_batches.batch_id'), primary_key=True, index=True)
+    target_date = db.Column(db.Date, nullable=False)
+    session_order = db.Column(db.SmallInteger, nullable=False)  # 1: morning, 2: afternoon, 3: night
+    confirmed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ScheduledDefect {self.defect_id}: Batch {self.batch_id} ({self.target_date} #{self.session_order})>'
@@ -1,49 +1,127 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
-from app.models import Defect, Location, Skill, SetupType
-from app.services.objective import calculate_severity_score, DEFECT_TYPES, CRITICAL_DEFECT_TYPES
+from sqlalchemy import tuple_
+from app.models import Defect
+from app.services.master_data import master_data_cache
+from app.services.objective import DEFECT_TYPES, CRITICAL_DEFECT_TYPES
+from app.services.severity import update_priorities
+from app.utils.pagination import parse_limit, parse_fields, encode_cursor, decode_cursor
 from app.extensions import db
 
 defect_bp = Blueprint('defects', __name__, url_prefix='/api/defects')
 
 
+DEFECT_FIELDS = [
+    'defect_id', 'pipe_id', 'location_id', 'location_name', 'defect_type', 'defect_type_name',
+    'is_critical', 'p_in', 'p_out', 'severity_score', 'required_skill_id', 'required_skill',
+    'setup_type_id', 'setup_type_name', 'priority_factor', 'rework_time', 'status', 'created_at'
+]
+
+# 컬럼 이름과 다른 응답 필드 → 필요한 컬럼 (나머지 필드는 같은 이름의 컬럼)
+## GET /api/defects 는 fields= 로 고른 필드에 필요한 컬럼만 SELECT
+FIELD_COLUMNS = {
+    'location_name': 'location_id',
+    'defect_type_name': 'defect_type',
+    'is_critical': 'defect_type',
+    'required_skill': 'required_skill_id',
+    'setup_type_name': 'setup_type_id'
+}
+
+# 값을 가공하는 필드 (row, 기준정보) → 응답 값
+FIELD_FORMATTERS = {
+    'location_name': lambda row, master_data: master_data.location_name(row.location_id),
+    'defect_type_name': lambda row, master_data: DEFECT_TYPES.get(row.defect_type, 'Unknown'),
+    'is_critical': lambda row, master_data: row.defect_type in CRITICAL_DEFECT_TYPES,
+    'severity_score': lambda row, master_data: round(row.severity_score, 2),
+    'required_skill': lambda row, master_data: master_data.skill_name(row.required_skill_id),
+    'setup_type_name': lambda row, master_data: master_data.setup_name(row.setup_type_id),
+    'created_at': lambda row, master_data: row.created_at.strftime('%Y-%m-%d %H:%M:%S')
+}
+
+# PATCH /batch-priority 한 번에 받는 최대 개수
+MAX_BATCH_PRIORITY_ITEMS = 10000
+
+# 정렬: created(생성 순, 기본) / severity(심각도 높은 순, 같으면 최근 결함 먼저)
+DEFECT_SORTS = ['created', 'severity']
+
+
+def is_int(value):
+    """JSON 정수만 (True/False 는 파이썬에서 int 라서 따로 제외)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
 @defect_bp.route('', methods=['GET'])
 def get_defects():
     status = request.args.get('status', 'pending')
     
-    defects = Defect.query.filter_by(status=status).all()
+    # ?limit=100&cursor=...&fields=defect_id,severity_score&sort=severity
+    ## limit/cursor 가 없으면 예전처럼 전부 (페이지네이션은 요청한 클라이언트만)
+    paginated = 'limit' in request.args or 'cursor' in request.args
+    sort = request.args.get('sort', 'created')
+    if sort not in DEFECT_SORTS:
+        return jsonify({'error': f'sort must be one of {DEFECT_SORTS}'}), 400
+    
+    try:
+        limit = parse_limit(request.args.get('limit')) if paginated else None
+        fields = parse_fields(request.args.get('fields'), DEFECT_FIELDS)
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor, (float, int) if sort == 'severity' else (datetime, int)) if cursor else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # 구역/스킬/셋업 이름은 기준정보 캐시에서, (created_at, defect_id) 순 또는 (severity_score, defect_id) 역순 keyset
+    master_data = master_data_cache.get()
+    
+    # 요청한 필드 + keyset 키 컬럼만
+    sort_key = 'severity_score' if sort == 'severity' else 'created_at'
+    columns = ['defect_id', sort_key]
+    for field in fields:
+        column = FIELD_COLUMNS.get(field, field)
+        if column not in columns:
+            columns.append(column)
+    
+    query = db.session.query(*[getattr(Defect, column) for column in columns]).filter(Defect.status == status)
+    
+    if sort == 'severity':
+        if after:
+            query = query.filter(tuple_(Defect.severity_score, Defect.defect_id) < after)
+        query = query.order_by(Defect.severity_score.desc(), Defect.defect_id.desc())
+    else:
+        if after:
+            query = query.filter(tuple_(Defect.created_at, Defect.defect_id) > after)
+        query = query.order_by(Defect.created_at, Defect.defect_id)
+    
+    if paginated:
+        defects = query.limit(limit + 1).all()
+        has_more = len(defects) > limit
+        defects = defects[:limit]
+    else:
+        defects = query.all()
+        has_more = False
     
     result = []
     for defect in defects:
-        location = Location.query.get(defect.location_id)
-        skill = Skill.query.get(defect.required_skill_id)
-        setup = SetupType.query.get(defect.setup_type_id)
-        
-        severity_score = calculate_severity_score(defect)
-        
         result.append({
-            'defect_id': defect.defect_id,
-            'pipe_id': defect.pipe_id,
-            'location_id': defect.location_id,
-            'location_name': location.location_name if location else None,
-            'defect_type': defect.defect_type,
-            'defect_type_name': DEFECT_TYPES.get(defect.defect_type, 'Unknown'),
-            'is_critical': defect.defect_type in CRITICAL_DEFECT_TYPES,
-            'p_in': defect.p_in,
-            'p_out': defect.p_out,
-            'severity_score': round(severity_score, 2),
-            'required_skill_id': defect.required_skill_id,
-            'required_skill': f"{skill.process}-{skill.position}-{skill.material}" if skill else None,
-            'setup_type_id': defect.setup_type_id,
-            'setup_type_name': setup.setup_name if setup else None,
-            'priority_factor': defect.priority_factor,
-            'rework_time': defect.rework_time,
-            'status': defect.status,
-            'created_at': defect.created_at.strftime('%Y-%m-%d %H:%M:%S')
+            field: FIELD_FORMATTERS[field](defect, master_data) if field in FIELD_FORMATTERS else getattr(defect, field)
+            for field in fields
         })
     
+    next_cursor = None
+    if has_more:
+        last_defect = defects[-1]
+        next_cursor = encode_cursor(getattr(last_defect, sort_key), last_defect.defect_id)
+    
+    # count = 이 페이지의 결함 수, total = 이 상태의 전체 결함 수 (페이지네이션 안 하면 같음)
+    total = len(result)
+    if paginated:
+        total = db.session.query(db.func.count(Defect.defect_id)).filter(Defect.status == status).scalar()
+    
     return jsonify({
         'defects': result,
-        'total': len(result)
+        'count': len(result),
+        'total': total,
+        'limit': limit,
+        'next_cursor': next_cursor
     }), 200
 
 
@@ -56,7 +134,7 @@ def update_defect(defect_id):
     if 'priority_factor' in data:
         priority_factor = data['priority_factor']
         
-        if not isinstance(priority_factor, int) or priority_factor < 1 or priority_factor > 10:
+        if not is_int(priority_factor) or priority_factor < 1 or priority_factor > 10:
             return jsonify({'error': 'priority_factor must be between 1 and 10'}), 400
         
         defect.priority_factor = priority_factor
@@ -77,47 +155,73 @@ def update_defect(defect_id):
         'defect_id': defect.defect_id,
         'priority_factor': defect.priority_factor,
         'status': defect.status,
-        'severity_score': round(calculate_severity_score(defect), 2),
+        'severity_score': round(defect.severity_score, 2),  # 저장할 때 다시 계산된 값
         'message': 'Defect updated successfully'
     }), 200
 
 
 @defect_bp.route('/batch-priority', methods=['PATCH'])
 def batch_update_priority():
+    """우선순위 일괄 변경. 전체 검증 → 없는 결함 조회 한 번 → UPDATE 한 번 (새 심각도 같이 반환)"""
     data = request.json
     
     if not data or 'priorities' not in data:
         return jsonify({'error': 'priorities array is required'}), 400
     
     priorities = data['priorities']
+    if not isinstance(priorities, list) or not priorities:
+        return jsonify({'error': 'priorities must be a non-empty array'}), 400
+    
+    if len(priorities) > MAX_BATCH_PRIORITY_ITEMS:
+        return jsonify({'error': f'At most {MAX_BATCH_PRIORITY_ITEMS} priorities per request'}), 400
     
-    updated_count = 0
+    # 하나라도 잘못되면 아무것도 안 바꿈
+    updates = {}
     errors = []
     
     for item in priorities:
+        if not isinstance(item, dict):
+            errors.append(f"Invalid item: {item}")
+            continue
+        
         defect_id = item.get('defect_id')
         priority_factor = item.get('priority_factor')
         
-        if not defect_id or priority_factor is None:
+        if not is_int(defect_id) or defect_id < 1 or priority_factor is None:
             errors.append(f"Invalid item: {item}")
             continue
         
-        if not isinstance(priority_factor, int) or priority_factor < 1 or priority_factor > 10:
+        if not is_int(priority_factor) or priority_factor < 1 or priority_factor > 10:
             errors.append(f"Invalid priority_factor for defect {defect_id}: {priority_factor}")
             continue
         
-        defect = Defect.query.get(defect_id)
-        if not defect:
-            errors.append(f"Defect {defect_id} not found")
+        if defect_id in updates:
+            errors.append(f"Duplicate defect {defect_id}")
             continue
         
-        defect.priority_factor = priority_factor
-        updated_count += 1
+        updates[defect_id] = priority_factor
     
-    db.session.commit()
+    if errors:
+        return jsonify({'error': 'Invalid priorities, nothing was updated', 'errors': errors}), 400
+    
+    try:
+        severities, missing_ids = update_priorities(updates)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Priority update failed: {str(e)}'}), 500
     
     return jsonify({
-        'message': f'Updated {updated_count} defects',
-        'updated_count': updated_count,
-        'errors': errors if errors else None
+        'message': f'Updated {len(severities)} defects',
+        'updated_count': len(severities),
+        'defects': [
+            {
+                'defect_id': defect_id,
+                'priority_factor': priority_factor,
+                'severity_score': round(severities[defect_id], 2)
+            }
+            for defect_id, priority_factor in updates.items() if defect_id in severities
+        ],
+        'missing_ids': missing_ids,
+        'errors': [f"Defect {defect_id} not found" for defect_id in missing_ids] or None
     }), 200
@@ -1,5 +1,5 @@
-from flask import Blueprint, jsonify
-from app.models import Location, SetupType
+from flask import Blueprint, jsonify, request
+from app.services.master_data import master_data_cache
 from app.services.objective import DEFECT_TYPES, CRITICAL_DEFECT_TYPES
 
 master_bp = Blueprint('master', __name__, url_prefix='/api/master')
@@ -7,7 +7,9 @@ master_bp = Blueprint('master', __name__, url_prefix='/api/master')
 
 @master_bp.route('', methods=['GET'])
 def get_master_data():
-    locations = Location.query.all()
+    master_data = master_data_cache.get()
+    
+    locations = master_data.locations.values()
     location_list = [
         {
             'location_id': loc.location_id,
@@ -16,7 +18,7 @@ def get_master_data():
         for loc in locations
     ]
     
-    setup_types = SetupType.query.all()
+    setup_types = master_data.setup_types.values()
     setup_type_list = [
         {
             'setup_type_id': st.setup_type_id,
@@ -35,8 +37,15 @@ def get_master_data():
         for dt_id, dt_name in DEFECT_TYPES.items()
     ]
     
-    return jsonify({
+    response = jsonify({
         'locations': location_list,
         'setup_types': setup_type_list,
         'defect_types': defect_type_list
-    }), 200
\ No newline at end of file
+    })
+    
+    # 기준정보 version 이 같으면 304 (클라이언트는 If-None-Match 로 재검증)
+    ## version 행이 없으면 바뀐 걸 알 수 없으니 ETag 없이
+    if master_data.version is not None:
+        response.set_etag(f'master-v{master_data.version}')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
\ No newline at end of file
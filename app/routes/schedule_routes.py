@@ -1,12 +1,26 @@
-from flask import Blueprint, request, jsonify
+import json
+import time
+from flask import Blueprint, request, jsonify, current_app, Response
 from app.models import Defect, Welder, ScheduleBatch, ScheduleJob
-from app.services.scheduler_ortools import ORToolsScheduler
-from app.services.objective import calculate_severity_score, DEFECT_TYPES
+from app.services.master_data import master_data_cache
+from app.services.scheduler_ortools import FORMULATIONS, DEFAULT_TIME_LIMIT_SECONDS
+from app.services.scheduler_greedy import GreedyScheduler
+from app.services.optimization import run_ortools_optimization, run_day_optimization, batch_metrics, WARM_START_MODES
+from app.services.optimization_jobs import job_queue
+from app.services.schedule_confirmation import confirm_batch
+from app.services.schedule_repair import repair_batch, DEFAULT_NEIGHBORHOOD, REPAIR_TIME_LIMIT_SECONDS
+from app.services.objective import DEFECT_TYPES
+from app.utils.profiling import available_profilers
 from app.extensions import db
 
 schedule_bp = Blueprint('schedules', __name__, url_prefix='/api/schedules')
 
 
+def is_time_limit(value):
+    """0 < 초 <= 60 인 JSON 숫자 (True/False 는 파이썬에서 int 라서 따로 제외)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and 0 < value <= 60
+
+
 @schedule_bp.route('/optimize', methods=['POST'])
 def optimize_schedule():
     data = request.json
@@ -38,7 +52,7 @@ def optimize_schedule():
         batch = scheduler.schedule(defects, welders, target_date, target_session)
         
         return get_schedule_response(batch.batch_id)
-        
+    
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Scheduling failed: {str(e)}'}), 500
@@ -57,61 +71,237 @@ def optimize_schedule_ortools():
     if target_session not in ['morning', 'afternoon', 'night']:
         return jsonify({'error': 'target_session must be morning, afternoon, or night'}), 400
     
-    from datetime import datetime
-    target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
-    
-    # 이미 확정된 이전 스케쥴의 결함들은 버림.!
-    session_order = {'morning': 1, 'afternoon': 2, 'night': 3}
-    current_session_order = session_order[target_session]
-    
-    already_scheduled_defect_ids = set()
+    # 작업 순서 모델: pairwise(기존) / circuit
+    formulation = data.get('formulation', 'pairwise')
+    if formulation not in FORMULATIONS:
+        return jsonify({'error': f'formulation must be one of {FORMULATIONS}'}), 400
+    
+    # 초기 해: previous(최근 배치) / greedy(휴리스틱 결과) / none
+    warm_start = data.get('warm_start', 'previous')
+    if warm_start not in WARM_START_MODES:
+        return jsonify({'error': f'warm_start must be one of {WARM_START_MODES}'}), 400
+    
+    # 풀이 시간 제한(초), 백그라운드 작업 진행률도 이 값 기준
+    time_limit = data.get('time_limit', DEFAULT_TIME_LIMIT_SECONDS)
+    if not is_time_limit(time_limit):
+        return jsonify({'error': 'time_limit must be between 0 and 60 seconds'}), 400
+    
+    params = {
+        'target_date': target_date,
+        'target_session': target_session,
+        'formulation': formulation,
+        'decompose': bool(data.get('decompose', False)),  # 스킬 호환 그룹별 병렬 풀이
+        'warm_start': warm_start,
+        'use_cache': bool(data.get('use_cache', True)),  # 같은 입력이면 이전 결과 배치 그대로
+        'time_limit': float(time_limit)
+    }
     
-    # 전날까지의 모든 확정된 스케줄
-    past_batches = ScheduleBatch.query.filter(
-        ScheduleBatch.target_date < target_date_obj,
-        ScheduleBatch.status == 'confirmed'
-    ).all()
+    # 디버그용 프로파일 리포트 (X-Debug-Profile: cprofile | pyinstrument)
+    profile = request.headers.get('X-Debug-Profile')
+    if profile:
+        if not current_app.config['OPTIMIZATION_PROFILING']:
+            return jsonify({'error': 'Profiling is disabled (OPTIMIZATION_PROFILING)'}), 403
+        profilers = available_profilers()
+        if profile not in profilers:
+            return jsonify({'error': f'X-Debug-Profile must be one of {profilers}'}), 400
+        params['profile'] = profile
+    
+    # sync=true 면 예전처럼 요청 안에서 바로 풀이
+    if data.get('sync'):
+        try:
+            batch = run_ortools_optimization(**params)
+            
+            return get_schedule_response(batch.batch_id, method='ortools')
+        
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': f'Scheduling failed: {str(e)}'}), 500
     
-    for batch in past_batches:
-        jobs = ScheduleJob.query.filter_by(batch_id=batch.batch_id).all()
-        already_scheduled_defect_ids.update([job.defect_id for job in jobs])
+    # 기본: 백그라운드 프로세스 풀에 작업 등록 후 job_id 바로 반환
+    job_id = job_queue.submit(params, max_workers=current_app.config['OPTIMIZATION_MAX_WORKERS'])
     
-    # 같은 날 이전 세션의 확정된 스케줄
-    same_day_batches = ScheduleBatch.query.filter(
-        ScheduleBatch.target_date == target_date_obj,
-        ScheduleBatch.status == 'confirmed'
-    ).all()
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/api/schedules/jobs/{job_id}'
+    }), 202
+
+
+#하루 전체 (morning → afternoon → night) 한 번에
+## 앞 세션 배정 결과(남은 결함, 용접공 끝 위치/셋업)를 이어받아서 세션별 draft 배치 3개
+@schedule_bp.route('/optimize-day', methods=['POST'])
+def optimize_day():
+    data = request.json
     
-    for batch in same_day_batches:
-        batch_session_order = session_order.get(batch.target_session, 0)
-        if batch_session_order < current_session_order:
-            jobs = ScheduleJob.query.filter_by(batch_id=batch.batch_id).all()
-            already_scheduled_defect_ids.update([job.defect_id for job in jobs])
+    target_date = data.get('target_date')
+    if not target_date:
+        return jsonify({'error': 'target_date is required'}), 400
     
-    # pending 상태이면서 이미 스케줄되지 않은 결함만 가져오기
-    defects = Defect.query.filter(
-        Defect.status == 'pending',
-        Defect.location_id.notin_([1, 3, 4]),  # 구역 A, C, D 제외
-        ~Defect.defect_id.in_(already_scheduled_defect_ids) if already_scheduled_defect_ids else True
-    ).all()
+    formulation = data.get('formulation', 'pairwise')
+    if formulation not in FORMULATIONS:
+        return jsonify({'error': f'formulation must be one of {FORMULATIONS}'}), 400
     
-    if not defects:
-        return jsonify({'error': 'No pending defects found'}), 400
+    warm_start = data.get('warm_start', 'previous')
+    if warm_start not in WARM_START_MODES:
+        return jsonify({'error': f'warm_start must be one of {WARM_START_MODES}'}), 400
     
-    # 가능한 용접공
-    welders = Welder.query.filter(Welder.status.in_(['available', 'working'])).all()
-    if not welders:
-        return jsonify({'error': 'No available welders found'}), 400
+    # 세션별 풀이 시간 제한(초), 없으면 ORToolsScheduler 기본값
+    time_limit = data.get('time_limit_per_session')
+    if time_limit is not None:
+        if not is_time_limit(time_limit):
+            return jsonify({'error': 'time_limit_per_session must be between 0 and 60 seconds'}), 400
     
     try:
-        scheduler = ORToolsScheduler()
-        batch = scheduler.schedule(defects, welders, target_date, target_session)
-        
-        return get_schedule_response(batch.batch_id, method='ortools')
-        
+        batches = run_day_optimization(target_date, formulation=formulation, warm_start=warm_start,
+                                       time_limit=time_limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Scheduling failed: {str(e)}'}), 500
+    
+    job_counts = dict(
+        db.session.query(ScheduleJob.batch_id, db.func.count(ScheduleJob.job_id))
+        .filter(ScheduleJob.batch_id.in_([batch.batch_id for batch in batches]))
+        .group_by(ScheduleJob.batch_id)
+        .all()
+    )
+    
+    result = []
+    for batch in batches:
+        result.append({
+            'batch_id': batch.batch_id,
+            'target_session': batch.target_session,
+            'status': batch.status,
+            'total_jobs': job_counts.get(batch.batch_id, 0),
+            'optimization_metrics': format_solver_metrics(batch_metrics(batch)),
+            'result_url': f'/api/schedules/{batch.batch_id}'
+        })
+    
+    return jsonify({
+        'target_date': target_date,
+        'total_jobs': sum(item['total_jobs'] for item in result),
+        'batches': result
+    }), 200
+
+
+@schedule_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_optimization_job(job_id):
+    """최적화 작업 상태 조회 (queued, running, done, failed)"""
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response = {
+        'job_id': job_id,
+        'status': job['status'],
+        'stage': job.get('stage'),
+        'progress': job.get('progress', 0),
+        'batch_id': job.get('batch_id'),
+        'error': job.get('error'),
+        'params': job.get('params')
+    }
+    
+    if job.get('metrics'):
+        response['optimization_metrics'] = format_solver_metrics(job['metrics'])
+    if job.get('batch_id'):
+        response['result_url'] = f"/api/schedules/{job['batch_id']}"
+    
+    return jsonify(response), 200
+
+
+@schedule_bp.route('/jobs/<job_id>/events', methods=['GET'])
+def stream_optimization_job(job_id):
+    """최적화 중간 해 스트리밍 (Server-Sent Events)
+    
+    event: status    - 상태/진행률 변경
+    event: incumbent - 더 좋은 해 (목적함수, 이동/셋업 비용, 경과 시간, 배정 초안)
+    event: done | failed - 종료 (batch_id / error)
+    event: timeout   - OPTIMIZATION_SSE_MAX_SECONDS 지나면 연결 종료 (작업은 계속, status_url 로 조회하거나 다시 연결)
+    
+    연결 하나가 웹 워커(스레드) 하나를 스트림 내내 잡고 있음 → 최대 길이를 제한
+    """
+    if not job_queue.get(job_id):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    max_seconds = current_app.config['OPTIMIZATION_SSE_MAX_SECONDS']
+    
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    
+    def generate():
+        sent_incumbents = 0
+        last_status = None
+        last_sent_at = time.time()
+        deadline = time.time() + max_seconds
+        
+        while True:
+            job = job_queue.get(job_id)
+            if job is None:
+                yield sse('failed', {'job_id': job_id, 'error': 'Job not found'})
+                return
+            
+            status = (job['status'], job.get('stage'), job.get('progress', 0))
+            if status != last_status:
+                yield sse('status', {'job_id': job_id, 'status': status[0], 'stage': status[1], 'progress': status[2]})
+                last_status = status
+                last_sent_at = time.time()
+            
+            incumbents = job.get('incumbents', [])
+            for incumbent in incumbents[sent_incumbents:]:
+                yield sse('incumbent', incumbent)
+                last_sent_at = time.time()
+            sent_incumbents = len(incumbents)
+            
+            if job['status'] in ['done', 'failed']:
+                payload = {'job_id': job_id, 'batch_id': job.get('batch_id'), 'error': job.get('error')}
+                if job.get('metrics'):
+                    payload['optimization_metrics'] = format_solver_metrics(job['metrics'])
+                yield sse(job['status'], payload)
+                return
+            
+            if time.time() > deadline:
+                yield sse('timeout', {'job_id': job_id, 'status_url': f'/api/schedules/jobs/{job_id}'})
+                return
+            
+            # 프록시가 연결 끊지 않게 keep-alive
+            if time.time() - last_sent_at > 15:
+                yield ': keep-alive\n\n'
+                last_sent_at = time.time()
+            
+            time.sleep(0.5)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@schedule_bp.route('/jobs/<job_id>/accept', methods=['POST'])
+def accept_optimization_job(job_id):
+    """지금까지 찾은 최선 해 채택 → 남은 탐색 중단, 그 해로 draft 배치 생성"""
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if job['status'] in ['done', 'failed']:
+        return jsonify({
+            'message': f"Job is already {job['status']}",
+            'job_id': job_id,
+            'status': job['status'],
+            'batch_id': job.get('batch_id')
+        }), 200
+    
+    job_queue.request_stop(job_id)
+    
+    return jsonify({
+        'message': 'Stop requested. The best solution found so far will be saved.',
+        'job_id': job_id,
+        'status': job['status'],
+        'status_url': f'/api/schedules/jobs/{job_id}'
+    }), 202
 
 
 @schedule_bp.route('/<int:batch_id>', methods=['GET'])
@@ -167,18 +357,13 @@ def confirm_schedule(batch_id):
     if batch.status == 'confirmed':
         return jsonify({'message': 'Schedule is already confirmed'}), 200
     
-    # 기존의 같은 날짜/세션 스케줄이 있으면 draft로 변경
-    existing_confirmed = ScheduleBatch.query.filter_by(
-        target_date=batch.target_date,
-        target_session=batch.target_session,
-        status='confirmed'
-    ).filter(ScheduleBatch.batch_id != batch_id).all()
-    
-    for old_batch in existing_confirmed:
-        old_batch.status = 'draft'
-    
-    batch.status = 'confirmed'
-    db.session.commit()
+    # 같은 날짜/세션의 기존 확정 배치는 draft 로, 확정 결함 색인도 같이 갱신 (한 트랜잭션)
+    try:
+        confirm_batch(batch)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Confirm failed: {str(e)}'}), 500
     
     return jsonify({
         'message': 'Schedule confirmed successfully',
@@ -187,6 +372,49 @@ def confirm_schedule(batch_id):
     }), 200
 
 
+#부분 재계획 (용접공 휴식/퇴근, 결함 우선순위 변경 후)
+## started/completed 작업은 고정, 영향받은 용접공 + 주변 용접공만 다시 풀이 → 새 draft revision
+@schedule_bp.route('/<int:batch_id>/repair', methods=['POST'])
+def repair_schedule(batch_id):
+    batch = ScheduleBatch.query.get_or_404(batch_id)
+    data = request.json or {}
+    
+    welder_ids = data.get('welder_ids', [])
+    defect_ids = data.get('defect_ids', [])
+    if not isinstance(welder_ids, list) or not isinstance(defect_ids, list):
+        return jsonify({'error': 'welder_ids and defect_ids must be lists'}), 400
+    if not welder_ids and not defect_ids:
+        return jsonify({'error': 'welder_ids or defect_ids is required'}), 400
+    
+    from_time = None
+    if data.get('from_time'):
+        from datetime import datetime
+        try:
+            from_time = datetime.strptime(data['from_time'], '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return jsonify({'error': 'from_time must be YYYY-MM-DD HH:MM:SS'}), 400
+    
+    neighborhood = data.get('neighborhood', DEFAULT_NEIGHBORHOOD)
+    if not isinstance(neighborhood, int) or isinstance(neighborhood, bool) or neighborhood < 0:
+        return jsonify({'error': 'neighborhood must be a non-negative integer'}), 400
+    
+    time_limit = data.get('time_limit', REPAIR_TIME_LIMIT_SECONDS)
+    if not is_time_limit(time_limit):
+        return jsonify({'error': 'time_limit must be between 0 and 60 seconds'}), 400
+    
+    try:
+        revision = repair_batch(
+            batch, welder_ids=welder_ids, defect_ids=defect_ids, from_time=from_time,
+            neighborhood=neighborhood, time_limit=time_limit
+        )
+        
+        return get_schedule_response(revision.batch_id, method='repair')
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Repair failed: {str(e)}'}), 500
+
+
 @schedule_bp.route('/welder/<int:welder_id>/ticket', methods=['GET'])
 def get_welder_ticket(welder_id):
     target_date = request.args.get('target_date')
@@ -224,6 +452,8 @@ def get_welder_ticket(welder_id):
         'night': '19:00-22:00'
     }
     
+    master_data = master_data_cache.get()
+    
     job_list = []
     for job in jobs:
         job_list.append({
@@ -233,8 +463,8 @@ def get_welder_ticket(welder_id):
             'defect_type': job.defect.defect_type,
             'defect_type_name': DEFECT_TYPES.get(job.defect.defect_type, 'Unknown'),
             'location_id': job.defect.location_id,
-            'location_name': job.defect.location.location_name,
-            'severity_score': round(calculate_severity_score(job.defect), 2),
+            'location_name': master_data.location_name(job.defect.location_id),
+            'severity_score': round(job.defect.severity_score, 2),
             'estimated_start_time': job.estimated_start_time.strftime('%Y-%m-%d %H:%M:%S'),
             'estimated_end_time': job.estimated_end_time.strftime('%Y-%m-%d %H:%M:%S'),
             'rework_time': job.defect.rework_time,
@@ -242,11 +472,11 @@ def get_welder_ticket(welder_id):
         })
     
     # 용접공의 스킬 조회
-    from app.models import WelderSkill, Skill
+    from app.models import WelderSkill
     welder_skills = WelderSkill.query.filter_by(welder_id=welder_id).all()
     skills = []
     for ws in welder_skills:
-        skill = Skill.query.get(ws.skill_id)
+        skill = master_data.skills.get(ws.skill_id)
         if skill:
             skills.append({
                 'process': skill.process,
@@ -268,9 +498,75 @@ def get_welder_ticket(welder_id):
     }), 200
 
 
+def format_solver_metrics(metrics):
+    """스케쥴러가 남긴 비용/시간 값 → 응답용 이름"""
+    formatted = {}
+    
+    if 'total_travel_cost' in metrics:
+        formatted['total_travel_time_minutes'] = metrics['total_travel_cost']
+    if 'total_setup_cost' in metrics:
+        formatted['total_setup_time_minutes'] = metrics['total_setup_cost']
+    if 'solver_time' in metrics:
+        formatted['solver_time_seconds'] = round(metrics['solver_time'], 2)
+    if 'formulation' in metrics:
+        formatted['formulation'] = metrics['formulation']
+    if 'incumbent_count' in metrics:
+        formatted['incumbent_count'] = metrics['incumbent_count']
+    if 'stopped_early' in metrics:
+        formatted['stopped_early'] = metrics['stopped_early']
+    if 'hints_total' in metrics:
+        # warm start: 이전 배치 hint 중 최종 해에 그대로 남은 개수
+        formatted['warm_start_hints'] = metrics['hints_total']
+        formatted['warm_start_hints_accepted'] = metrics.get('hints_accepted', 0)
+    if 'component_count' in metrics:
+        formatted['component_count'] = metrics['component_count']
+        formatted['component_resolves'] = metrics.get('component_resolves', 0)
+    if 'num_variables' in metrics:
+        formatted['model_variables'] = metrics['num_variables']
+        formatted['model_constraints'] = metrics.get('num_constraints', 0)
+    if 'phases' in metrics:
+        # 단계별 (load, build, solve, extract, persist) 시간 + 쿼리/변수/제약/저장 행 수
+        formatted['phases'] = {
+            name: {key: round(value, 3) if isinstance(value, float) else value for key, value in phase.items()}
+            for name, phase in metrics['phases'].items()
+        }
+    if 'profile_report' in metrics:
+        formatted['profile_report'] = metrics['profile_report']
+    if 'cache_hit' in metrics:
+        # 같은 입력 결과 캐시 (cache_hit 이면 풀이 없이 이전 배치 그대로)
+        formatted['cache_hit'] = metrics['cache_hit']
+        formatted['fingerprint'] = metrics.get('fingerprint')
+    if 'repair' in metrics:
+        # 부분 재계획: 원래 배치, 고정 작업 수, 다시 푼 용접공/결함, 못 넣은 결함
+        formatted['repair'] = metrics['repair']
+    
+    return formatted
+
+
 def get_schedule_response(batch_id, method='greedy'):
     batch = ScheduleBatch.query.get_or_404(batch_id)
-    jobs = ScheduleJob.query.filter_by(batch_id=batch_id).order_by(ScheduleJob.job_order).all()
+    
+    # 작업 + 용접공 이름 + 결함을 쿼리 한 번으로 (필요한 컬럼만), 구역 이름은 기준정보 캐시에서
+    jobs = db.session.query(
+        ScheduleJob.job_id,
+        ScheduleJob.job_order,
+        ScheduleJob.welder_id,
+        ScheduleJob.defect_id,
+        ScheduleJob.estimated_start_time,
+        ScheduleJob.estimated_end_time,
+        ScheduleJob.status,
+        Welder.welder_name,
+        Defect.defect_type,
+        Defect.severity_score,
+        Defect.location_id,
+        Defect.rework_time
+    ).join(
+        Defect, Defect.defect_id == ScheduleJob.defect_id
+    ).outerjoin(
+        Welder, Welder.welder_id == ScheduleJob.welder_id
+    ).filter(
+        ScheduleJob.batch_id == batch_id
+    ).order_by(ScheduleJob.job_order).all()
     
     session_time_map = {
         'morning': '09:00-12:00',
@@ -278,7 +574,9 @@ def get_schedule_response(batch_id, method='greedy'):
         'night': '19:00-22:00'
     }
     
-    total_severity = sum(calculate_severity_score(job.defect) for job in jobs)
+    master_data = master_data_cache.get()
+    
+    total_severity = sum(job.severity_score for job in jobs)
     
     job_list = []
     for job in jobs:
@@ -286,16 +584,16 @@ def get_schedule_response(batch_id, method='greedy'):
             'job_id': job.job_id,
             'job_order': job.job_order,
             'welder_id': job.welder_id,
-            'welder_name': job.welder.welder_name,
+            'welder_name': job.welder_name,
             'defect_id': job.defect_id,
-            'defect_type': job.defect.defect_type,
-            'defect_type_name': DEFECT_TYPES.get(job.defect.defect_type, 'Unknown'),
-            'location_id': job.defect.location_id,
-            'location_name': job.defect.location.location_name,
-            'severity_score': round(calculate_severity_score(job.defect), 2),
+            'defect_type': job.defect_type,
+            'defect_type_name': DEFECT_TYPES.get(job.defect_type, 'Unknown'),
+            'location_id': job.location_id,
+            'location_name': master_data.location_name(job.location_id),
+            'severity_score': round(job.severity_score, 2),
             'estimated_start_time': job.estimated_start_time.strftime('%Y-%m-%d %H:%M:%S'),
             'estimated_end_time': job.estimated_end_time.strftime('%Y-%m-%d %H:%M:%S'),
-            'rework_time': job.defect.rework_time,
+            'rework_time': job.rework_time,
             'status': job.status
         })
     
@@ -305,12 +603,7 @@ def get_schedule_response(batch_id, method='greedy'):
         'total_defects_scheduled': len(jobs)
     }
     
-    if hasattr(batch, 'total_travel_cost'):
-        optimization_metrics['total_travel_time_minutes'] = batch.total_travel_cost
-    if hasattr(batch, 'total_setup_cost'):
-        optimization_metrics['total_setup_time_minutes'] = batch.total_setup_cost
-    if hasattr(batch, 'solver_time'):
-        optimization_metrics['solver_time_seconds'] = round(batch.solver_time, 2)
+    optimization_metrics.update(format_solver_metrics(batch_metrics(batch)))
     
     return jsonify({
         'batch_id': batch.batch_id,
@@ -319,6 +612,7 @@ def get_schedule_response(batch_id, method='greedy'):
         'target_session': batch.target_session,
         'session_time': session_time_map.get(batch.target_session, 'Unknown'),
         'created_at': batch.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'parent_batch_id': batch.parent_batch_id,
         'total_jobs': len(jobs),
         'optimization_metrics': optimization_metrics,
         'jobs': job_list
@@ -1,49 +1,84 @@
 from flask import Blueprint, request, jsonify
-from app.models import Welder, WelderSkill, Skill, Location, SetupType
+from app.models import Welder, WelderSkill
+from app.services.master_data import master_data_cache, skill_name
 from app.extensions import db
 
 welder_bp = Blueprint('welders', __name__, url_prefix='/api/welders')
 
+WELDER_INCLUDES = ['skills']
+
+
 #용접공 목록록
+## ?include=skills (기본) | include= (스킬 빼기), ?compact=true → 상태 폴링용 최소 필드
+## 쿼리: 용접공 1번 + (스킬 포함 시) 용접공 스킬 1번, 구역/셋업/스킬 이름은 기준정보 캐시
 @welder_bp.route('', methods=['GET'])
 def get_welders():
     status_param = request.args.get('status', 'available,working')
     status_list = [s.strip() for s in status_param.split(',')]
     
-    welders = Welder.query.filter(Welder.status.in_(status_list)).all()
+    include_param = request.args.get('include', 'skills')
+    includes = [i.strip() for i in include_param.split(',') if i.strip()]
+    unknown = [i for i in includes if i not in WELDER_INCLUDES]
+    if unknown:
+        return jsonify({'error': f'include must be one of {WELDER_INCLUDES}'}), 400
+    
+    include_skills = 'skills' in includes
+    compact = parse_flag(request.args.get('compact', 'false'))
+    
+    welders = Welder.query.filter(
+        Welder.status.in_(status_list)
+    ).order_by(Welder.welder_id).all()
+    
+    master_data = master_data_cache.get()
+    
+    skills_by_welder = {}
+    if include_skills:
+        skills_by_welder = load_welder_skills([w.welder_id for w in welders], master_data)
     
     result = []
     for welder in welders:
-        location = Location.query.get(welder.current_location_id)
-        setup = SetupType.query.get(welder.current_setup_id)
-        
-        welder_skills = WelderSkill.query.filter_by(welder_id=welder.welder_id).all()
-        skills = []
-        for ws in welder_skills:
-            skill = Skill.query.get(ws.skill_id)
-            if skill:
-                skills.append({
-                    'skill_id': skill.skill_id,
-                    'process': skill.process,
-                    'position': skill.position,
-                    'position_level': skill.position_level,
-                    'material': skill.material,
-                    'skill_name': f"{skill.process}-{skill.position}-{skill.material}"
-                })
+        if compact:
+            item = {
+                'welder_id': welder.welder_id,
+                'welder_name': welder.welder_name,
+                'status': welder.status,
+                'current_location_id': welder.current_location_id,
+                'current_defect_id': welder.current_defect_id
+            }
+            if include_skills:
+                item['skill_ids'] = [skill.skill_id for skill in skills_by_welder[welder.welder_id]]
+            
+            result.append(item)
+            continue
         
-        result.append({
+        item = {
             'welder_id': welder.welder_id,
             'welder_name': welder.welder_name,
             'current_location_id': welder.current_location_id,
-            'current_location_name': location.location_name if location else None,
+            'current_location_name': master_data.location_name(welder.current_location_id),
             'current_setup_id': welder.current_setup_id,
-            'current_setup_name': setup.setup_name if setup else None,
+            'current_setup_name': master_data.setup_name(welder.current_setup_id),
             'current_defect_id': welder.current_defect_id,
             'status': welder.status,
-            'shift_end_time': welder.shift_end_time.strftime('%Y-%m-%d %H:%M:%S'),
-            'skills': skills,
-            'skill_count': len(skills)
-        })
+            'shift_end_time': welder.shift_end_time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        
+        if include_skills:
+            skills = [
+                {
+                    'skill_id': skill.skill_id,
+                    'process': skill.process,
+                    'position': skill.position,
+                    'position_level': skill.position_level,
+                    'material': skill.material,
+                    'skill_name': skill_name(skill)
+                }
+                for skill in skills_by_welder[welder.welder_id]
+            ]
+            item['skills'] = skills
+            item['skill_count'] = len(skills)
+        
+        result.append(item)
     
     return jsonify({
         'welders': result,
@@ -75,3 +110,25 @@ def update_welder(welder_id):
         'message': 'Welder updated successfully'
     }), 200
 
+
+def parse_flag(value):
+    return str(value).lower() in ['1', 'true', 'yes']
+
+
+def load_welder_skills(welder_ids, master_data):
+    """용접공별 스킬 목록 {welder_id: [SkillInfo]} (쿼리 1번)"""
+    skills_by_welder = {welder_id: [] for welder_id in welder_ids}
+    if not welder_ids:
+        return skills_by_welder
+    
+    rows = WelderSkill.query.with_entities(
+        WelderSkill.welder_id, WelderSkill.skill_id
+    ).filter(
+        WelderSkill.welder_id.in_(welder_ids)
+    ).order_by(WelderSkill.welder_id, WelderSkill.skill_id).all()
+    
+    for welder_id, skill_id in rows:
+        skill = master_data.skills.get(skill_id)
+        if skill:
+            skills_by_welder[welder_id].append(skill)
+    return skills_by_welder
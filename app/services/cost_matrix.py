@@ -0,0 +1,100 @@
+#이동/셋업 비용 행렬 (스케쥴러용)
+## TravelMatrix, SetupType을 한 번만 읽어서 numpy 배열로 들고 있음
+## 인덱스 = location_id, setup_type_id 그대로 사용 (id가 작아서 dense로 충분)
+## via_setup[i, s, j] : i구역 → D구역(셋업 s) → j구역 전체 overhead
+
+import numpy as np
+from app.models import TravelMatrix, SetupType
+
+
+class CostMatrix:
+
+    def __init__(self, travel, setup, setup_location_id=4):
+        self.travel = np.array(travel, dtype=np.int32)  # [from_location_id, to_location_id]
+        self.setup = np.array(setup, dtype=np.int32)    # [setup_type_id]
+        self.setup_location_id = setup_location_id
+
+        # 같은 구역끼리는 이동 0
+        np.fill_diagonal(self.travel, 0)
+
+        d = setup_location_id
+        self.via_setup = (
+            self.travel[:, d][:, None, None]
+            + self.setup[None, :, None]
+            + self.travel[d, :][None, None, :]
+        )
+
+    @classmethod
+    def load(cls, setup_location_id=4):
+        """DB에서 이동/셋업 비용을 한 번에 읽어서 행렬 생성 (쿼리 2번)"""
+        travel_rows = TravelMatrix.query.with_entities(
+            TravelMatrix.from_location_id,
+            TravelMatrix.to_location_id,
+            TravelMatrix.travel_time_minutes
+        ).all()
+        setup_rows = SetupType.query.with_entities(
+            SetupType.setup_type_id,
+            SetupType.setup_cost_minutes
+        ).all()
+
+        return cls.from_rows(travel_rows, setup_rows, setup_location_id)
+
+    @classmethod
+    def from_rows(cls, travel_rows, setup_rows, setup_location_id=4):
+        """(from, to, minutes), (setup_type_id, minutes) 튜플 목록으로 행렬 생성"""
+        location_ids = [setup_location_id]
+        for from_id, to_id, _ in travel_rows:
+            location_ids.extend((from_id, to_id))
+        size = max(location_ids) + 1
+
+        setup_size = max([setup_id for setup_id, _ in setup_rows], default=0) + 1
+
+        # 없는 조합은 0분 (기존 get_travel_time / get_setup_time 과 동일)
+        travel = np.zeros((size, size), dtype=np.int32)
+        for from_id, to_id, minutes in travel_rows:
+            travel[from_id, to_id] = minutes
+
+        setup = np.zeros(setup_size, dtype=np.int32)
+        for setup_id, minutes in setup_rows:
+            setup[setup_id] = minutes
+
+        return cls(travel, setup, setup_location_id)
+
+    def _has_location(self, location_id):
+        return location_id is not None and 0 <= location_id < self.travel.shape[0]
+
+    def _has_setup(self, setup_type_id):
+        return setup_type_id is not None and 0 <= setup_type_id < self.setup.shape[0]
+
+    def travel_time(self, from_location_id, to_location_id):
+        if not (self._has_location(from_location_id) and self._has_location(to_location_id)):
+            return 0
+        return int(self.travel[from_location_id, to_location_id])
+
+    def setup_time(self, setup_type_id):
+        if not self._has_setup(setup_type_id):
+            return 0
+        return int(self.setup[setup_type_id])
+
+    def via_setup_time(self, from_location_id, setup_type_id, to_location_id):
+        """from → D구역 → 셋업 → to 전체 시간"""
+        if (self._has_location(from_location_id) and self._has_location(to_location_id)
+                and self._has_setup(setup_type_id)):
+            return int(self.via_setup[from_location_id, setup_type_id, to_location_id])
+
+        return (
+            self.travel_time(from_location_id, self.setup_location_id)
+            + self.setup_time(setup_type_id)
+            + self.travel_time(self.setup_location_id, to_location_id)
+        )
+
+    def transition(self, from_location_id, from_setup_id, to_location_id, to_setup_id):
+        """작업1 → 작업2 전환 비용: (전체 overhead, 이동 시간, 셋업 시간)"""
+        if from_setup_id != to_setup_id:
+            # 셋업 변경 시 구역 D 경유
+            setup_time = self.setup_time(to_setup_id)
+            total_overhead = self.via_setup_time(from_location_id, to_setup_id, to_location_id)
+            return total_overhead, total_overhead - setup_time, setup_time
+
+        travel_time = self.travel_time(from_location_id, to_location_id)
+        return travel_time, travel_time, 0
@@ -0,0 +1,230 @@
+#스킬 호환 그룹 단위 분할 풀이
+## 용접공-결함 작업 가능 그래프(EligibilityMatrix)의 연결 요소끼리는 서로 영향이 없음
+##   → 요소마다 따로 CP-SAT 모델, 프로세스 풀에서 병렬 풀이
+## 요소끼리 이어지는 건 동시작업 금지 구역(F,G)뿐
+##   → 금지 쌍 두 구역이 전체 문제에서 다 쓰이면 요소 모델마다 그 쌍 cumulative 를 검 (한쪽 구역 작업만 있는 요소도)
+##   → 목적함수 큰 요소부터 확정, 이미 확정된 금지 구역 작업과 겹치는 요소만 그 구간을 막고 다시 풀이
+## 풀 프로세스는 프로세스마다 하나를 계속 재사용 (workers.shared_process_pool)
+## 마지막에 요소별 결과를 합쳐서 ScheduleBatch 하나로 저장
+
+import os
+from concurrent.futures import wait
+import numpy as np
+from app.extensions import db
+from app.models import Defect, Welder
+from app.services.scheduler_ortools import ORToolsScheduler
+from app.services.master_data import master_data_cache
+from app.services.workers import shared_process_pool, shared_manager, worker_app
+from app.utils.skill_matcher import EligibilityMatrix, build_eligibility_matrix
+from app.utils.profiling import PhaseProfiler
+
+
+def split_components(eligibility):
+    """연결 요소 목록 [(welder_ids, defect_ids)], 결함 많은 순. 혼자 떨어진 용접공/결함은 제외"""
+    num_welders, num_defects = eligibility.matrix.shape
+    parent = list(range(num_welders + num_defects))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in zip(*np.nonzero(eligibility.matrix)):
+        root_a, root_b = find(int(i)), find(num_welders + int(j))
+        if root_a != root_b:
+            parent[root_a] = root_b
+
+    groups = {}
+    for i, welder_id in enumerate(eligibility.welder_ids):
+        groups.setdefault(find(i), ([], []))[0].append(welder_id)
+    for j, defect_id in enumerate(eligibility.defect_ids):
+        groups.setdefault(find(num_welders + j), ([], []))[1].append(defect_id)
+
+    components = [group for group in groups.values() if group[0] and group[1]]
+    components.sort(key=lambda group: len(group[1]), reverse=True)
+    return components
+
+
+def sub_eligibility(eligibility, welder_ids, defect_ids):
+    rows = [eligibility.welder_index[welder_id] for welder_id in welder_ids]
+    cols = [eligibility.defect_index[defect_id] for defect_id in defect_ids]
+    return EligibilityMatrix(eligibility.matrix[np.ix_(rows, cols)], welder_ids, defect_ids)
+
+
+def restricted_intervals(result, concurrent_restrictions):
+    """결과 중 동시작업 금지 구역 작업 → [(location_id, start, end)]"""
+    restricted_locations = {loc for pair in concurrent_restrictions for loc in pair}
+    return [
+        (a['location_id'], a['start_minutes'], a['end_minutes'])
+        for a in result['assignments']
+        if a['location_id'] in restricted_locations
+    ]
+
+
+def has_conflict(intervals, blocked_intervals, concurrent_restrictions):
+    for loc, start, end in intervals:
+        for other_loc, other_start, other_end in blocked_intervals:
+            if start < other_end and other_start < end and any(
+                loc in pair and other_loc in pair for pair in concurrent_restrictions
+            ):
+                return True
+    return False
+
+
+def _solve_component(formulation, time_limit, welder_ids, defect_ids, target_date, target_session, solve_options,
+                     stop_event=None):
+    with worker_app().app_context():
+        try:
+            defects = Defect.query.filter(Defect.defect_id.in_(defect_ids)).all()
+            welders = Welder.query.filter(Welder.welder_id.in_(welder_ids)).all()
+
+            scheduler = ORToolsScheduler(formulation=formulation, warm_start=False)
+            scheduler.max_time_in_seconds = time_limit
+            should_stop = stop_event.is_set if stop_event is not None else None
+            return scheduler.solve(defects, welders, target_date, target_session, should_stop=should_stop,
+                                   **solve_options)
+        finally:
+            db.session.remove()
+
+
+class DecomposedScheduler:
+
+    def __init__(self, formulation='pairwise', warm_start=True, max_workers=None, time_limit=None):
+        self.scheduler = ORToolsScheduler(formulation=formulation, warm_start=warm_start)
+        if time_limit:
+            self.scheduler.max_time_in_seconds = time_limit
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def schedule(self, defects, welders, target_date, target_session, profiler=None, **solve_options):
+        """풀이 + 배치 저장. solve_options 는 solve() 참고"""
+        profiler = profiler or PhaseProfiler()
+        result = self.solve(defects, welders, target_date, target_session, profiler=profiler, **solve_options)
+        return self.scheduler.persist(result, target_date, target_session, profiler)
+
+    def solve(self, defects, welders, target_date, target_session, cost_matrix=None, eligibility=None,
+              concurrent_restrictions=None, hint_assignments=None, should_stop=None, profiler=None):
+        """
+        DB 저장 없이 풀이만. 반환: 요소별 결과를 합친 {'assignments': [...], 지표...} (ORToolsScheduler.solve() 와 같은 형식)
+
+        should_stop() : True 가 되면 풀 프로세스의 요소 풀이도 멈춤 (stop event 로 전달)
+        """
+        scheduler = self.scheduler
+        profiler = profiler or PhaseProfiler()
+        profiler.phase('load')
+
+        if cost_matrix is None:
+            cost_matrix = master_data_cache.get().cost_matrix(scheduler.setup_location_id)
+        if concurrent_restrictions is None:
+            concurrent_restrictions = scheduler.load_concurrent_restrictions()
+        if eligibility is None:
+            eligibility = build_eligibility_matrix(welders, defects)
+        if hint_assignments is None and scheduler.warm_start:
+            hint_assignments = scheduler.load_hint_assignments(target_date, target_session)
+
+        components = split_components(eligibility)
+
+        # 나눌 게 없으면 그냥 한 모델로
+        if len(components) <= 1:
+            return scheduler.solve(
+                defects, welders, target_date, target_session,
+                cost_matrix=cost_matrix, eligibility=eligibility, concurrent_restrictions=concurrent_restrictions,
+                hint_assignments=hint_assignments, should_stop=should_stop, profiler=profiler
+            )
+
+        # 금지 쌍은 전체 문제 기준으로 판단 (요소에 F 작업만 있어도 G 작업이 다른 요소에 있으면 F 끼리도 겹치면 안 됨)
+        defect_locations = {d.defect_id: d.location_id for d in defects}
+        locations_in_use = {
+            defect_locations[defect_id] for _, defect_ids in components for defect_id in defect_ids
+        }
+        active_restrictions = [pair for pair in concurrent_restrictions if set(pair) <= locations_in_use]
+        restricted_locations_in_use = {loc for pair in active_restrictions for loc in pair}
+
+        def solve_options(welder_ids, defect_ids, hints, blocked_intervals=None):
+            defect_id_set = set(defect_ids)
+            return {
+                'cost_matrix': cost_matrix,
+                'eligibility': sub_eligibility(eligibility, welder_ids, defect_ids),
+                'concurrent_restrictions': concurrent_restrictions,
+                'hint_assignments': [h for h in hints or [] if h['defect_id'] in defect_id_set],
+                'blocked_intervals': blocked_intervals,
+                'global_locations_in_use': restricted_locations_in_use
+            }
+
+        formulation = scheduler.formulation
+        time_limit = scheduler.max_time_in_seconds
+        resolved_count = 0
+        resolve_time = 0.0
+
+        pool = shared_process_pool(self.max_workers)
+        stop_event = shared_manager().Event() if should_stop else None
+
+        def wait_results(futures):
+            # 기다리는 동안 중단 요청이 오면 풀 프로세스 쪽 풀이도 멈춤
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=0.5)
+                if pending and stop_event is not None and not stop_event.is_set() and should_stop():
+                    stop_event.set()
+            return [future.result() for future in futures]
+
+        # 요소별 build/solve/extract 는 풀 프로세스 안 → 여기서는 풀 전체를 'solve' 로, 모델 크기는 합계
+        profiler.phase('solve')
+
+        #1. 요소별 병렬 풀이
+        results = wait_results([
+            pool.submit(
+                _solve_component, formulation, time_limit, welder_ids, defect_ids, target_date, target_session,
+                solve_options(welder_ids, defect_ids, hint_assignments), stop_event
+            )
+            for welder_ids, defect_ids in components
+        ])
+        parallel_time = max(result['solver_time'] for result in results)
+
+        #2. 동시작업 금지 구역 조정 (목적함수 큰 요소부터 확정)
+        ## 중단 요청 뒤에도 겹치면 다시 풀이 (stop event 가 켜져 있으니 첫 해에서 바로 멈춤)
+        accepted_intervals = []
+        for k in sorted(range(len(results)), key=lambda k: results[k]['objective'], reverse=True):
+            intervals = restricted_intervals(results[k], active_restrictions)
+
+            if has_conflict(intervals, accepted_intervals, active_restrictions):
+                welder_ids, defect_ids = components[k]
+                results[k] = wait_results([pool.submit(
+                    _solve_component, formulation, time_limit, welder_ids, defect_ids, target_date, target_session,
+                    solve_options(welder_ids, defect_ids, results[k]['assignments'], list(accepted_intervals)),
+                    stop_event
+                )])[0]
+                resolved_count += 1
+                resolve_time += results[k]['solver_time']
+                intervals = restricted_intervals(results[k], active_restrictions)
+
+            accepted_intervals.extend(intervals)
+
+        profiler.count('variables', sum(result['num_variables'] for result in results))
+        profiler.count('constraints', sum(result['num_constraints'] for result in results))
+
+        #3. 합치기
+        profiler.phase('extract')
+        assignments = [a for result in results for a in result['assignments']]
+        assignments.sort(key=lambda x: (x['welder_id'], x['start_minutes']))
+
+        merged = {
+            'assignments': assignments,
+            'objective': sum(result['objective'] for result in results),
+            'total_travel_cost': sum(result['total_travel_cost'] for result in results),
+            'total_setup_cost': sum(result['total_setup_cost'] for result in results),
+            'solver_time': parallel_time + resolve_time,
+            'formulation': formulation,
+            'incumbent_count': sum(result['incumbent_count'] for result in results),
+            'stopped_early': any(result['stopped_early'] for result in results),
+            'hints_total': sum(result['hints_total'] for result in results),
+            'hints_accepted': sum(result['hints_accepted'] for result in results),
+            'component_count': len(components),
+            'component_resolves': resolved_count,
+            'num_variables': sum(result['num_variables'] for result in results),
+            'num_constraints': sum(result['num_constraints'] for result in results)
+        }
+
+        profiler.stop()
+        merged['phases'] = profiler.as_dict()
+        return merged
@@ -0,0 +1,155 @@
+#기준정보 캐시 (프로세스당 한 번 로드)
+## Location, SetupType, Skill, TravelMatrix, ConcurrentRestriction 은 거의 안 바뀜
+##   → 읽기 전용 조회 구조(MasterData)로 들고 있다가 라우트/스케쥴러가 같이 사용
+## master_data_version.version 이 바뀔 때만 다시 로드 (DB 트리거가 올림, migrations/001 참고)
+##   version 확인도 MASTER_DATA_CHECK_INTERVAL 초에 한 번만
+## version 행이 없으면(migrations/001 미적용) 경고 후 MASTER_DATA_FALLBACK_TTL 초마다 그냥 다시 로드
+
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+from flask import current_app
+from app.extensions import db
+from app.models import Location, SetupType, Skill, TravelMatrix, ConcurrentRestriction, MasterDataVersion
+from app.services.cost_matrix import CostMatrix
+
+DEFAULT_CHECK_INTERVAL_SECONDS = 5.0
+DEFAULT_FALLBACK_TTL_SECONDS = 60.0
+
+LocationInfo = namedtuple('LocationInfo', ['location_id', 'location_name'])
+SetupTypeInfo = namedtuple('SetupTypeInfo', ['setup_type_id', 'setup_name', 'setup_cost_minutes'])
+SkillInfo = namedtuple('SkillInfo', ['skill_id', 'process', 'position', 'position_level', 'material'])
+
+
+def skill_name(skill):
+    return f"{skill.process}-{skill.position}-{skill.material}"
+
+
+class MasterData:
+    """한 version 의 기준정보 스냅샷. 만든 뒤에는 바꾸지 않음"""
+
+    def __init__(self, version, locations, setup_types, skills, travel_rows, restriction_rows):
+        self.version = version
+
+        # id → namedtuple, id 순
+        self.locations = MappingProxyType({
+            row.location_id: row for row in sorted((LocationInfo(*r) for r in locations), key=lambda r: r[0])
+        })
+        self.setup_types = MappingProxyType({
+            row.setup_type_id: row for row in sorted((SetupTypeInfo(*r) for r in setup_types), key=lambda r: r[0])
+        })
+        self.skills = MappingProxyType({
+            row.skill_id: row for row in sorted((SkillInfo(*r) for r in skills), key=lambda r: r[0])
+        })
+
+        self.travel_rows = tuple(tuple(row) for row in travel_rows)
+        # (6, 7), (7, 6) 은 하나로
+        self.concurrent_restrictions = tuple(sorted({tuple(sorted((a, b))) for a, b in restriction_rows}))
+
+        self._cost_matrices = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, version):
+        locations = Location.query.with_entities(Location.location_id, Location.location_name).all()
+        setup_types = SetupType.query.with_entities(
+            SetupType.setup_type_id, SetupType.setup_name, SetupType.setup_cost_minutes
+        ).all()
+        skills = Skill.query.with_entities(
+            Skill.skill_id, Skill.process, Skill.position, Skill.position_level, Skill.material
+        ).all()
+        travel_rows = TravelMatrix.query.with_entities(
+            TravelMatrix.from_location_id, TravelMatrix.to_location_id, TravelMatrix.travel_time_minutes
+        ).all()
+        restriction_rows = ConcurrentRestriction.query.with_entities(
+            ConcurrentRestriction.location_a_id, ConcurrentRestriction.location_b_id
+        ).all()
+
+        return cls(version, locations, setup_types, skills, travel_rows, restriction_rows)
+
+    def location_name(self, location_id):
+        location = self.locations.get(location_id)
+        return location.location_name if location else None
+
+    def setup_name(self, setup_type_id):
+        setup = self.setup_types.get(setup_type_id)
+        return setup.setup_name if setup else None
+
+    def skill_name(self, skill_id):
+        skill = self.skills.get(skill_id)
+        return skill_name(skill) if skill else None
+
+    def skill_rows(self):
+        """SkillEligibility 용 (skill_id, process, material, position_level)"""
+        return [(s.skill_id, s.process, s.material, s.position_level) for s in self.skills.values()]
+
+    def cost_matrix(self, setup_location_id=4):
+        """이동/셋업 비용 행렬 (셋업 구역별로 한 번만 생성, 읽기 전용)"""
+        with self._lock:
+            matrix = self._cost_matrices.get(setup_location_id)
+            if matrix is None:
+                setup_rows = [(s.setup_type_id, s.setup_cost_minutes) for s in self.setup_types.values()]
+                matrix = CostMatrix.from_rows(self.travel_rows, setup_rows, setup_location_id)
+                for array in (matrix.travel, matrix.setup, matrix.via_setup):
+                    array.flags.writeable = False
+                self._cost_matrices[setup_location_id] = matrix
+            return matrix
+
+
+class MasterDataCache:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+    def _current_version(self):
+        """master_data_version.version, 행이 없으면 None"""
+        return db.session.query(MasterDataVersion.version).filter(MasterDataVersion.id == 1).scalar()
+
+    def _is_stale(self, version, now):
+        if self._data is None:
+            return True
+        if version is not None:
+            return self._data.version != version
+
+        # version 행 없음 → 바뀐 걸 알 수 없으니 TTL 로 다시 로드
+        if self._data.version is not None:
+            return True
+        ttl = current_app.config.get('MASTER_DATA_FALLBACK_TTL', DEFAULT_FALLBACK_TTL_SECONDS)
+        return now - self._loaded_at >= ttl
+
+    def get(self):
+        """최신 MasterData. version 이 바뀌었으면 다시 로드"""
+        interval = current_app.config.get('MASTER_DATA_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL_SECONDS)
+        now = time.monotonic()
+
+        data = self._data
+        if data is not None and now - self._checked_at < interval:
+            return data
+
+        with self._lock:
+            if self._data is not None and now - self._checked_at < interval:
+                return self._data
+
+            version = self._current_version()
+            if self._is_stale(version, now):
+                if version is None and (self._data is None or self._data.version is not None):
+                    current_app.logger.warning(
+                        'master_data_version row (id=1) is missing, master data cache falls back to '
+                        'reloading every MASTER_DATA_FALLBACK_TTL seconds (apply migrations/001)'
+                    )
+                self._data = MasterData.load(version)
+                self._loaded_at = now
+            self._checked_at = now
+            return self._data
+
+    def invalidate(self):
+        """다음 get() 에서 version 을 바로 다시 확인"""
+        with self._lock:
+            self._checked_at = 0.0
+
+
+master_data_cache = MasterDataCache()
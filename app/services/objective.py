@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 # 결함 타입! 7개만
 DEFECT_TYPES = {
@@ -29,3 +30,14 @@ def calculate_severity_score(defect):
     
     return severity_score
 
+
+#calculate_severity_score 의 배열 버전 (결함 여러 개 한 번에, 같은 값)
+## 공식이나 CRITICAL_DEFECT_TYPES 가 바뀌면 이걸로 defects.severity_score 전체 다시 계산
+def severity_scores(defect_types, p_in, p_out, priority_factors):
+    severity = np.where(
+        np.isin(defect_types, CRITICAL_DEFECT_TYPES),
+        1.0,
+        np.maximum(np.asarray(p_in, dtype=float), np.asarray(p_out, dtype=float))
+    )
+    
+    return np.sqrt((severity * 10) ** np.asarray(priority_factors, dtype=float))
@@ -0,0 +1,282 @@
+#/optimize2 최적화 실행 (라우트, 백그라운드 작업 공용)
+## 후보 결함/용접공 선택 → ORToolsScheduler 실행 → 배치 반환
+
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, or_
+from app.extensions import db
+from app.models import Defect, Welder, ScheduledDefect
+from app.services.scheduler_ortools import ORToolsScheduler
+from app.services.scheduler_greedy import GreedyScheduler
+from app.services.decomposition import DecomposedScheduler
+from app.services.master_data import master_data_cache
+from app.services.result_cache import result_cache, problem_fingerprint
+from app.services.scheduling import (
+    SESSION_ORDER, session_window, load_welder_start_states, welder_horizon, carry_over_states
+)
+from app.utils.skill_matcher import build_eligibility_matrix
+from app.utils.profiling import PhaseProfiler, run_profiled
+
+
+# CP-SAT 초기 해: previous(같은 날짜/세션 최근 배치) / greedy(GreedyScheduler 결과) / none
+WARM_START_MODES = ['previous', 'greedy', 'none']
+
+
+def select_candidate_defects(target_date, target_session):
+    target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
+
+    # 이미 확정된 이전 스케쥴의 결함들은 버림.!
+    ## 전날까지 + 같은 날 이전 세션의 확정 배치 → 확정 결함 색인(ScheduledDefect)으로 한 번에
+    already_scheduled = ScheduledDefect.query.filter(
+        ScheduledDefect.defect_id == Defect.defect_id,
+        or_(
+            ScheduledDefect.target_date < target_date_obj,
+            and_(
+                ScheduledDefect.target_date == target_date_obj,
+                ScheduledDefect.session_order < SESSION_ORDER[target_session]
+            )
+        )
+    )
+
+    # pending 상태이면서 이미 스케줄되지 않은 결함만 가져오기
+    return Defect.query.filter(
+        Defect.status == 'pending',
+        Defect.location_id.notin_([1, 3, 4]),  # 구역 A, C, D 제외
+        ~already_scheduled.exists()
+    ).all()
+
+
+def select_candidate_welders():
+    return Welder.query.filter(Welder.status.in_(['available', 'working'])).all()
+
+
+def run_ortools_optimization(target_date, target_session, formulation='pairwise', decompose=False,
+                             warm_start='previous', progress=None, on_incumbent=None, should_stop=None,
+                             profile=None, use_cache=True, time_limit=None):
+    """
+    후보가 없으면 ValueError, 풀이 실패는 Exception 그대로
+
+    time_limit : 풀이 시간 제한(초), 없으면 ORToolsScheduler 기본값
+
+    profile   : 'cprofile' | 'pyinstrument' 이면 전체 실행을 프로파일링 → OPTIMIZATION_PROFILE_DIR 에 리포트 (batch.profile_report)
+    use_cache : 입력이 같으면 결과 캐시의 배치 그대로 반환 (batch.cache_hit), 풀이 결과는 캐시에 저장
+    """
+    params = {
+        'formulation': formulation, 'decompose': decompose, 'warm_start': warm_start,
+        'progress': progress, 'on_incumbent': on_incumbent, 'should_stop': should_stop, 'use_cache': use_cache,
+        'time_limit': time_limit
+    }
+    if profile:
+        name = f"optimize2_{target_date}_{target_session}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        batch, report_path = run_profiled(
+            profile, current_app.config['OPTIMIZATION_PROFILE_DIR'], name,
+            run_ortools_optimization, target_date, target_session, **params
+        )
+        batch.profile_report = report_path
+        return batch
+
+    # 단계별 시간/쿼리 수 → batch.phases (load, build, solve, extract, persist)
+    with PhaseProfiler(db.engine) as profiler:
+        return _run_ortools_optimization(target_date, target_session, profiler=profiler, **params)
+
+
+def _run_ortools_optimization(target_date, target_session, formulation, decompose, warm_start,
+                              progress, on_incumbent, should_stop, use_cache, time_limit, profiler):
+    def report(stage):
+        if progress:
+            progress(stage)
+
+    report('loading')
+    profiler.phase('load')
+
+    defects = select_candidate_defects(target_date, target_session)
+    if not defects:
+        raise ValueError('No pending defects found')
+
+    # 가능한 용접공
+    welders = select_candidate_welders()
+    if not welders:
+        raise ValueError('No available welders found')
+
+    scheduler = ORToolsScheduler(formulation=formulation, warm_start=(warm_start == 'previous'))
+    if time_limit:
+        scheduler.max_time_in_seconds = time_limit
+
+    cost_matrix = master_data_cache.get().cost_matrix(scheduler.setup_location_id)
+    eligibility = build_eligibility_matrix(welders, defects)
+    concurrent_restrictions = scheduler.load_concurrent_restrictions()
+
+    session_start, _, _ = session_window(target_date, target_session)
+    start_states = load_welder_start_states(welders, session_start)
+
+    hint_assignments = None
+    fingerprint = None
+    if use_cache:
+        fingerprint = problem_fingerprint(
+            target_date, target_session, defects, welders, start_states, eligibility, cost_matrix,
+            concurrent_restrictions, scheduler, decompose=decompose, warm_start=warm_start
+        )
+        cached = result_cache.lookup(fingerprint)
+        if cached:
+            profiler.stop()
+            cached.cache_hit = True
+            cached.fingerprint = fingerprint
+            cached.phases = profiler.as_dict()
+            return cached
+
+        # 거의 같은 입력 : 같은 슬롯에서 최근에 쓴 캐시 배치로 warm start
+        if warm_start == 'previous':
+            batch_id = result_cache.warm_start_batch_id(target_date, target_session, formulation)
+            if batch_id:
+                hint_assignments = scheduler.load_hint_assignments(target_date, target_session, batch_id=batch_id)
+
+    if warm_start == 'greedy':
+        profiler.phase('warm_start')
+        hint_assignments = GreedyScheduler().hint_assignments(
+            defects, welders, target_date, target_session,
+            cost_matrix=cost_matrix, eligibility=eligibility, concurrent_restrictions=concurrent_restrictions
+        )
+
+    report('solving')
+
+    # 스킬 호환 그룹별로 나눠서 병렬 풀이 (중간 해 스트리밍은 없음)
+    if decompose:
+        decomposed = DecomposedScheduler(
+            formulation=formulation,
+            warm_start=(warm_start == 'previous'),
+            max_workers=current_app.config.get('OPTIMIZATION_COMPONENT_WORKERS'),
+            time_limit=scheduler.max_time_in_seconds
+        )
+        batch = decomposed.schedule(
+            defects, welders, target_date, target_session,
+            cost_matrix=cost_matrix, eligibility=eligibility, concurrent_restrictions=concurrent_restrictions,
+            hint_assignments=hint_assignments, should_stop=should_stop, profiler=profiler
+        )
+    else:
+        batch = scheduler.schedule(
+            defects, welders, target_date, target_session,
+            cost_matrix=cost_matrix, eligibility=eligibility, concurrent_restrictions=concurrent_restrictions,
+            hint_assignments=hint_assignments, on_incumbent=on_incumbent, should_stop=should_stop,
+            start_states=start_states, profiler=profiler
+        )
+
+    # 중간에 멈춘 결과는 캐시하지 않음
+    if fingerprint and not getattr(batch, 'stopped_early', False):
+        result_cache.store(fingerprint, batch, formulation)
+        batch.cache_hit = False
+        batch.fingerprint = fingerprint
+    return batch
+
+
+def run_day_optimization(target_date, formulation='pairwise', warm_start='previous', time_limit=None):
+    """
+    하루 세 세션(morning → afternoon → night)을 한 번에 풀이 → 세션별 draft 배치 목록
+
+    - 후보 결함/용접공, 스킬 매칭, 비용 행렬, 동시작업 금지 구역은 한 번만 읽어서 세 세션이 같이 사용
+    - 앞 세션에 배정된 결함은 다음 세션 후보에서 빠짐 (남은 결함이 없으면 거기서 끝)
+    - 용접공 시작 위치/셋업은 앞 세션 마지막 작업 그대로 이어받음
+    - 일할 수 있는 용접공이 없거나 배정된 작업이 없는 세션은 배치를 만들지 않고 건너뜀
+    - 세 세션을 모두 푼 뒤에 한 트랜잭션으로 저장 → 중간 세션이 실패하면 아무 배치도 남지 않음
+    후보가 없거나 모든 세션을 건너뛰면 ValueError, 풀이 실패는 Exception 그대로
+    """
+    sessions = sorted(SESSION_ORDER, key=SESSION_ORDER.get)
+
+    defects = select_candidate_defects(target_date, sessions[0])
+    if not defects:
+        raise ValueError('No pending defects found')
+
+    welders = select_candidate_welders()
+    if not welders:
+        raise ValueError('No available welders found')
+
+    scheduler = ORToolsScheduler(formulation=formulation, warm_start=(warm_start == 'previous'))
+    if time_limit:
+        scheduler.max_time_in_seconds = time_limit
+
+    cost_matrix = master_data_cache.get().cost_matrix(scheduler.setup_location_id)
+    eligibility = build_eligibility_matrix(welders, defects)
+    concurrent_restrictions = scheduler.load_concurrent_restrictions()
+
+    # 첫 세션만 현재 용접공 상태(작업 중인 결함)에서 시작
+    session_start, _, _ = session_window(target_date, sessions[0])
+    start_states = load_welder_start_states(welders, session_start)
+
+    #1. 세션 순서대로 풀이만 (profiler 는 persist 단계까지 열어 둠)
+    solved = []  # [(session, result, profiler)]
+    profilers = []
+    remaining = defects
+    try:
+        for k, session in enumerate(sessions):
+            if not remaining:
+                break
+
+            session_start, session_end, horizon = session_window(target_date, session)
+            next_session_start = (
+                session_window(target_date, sessions[k + 1])[0] if k + 1 < len(sessions) else session_end
+            )
+
+            # 퇴근했거나 앞 세션 작업이 세션 끝까지 이어지는 용접공뿐이면 건너뜀
+            if not any(
+                welder_horizon(welder, session_start, session_end, horizon) > start_states[welder.welder_id][2]
+                for welder in welders
+            ):
+                start_states = carry_over_states([], remaining, start_states, session_start, next_session_start)
+                continue
+
+            profiler = PhaseProfiler(db.engine)
+            profilers.append(profiler)
+            profiler.phase('load')
+
+            hint_assignments = None
+            if warm_start == 'greedy':
+                profiler.phase('warm_start')
+                hint_assignments = GreedyScheduler().hint_assignments(
+                    remaining, welders, target_date, session,
+                    cost_matrix=cost_matrix, eligibility=eligibility, concurrent_restrictions=concurrent_restrictions,
+                    start_states=start_states
+                )
+
+            result = scheduler.solve(
+                remaining, welders, target_date, session,
+                cost_matrix=cost_matrix, eligibility=eligibility, concurrent_restrictions=concurrent_restrictions,
+                hint_assignments=hint_assignments, start_states=start_states, profiler=profiler
+            )
+            if result['assignments']:
+                solved.append((session, result, profiler))
+
+            assigned = {a['defect_id'] for a in result['assignments']}
+            start_states = carry_over_states(
+                result['assignments'], remaining, start_states, session_start, next_session_start
+            )
+            remaining = [d for d in remaining if d.defect_id not in assigned]
+
+        if not solved:
+            raise ValueError('No session has welders available for the pending defects')
+
+        #2. 전부 풀린 뒤에 한 번에 저장
+        batches = [
+            scheduler.persist(result, target_date, session, profiler, commit=False)
+            for session, result, profiler in solved
+        ]
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        for profiler in profilers:
+            profiler.close()
+
+    return batches
+
+
+def batch_metrics(batch):
+    """배치 지표 컬럼 + 임시로 붙은 최적화 결과 값 (프로세스 간 전달용). 값이 없으면(NULL) 빠짐"""
+    metrics = {}
+    for key in ['total_travel_cost', 'total_setup_cost', 'solver_time', 'formulation',
+                'incumbent_count', 'stopped_early', 'hints_total', 'hints_accepted',
+                'component_count', 'component_resolves', 'num_variables', 'num_constraints',
+                'phases', 'profile_report', 'repair', 'cache_hit', 'fingerprint']:
+        value = getattr(batch, key, None)
+        if value is not None:
+            metrics[key] = value
+    return metrics
@@ -0,0 +1,176 @@
+#최적화 백그라운드 작업 큐
+## CP-SAT 풀이는 최대 60초 → 웹 요청 안에서 돌리지 않고 로컬 프로세스 풀에서 실행
+## 작업 상태는 Manager dict 로 공유 (웹 프로세스 ↔ 풀 프로세스)
+## accept(탐색 중단) 요청은 상태 dict 와 따로 (stop_requests, 설정만 함)
+##   → 풀 프로세스가 상태를 읽고-고치고-쓰는 사이에 들어온 요청이 덮어써져 사라지지 않게
+##   queued → running(loading / solving) → done | failed
+## 풀이 중 찾은 중간 해(incumbents)도 같이 쌓이고, accept 요청이 오면 탐색을 멈추고 그 해로 배치 생성
+##
+## 주의: 작업 상태는 이 큐를 만든 웹 프로세스 안에만 있음
+##   → /optimize2(비동기), /jobs/<id>, /jobs/<id>/events, /jobs/<id>/accept 는 웹 프로세스 하나로 실행해야 함
+##     (gunicorn 이면 -w 1 --threads N). 워커가 여러 개면 다른 워커로 간 조회는 404
+##   → /jobs/<id>/events 스트림은 연결마다 스레드 하나를 계속 잡음 (0.5초마다 확인, 15초마다 keep-alive)
+##     OPTIMIZATION_SSE_MAX_SECONDS 가 지나면 timeout 이벤트로 끊음
+
+import threading
+import time
+import uuid
+from app.services.scheduler_ortools import DEFAULT_TIME_LIMIT_SECONDS
+from app.services.workers import create_process_pool, spawn_context, worker_app
+
+JOB_TTL_SECONDS = 60 * 60  # 끝난 작업은 1시간 보관
+
+PROGRESS_BY_STAGE = {
+    'queued': 0,
+    'loading': 10,
+    'solving': 30,
+    'done': 100
+}
+SOLVING_PROGRESS_RANGE = (30, 95)  # 풀이 중 진행률은 풀이 시작부터 지난 시간 / 시간 제한으로 이 구간 안에서
+
+
+def _update_status(statuses, job_id, **fields):
+    # Manager dict 의 값은 통째로 다시 넣어야 반영됨
+    status = dict(statuses.get(job_id, {}))
+    status.update(fields)
+    statuses[job_id] = status
+
+
+def _solving_progress(status):
+    """풀이 중 진행률: 풀이 시작부터 지난 시간 / 시간 제한 (중간 해가 없어도 시간 따라 오름)"""
+    time_limit = status['params'].get('time_limit') or DEFAULT_TIME_LIMIT_SECONDS
+    ratio = min((time.time() - status['solving_started_at']) / time_limit, 1.0)
+    low, high = SOLVING_PROGRESS_RANGE
+    return int(low + (high - low) * ratio)
+
+
+def _run_optimization_job(job_id, params, statuses, stop_requests):
+    from app.extensions import db
+    from app.services.optimization import run_ortools_optimization, batch_metrics
+
+    def progress(stage):
+        fields = {}
+        if stage == 'solving':
+            fields['solving_started_at'] = time.time()
+        _update_status(statuses, job_id, status='running', stage=stage, progress=PROGRESS_BY_STAGE.get(stage, 0),
+                       **fields)
+
+    def on_incumbent(incumbent):
+        # 중간 해는 기록만 (진행률은 get() 에서 풀이 시작부터 지난 시간으로)
+        status = statuses.get(job_id, {})
+        _update_status(statuses, job_id, incumbents=status.get('incumbents', []) + [incumbent])
+
+    def should_stop():
+        return job_id in stop_requests
+
+    with worker_app().app_context():
+        try:
+            _update_status(statuses, job_id, started_at=time.time())
+            batch = run_ortools_optimization(
+                progress=progress, on_incumbent=on_incumbent, should_stop=should_stop, **params
+            )
+            result = {'batch_id': batch.batch_id, 'metrics': batch_metrics(batch)}
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
+
+    return result
+
+
+class OptimizationJobQueue:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._statuses = None
+        self._stop_requests = None
+        self.max_workers = None
+
+    def _ensure_started(self, max_workers):
+        if self._executor is not None:
+            return
+
+        self._manager = spawn_context().Manager()
+        self._statuses = self._manager.dict()
+        self._stop_requests = self._manager.dict()
+        self._executor = create_process_pool(max_workers)
+        self.max_workers = max_workers
+
+    def submit(self, params, max_workers=2):
+        with self._lock:
+            self._ensure_started(max_workers)
+            self._prune()
+
+            job_id = uuid.uuid4().hex
+            _update_status(
+                self._statuses, job_id,
+                status='queued',
+                stage='queued',
+                progress=0,
+                params=params,
+                batch_id=None,
+                error=None,
+                created_at=time.time()
+            )
+
+            future = self._executor.submit(
+                _run_optimization_job, job_id, params, self._statuses, self._stop_requests
+            )
+            future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+        return job_id
+
+    def _on_done(self, job_id, future):
+        finished_at = time.time()
+        try:
+            result = future.result()
+        except ValueError as e:
+            # 후보 없음 등 입력 문제
+            _update_status(self._statuses, job_id, status='failed', error=str(e), finished_at=finished_at)
+        except Exception as e:
+            _update_status(self._statuses, job_id, status='failed', error=f'Scheduling failed: {str(e)}',
+                           finished_at=finished_at)
+        else:
+            _update_status(
+                self._statuses, job_id,
+                status='done',
+                stage='done',
+                progress=100,
+                batch_id=result['batch_id'],
+                metrics=result['metrics'],
+                finished_at=finished_at
+            )
+
+    def _prune(self):
+        now = time.time()
+        for job_id, status in list(self._statuses.items()):
+            finished_at = status.get('finished_at')
+            if finished_at and now - finished_at > JOB_TTL_SECONDS:
+                del self._statuses[job_id]
+                self._stop_requests.pop(job_id, None)
+
+    def request_stop(self, job_id):
+        """지금까지 찾은 최선 해를 채택 → 탐색 중단 요청"""
+        if self._statuses is None or job_id not in self._statuses:
+            return None
+
+        self._stop_requests[job_id] = True
+        return self.get(job_id)
+
+    def get(self, job_id):
+        if self._statuses is None:
+            return None
+        status = self._statuses.get(job_id)
+        if status is None:
+            return None
+
+        status = dict(status, accept_requested=job_id in self._stop_requests)
+        if status['status'] == 'running' and status.get('solving_started_at'):
+            status['progress'] = _solving_progress(status)
+        return status
+
+
+job_queue = OptimizationJobQueue()
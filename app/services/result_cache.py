@@ -0,0 +1,151 @@
+#/optimize2 결과 캐시
+## 같은 날짜/세션에 같은 입력으로 다시 요청하면 CP-SAT 를 또 돌리지 않고 그때 만든 배치를 그대로 반환
+## 키 = 정규화한 풀이 입력의 sha256 (problem_fingerprint)
+##   결함 속성, 용접공 시작 상태/퇴근 시간, 스킬 매칭 행렬, 이동/셋업 비용 행렬, 동시작업 금지 구역, 가중치,
+##   풀이 옵션 (formulation, decompose, warm_start, 시간 제한)
+## 캐시 배치가 더 이상 유효한 draft 가 아니면 (확정됨 / repair revision 이 나옴 / 결함이 다른 확정 배치에 들어감) 새로 풀이
+## 키가 다르면 (거의 같은 입력) 같은 슬롯에서 가장 최근에 쓴 캐시 배치를 warm start hint 로
+## optimization_cache 테이블, OPTIMIZATION_CACHE_SIZE 개 넘으면 오래 안 쓴 것부터 삭제 (LRU)
+
+import hashlib
+import json
+from datetime import datetime
+from flask import current_app
+from app.extensions import db
+from app.models import OptimizationCacheEntry, ScheduleBatch, ScheduleJob, ScheduledDefect
+
+DEFAULT_CACHE_SIZE = 200
+
+
+def _float(value):
+    # 0.1 + 0.2 같은 표현 차이로 키가 달라지지 않게
+    return round(float(value), 6)
+
+
+def problem_fingerprint(target_date, target_session, defects, welders, start_states, eligibility, cost_matrix,
+                        concurrent_restrictions, scheduler, decompose=False, warm_start='previous'):
+    """풀이 결과에 영향을 주는 입력만 순서와 상관없이 정규화 → sha256 hex"""
+    digest = hashlib.sha256()
+
+    header = {
+        'target_date': target_date,
+        'target_session': target_session,
+        'formulation': scheduler.formulation,
+        'decompose': bool(decompose),
+        'warm_start': warm_start,
+        'max_time_in_seconds': _float(scheduler.max_time_in_seconds),
+        'travel_weight': scheduler.travel_weight,
+        'setup_weight': scheduler.setup_weight,
+        'setup_location_id': cost_matrix.setup_location_id,
+        'concurrent_restrictions': sorted([sorted(pair) for pair in concurrent_restrictions]),
+        'defects': sorted(
+            [
+                d.defect_id, d.location_id, d.defect_type, _float(d.p_in), _float(d.p_out),
+                d.priority_factor, _float(d.severity_score), d.required_skill_id, d.setup_type_id, d.rework_time
+            ]
+            for d in defects
+        ),
+        'welders': sorted(
+            [
+                w.welder_id,
+                list(start_states[w.welder_id]),
+                w.shift_end_time.strftime('%Y-%m-%d %H:%M:%S')
+            ]
+            for w in welders
+        )
+    }
+    digest.update(json.dumps(header, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+
+    # 스킬 매칭 / 비용 행렬은 배열 그대로 (행/열은 id 순으로 맞춰서)
+    welder_order = sorted(range(len(eligibility.welder_ids)), key=lambda i: eligibility.welder_ids[i])
+    defect_order = sorted(range(len(eligibility.defect_ids)), key=lambda j: eligibility.defect_ids[j])
+    digest.update(eligibility.matrix[welder_order][:, defect_order].astype('uint8').tobytes())
+
+    for array in (cost_matrix.travel, cost_matrix.setup):
+        digest.update(str(array.shape).encode('ascii'))
+        digest.update(array.astype('int32').tobytes())
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+
+    def cache_size(self):
+        return current_app.config.get('OPTIMIZATION_CACHE_SIZE', DEFAULT_CACHE_SIZE)
+
+    def is_current(self, batch):
+        """아직 draft 이고, repair revision 으로 대체되지 않았고, 결함이 다른 배치에서 확정되지 않은 배치"""
+        if batch.status != 'draft':
+            return False
+
+        superseded = db.session.query(
+            db.exists().where(ScheduleBatch.parent_batch_id == batch.batch_id)
+        ).scalar()
+        if superseded:
+            return False
+
+        defect_ids = db.select(ScheduleJob.defect_id).where(ScheduleJob.batch_id == batch.batch_id)
+        scheduled_elsewhere = db.session.query(
+            db.exists().where(ScheduledDefect.defect_id.in_(defect_ids), ScheduledDefect.batch_id != batch.batch_id)
+        ).scalar()
+        return not scheduled_elsewhere
+
+    def lookup(self, fingerprint):
+        """
+        같은 입력으로 만든 배치 (없거나 지워졌거나 더 이상 유효한 draft 가 아니면 None)
+        찾으면 last_used_at / hit_count 갱신. 유효하지 않은 항목은 다음 store() 가 덮어씀
+        """
+        entry = db.session.get(OptimizationCacheEntry, fingerprint)
+        if entry is None:
+            return None
+
+        batch = db.session.get(ScheduleBatch, entry.batch_id)
+        if batch is None or not self.is_current(batch):
+            return None
+
+        entry.last_used_at = datetime.utcnow()
+        entry.hit_count += 1
+        db.session.commit()
+        return batch
+
+    def warm_start_batch_id(self, target_date, target_session, formulation):
+        """같은 슬롯에서 가장 최근에 쓴 캐시 배치 id (거의 같은 입력의 warm start 용)"""
+        return db.session.query(OptimizationCacheEntry.batch_id).filter(
+            OptimizationCacheEntry.target_date == datetime.strptime(target_date, '%Y-%m-%d').date(),
+            OptimizationCacheEntry.target_session == target_session,
+            OptimizationCacheEntry.formulation == formulation
+        ).order_by(OptimizationCacheEntry.last_used_at.desc()).limit(1).scalar()
+
+    def store(self, fingerprint, batch, formulation):
+        now = datetime.utcnow()
+        fields = {
+            'batch_id': batch.batch_id,
+            'target_date': batch.target_date,
+            'target_session': batch.target_session,
+            'formulation': formulation,
+            'last_used_at': now
+        }
+
+        entry = db.session.get(OptimizationCacheEntry, fingerprint)
+        if entry is None:
+            db.session.add(OptimizationCacheEntry(fingerprint=fingerprint, created_at=now, **fields))
+        else:
+            for key, value in fields.items():
+                setattr(entry, key, value)
+        db.session.flush()
+
+        self.evict()
+        db.session.commit()
+
+    def evict(self):
+        """cache_size 개만 남기고 오래 안 쓴 것부터 삭제"""
+        stale = db.session.query(OptimizationCacheEntry.fingerprint).order_by(
+            OptimizationCacheEntry.last_used_at.desc()
+        ).offset(self.cache_size()).subquery()
+
+        OptimizationCacheEntry.query.filter(
+            OptimizationCacheEntry.fingerprint.in_(db.select(stale.c.fingerprint))
+        ).delete(synchronize_session=False)
+
+
+result_cache = ResultCache()
@@ -0,0 +1,50 @@
+#스케쥴 확정 (/confirm)
+## 같은 날짜/세션의 기존 확정 배치는 draft 로 되돌리고, 확정 결함 색인(ScheduledDefect)도 같이 갱신
+##   → /optimize2 후보 선택은 색인 테이블 NOT EXISTS 한 번으로 끝남 (확정 이력 길이와 무관)
+
+from sqlalchemy import select, literal, update, case
+from app.extensions import db
+from app.models import ScheduleBatch, ScheduleJob, ScheduledDefect
+from app.services.scheduling import SESSION_ORDER
+
+
+def confirm_batch(batch):
+    """batch 확정 + 색인 갱신 (커밋은 호출한 쪽에서, 한 트랜잭션)"""
+    # 같은 날짜/세션: batch 는 confirmed, 기존 확정 배치는 draft 로 (UPDATE 한 번)
+    db.session.execute(
+        update(ScheduleBatch)
+        .where(
+            ScheduleBatch.target_date == batch.target_date,
+            ScheduleBatch.target_session == batch.target_session,
+            (ScheduleBatch.status == 'confirmed') | (ScheduleBatch.batch_id == batch.batch_id)
+        )
+        .values(status=case((ScheduleBatch.batch_id == batch.batch_id, 'confirmed'), else_='draft')),
+        execution_options={'synchronize_session': 'fetch'}
+    )
+
+    # 같은 날짜/세션의 다른 배치 색인 삭제 (DELETE 한 번) → batch 색인 추가
+    ScheduledDefect.query.filter(
+        ScheduledDefect.target_date == batch.target_date,
+        ScheduledDefect.session_order == SESSION_ORDER.get(batch.target_session, 0),
+        ScheduledDefect.batch_id != batch.batch_id
+    ).delete(synchronize_session=False)
+
+    index_batch(batch)
+
+
+def index_batch(batch):
+    """배치의 결함들을 색인에 추가 (INSERT ... SELECT 한 번)"""
+    jobs = select(
+        ScheduleJob.defect_id,
+        literal(batch.batch_id),
+        literal(batch.target_date),
+        literal(SESSION_ORDER.get(batch.target_session, 0))
+    ).where(
+        ScheduleJob.batch_id == batch.batch_id
+    ).distinct()
+
+    db.session.execute(
+        ScheduledDefect.__table__.insert().from_select(
+            ['defect_id', 'batch_id', 'target_date', 'session_order'], jobs
+        )
+    )
@@ -0,0 +1,190 @@
+#배치 부분 재계획 (repair)
+## 세션 중 용접공 휴식/퇴근, 결함 우선순위 변경 같은 이벤트 하나 → 전체 재최적화 대신
+##   started/completed 작업은 고정
+##   영향받은 용접공의 남은 작업 + 그 작업을 받을 수 있는 주변 용접공 몇 명만 다시 풀이 (기존 배치를 hint 로)
+##   나머지 용접공 작업은 그대로, 그중 동시작업 금지 구역 작업은 blocked_intervals 로
+## 결과는 새 draft 배치 (parent_batch_id = 원래 배치), 원래 배치는 그대로
+
+import time
+from datetime import datetime
+from app.models import Defect, Welder, ScheduleJob
+from app.services.master_data import master_data_cache
+from app.services.scheduler_ortools import ORToolsScheduler
+from app.services.scheduling import session_window, load_welder_start_states, welder_horizon, save_schedule_batch
+from app.utils.skill_matcher import SkillEligibility
+
+FROZEN_JOB_STATUSES = ['started', 'completed']
+UNAVAILABLE_WELDER_STATUSES = ['on_break', 'off_duty']
+
+DEFAULT_NEIGHBORHOOD = 2  # 빠진 작업을 받을 후보 용접공 수
+REPAIR_TIME_LIMIT_SECONDS = 0.3  # 기존 배치 hint 가 있어서 대부분 첫 해 근처에서 끝남
+
+
+def minutes_since(session_start, time):
+    return int((time - session_start).total_seconds() / 60)
+
+
+def repair_batch(batch, welder_ids=(), defect_ids=(), from_time=None, neighborhood=DEFAULT_NEIGHBORHOOD,
+                 time_limit=REPAIR_TIME_LIMIT_SECONDS, formulation='pairwise'):
+    """
+    batch 를 부분 재계획한 새 draft 배치 반환
+
+    welder_ids : 상태가 바뀐 용접공 (on_break/off_duty 면 남은 작업을 다른 용접공에게)
+    defect_ids : 바뀐 결함 (우선순위 등). 배치에 없던 pending 결함이면 새로 끼워넣기 시도
+    from_time  : 이 시각 이후로만 다시 배치 (기본: 지금, 세션 범위로 자름)
+    """
+    repair_started = time.perf_counter()
+    target_date = batch.target_date.strftime('%Y-%m-%d')
+    session_start, session_end, horizon = session_window(target_date, batch.target_session)
+    from_minutes = min(max(minutes_since(session_start, from_time or datetime.now()), 0), horizon)
+
+    jobs = ScheduleJob.query.filter_by(batch_id=batch.batch_id).all()
+    job_by_defect = {job.defect_id: job for job in jobs}
+    frozen = [job for job in jobs if job.status in FROZEN_JOB_STATUSES]
+    frozen_defect_ids = {job.defect_id for job in frozen}
+
+    #1. 영향받은 용접공 : 바뀐 용접공 + 바뀐 결함을 맡은 용접공
+    affected_welder_ids = set(welder_ids)
+    for defect_id in defect_ids:
+        job = job_by_defect.get(defect_id)
+        if job and job.defect_id not in frozen_defect_ids:
+            affected_welder_ids.add(job.welder_id)
+
+    # 용접공: 작업 가능 상태 전부 + 배치/이벤트에 나온 용접공 (쿼리 1번)
+    welders = {
+        w.welder_id: w for w in Welder.query.filter(
+            Welder.status.in_(['available', 'working'])
+            | Welder.welder_id.in_(affected_welder_ids | {job.welder_id for job in jobs})
+        ).all()
+    }
+
+    def can_work(welder_id):
+        welder = welders.get(welder_id)
+        return (
+            welder is not None
+            and welder.status not in UNAVAILABLE_WELDER_STATUSES
+            and welder_horizon(welder, session_start, session_end, horizon) > from_minutes
+        )
+
+    #2. 다시 배치할 결함 : 영향받은 용접공의 고정 안 된 작업 + 바뀐 결함 (이미 시작/완료된 건 제외)
+    freed_defect_ids = {
+        job.defect_id for job in jobs
+        if job.welder_id in affected_welder_ids and job.defect_id not in frozen_defect_ids
+    }
+    freed_defect_ids |= set(defect_ids) - frozen_defect_ids
+
+    defects = {
+        d.defect_id: d for d in Defect.query.filter(
+            Defect.defect_id.in_({job.defect_id for job in jobs} | set(defect_ids))
+        ).all()
+    }
+    # 배치에 없던 결함은 아직 pending 인 것만
+    freed_defect_ids = {
+        defect_id for defect_id in freed_defect_ids
+        if defect_id in defects and (defect_id in job_by_defect or defects[defect_id].status == 'pending')
+    }
+
+    #3. 주변 용접공 : 빠진 결함을 가장 많이 할 수 있는 용접공 neighborhood 명 (남은 작업 적은 쪽 우선)
+    skill_eligibility = SkillEligibility.load(list(welders))
+    freed_defects = [defects[defect_id] for defect_id in sorted(freed_defect_ids)]
+    candidates = [welders[welder_id] for welder_id in sorted(welders) if welder_id not in affected_welder_ids]
+    candidates = [welder for welder in candidates if can_work(welder.welder_id)]
+
+    remaining_minutes = {}
+    for job in jobs:
+        if job.defect_id not in frozen_defect_ids:
+            remaining_minutes[job.welder_id] = remaining_minutes.get(job.welder_id, 0) + defects[job.defect_id].rework_time
+
+    neighbor_ids = []
+    if freed_defects and candidates:
+        eligibility = skill_eligibility.matrix(candidates, freed_defects)
+        eligible_counts = eligibility.matrix.sum(axis=1)
+        ranked = sorted(
+            (i for i in range(len(candidates)) if eligible_counts[i] > 0),
+            key=lambda i: (-eligible_counts[i], remaining_minutes.get(candidates[i].welder_id, 0))
+        )
+        neighbor_ids = [candidates[i].welder_id for i in ranked[:neighborhood]]
+
+    replan_welder_ids = [welder_id for welder_id in sorted(affected_welder_ids) if can_work(welder_id)] + neighbor_ids
+
+    #4. 다시 풀 결함 = 빠진 결함 + 다시 풀 용접공의 고정 안 된 작업
+    replan_defect_ids = set(freed_defect_ids) | {
+        job.defect_id for job in jobs
+        if job.welder_id in replan_welder_ids and job.defect_id not in frozen_defect_ids
+    }
+    kept_jobs = [job for job in jobs if job.defect_id not in replan_defect_ids]
+
+    # 고정된 작업 뒤 / from_time 이후부터 시작
+    replan_welders = [welders[welder_id] for welder_id in replan_welder_ids]
+    start_states = load_welder_start_states(replan_welders, session_start)
+    for welder_id, (location_id, setup_type_id, earliest) in list(start_states.items()):
+        start_states[welder_id] = (location_id, setup_type_id, max(earliest, from_minutes))
+    for job in sorted(frozen, key=lambda j: j.estimated_end_time):
+        if job.welder_id in start_states:
+            defect = defects[job.defect_id]
+            earliest = max(minutes_since(session_start, job.estimated_end_time), from_minutes)
+            start_states[job.welder_id] = (defect.location_id, defect.setup_type_id, earliest)
+
+    # 그대로 두는 작업 중 금지 구역 작업은 다시 풀 때 피해야 함
+    concurrent_restrictions = list(master_data_cache.get().concurrent_restrictions)
+    restricted_locations = {loc for pair in concurrent_restrictions for loc in pair}
+    blocked_intervals = [
+        (
+            defects[job.defect_id].location_id,
+            minutes_since(session_start, job.estimated_start_time),
+            minutes_since(session_start, job.estimated_end_time)
+        )
+        for job in kept_jobs
+        if defects[job.defect_id].location_id in restricted_locations
+    ]
+
+    result = {'assignments': [], 'solver_time': 0.0}
+    replan_defects = [defects[defect_id] for defect_id in sorted(replan_defect_ids)]
+    if replan_defects and replan_welders:
+        # 기존 배치 그대로를 hint 로
+        hint_assignments = [
+            {
+                'welder_id': job_by_defect[defect_id].welder_id,
+                'defect_id': defect_id,
+                'start_minutes': minutes_since(session_start, job_by_defect[defect_id].estimated_start_time)
+            }
+            for defect_id in replan_defect_ids if defect_id in job_by_defect
+        ]
+
+        scheduler = ORToolsScheduler(formulation=formulation, warm_start=False)
+        scheduler.max_time_in_seconds = time_limit
+        result = scheduler.solve(
+            replan_defects, replan_welders, target_date, batch.target_session,
+            eligibility=skill_eligibility.matrix(replan_welders, replan_defects),
+            concurrent_restrictions=concurrent_restrictions,
+            hint_assignments=hint_assignments,
+            blocked_intervals=blocked_intervals,
+            start_states=start_states
+        )
+
+    #5. 그대로 두는 작업 + 다시 푼 작업 → 새 draft
+    assignments = [
+        {
+            'welder_id': job.welder_id,
+            'defect_id': job.defect_id,
+            'start_minutes': minutes_since(session_start, job.estimated_start_time),
+            'end_minutes': minutes_since(session_start, job.estimated_end_time),
+            'status': job.status
+        }
+        for job in kept_jobs
+    ] + result['assignments']
+    assignments.sort(key=lambda a: (a['welder_id'], a['start_minutes']))
+
+    reassigned = {a['defect_id'] for a in result['assignments']}
+    result['assignments'] = assignments
+    result['repair'] = {
+        'parent_batch_id': batch.batch_id,
+        'from_minutes': from_minutes,
+        'frozen_jobs': len(frozen),
+        'replanned_welder_ids': replan_welder_ids,
+        'replanned_defects': len(replan_defects),
+        'unassigned_defect_ids': sorted(replan_defect_ids - reassigned),
+        'repair_seconds': round(time.perf_counter() - repair_started, 3)  # 저장 전까지 (조회 + 풀이)
+    }
+
+    return save_schedule_batch(result, target_date, batch.target_session, parent_batch_id=batch.batch_id)
@@ -0,0 +1,220 @@
+#빠른 휴리스틱 스케쥴러 (/optimize)
+## 심각도 높은 결함부터 하나씩, 작업 가능한 용접공의 작업 순서 중 가장 싼 자리에 끼워넣기
+##   비용 = 이동 + 2 * 셋업 (ORToolsScheduler 목적함수와 같은 가중치), 같으면 먼저 끝나는 쪽
+##   끼워넣은 뒤 뒤쪽 작업이 밀려서 퇴근 시간을 넘기면 그 자리는 불가
+## 동시작업 금지 구역(F,G) 작업은 다른 용접공의 금지 구역 작업과 겹치지 않게 뒤로 밀어서 배치
+## 결과 형식은 ORToolsScheduler.solve() 와 같음 → CP-SAT warm start hint 로도 사용
+
+import time
+from app.services.master_data import master_data_cache
+from app.services.scheduling import (
+    session_window, load_welder_start_states, welder_horizon,
+    load_concurrent_restrictions, save_schedule_batch
+)
+from app.utils.skill_matcher import build_eligibility_matrix
+
+
+class GreedyScheduler:
+
+    def __init__(self):
+        self.setup_location_id = 4
+        self.travel_weight = 1  #이동 가중치
+        self.setup_weight = 2  #셋업 가중치
+
+    def schedule(self, defects, welders, target_date, target_session, **solve_options):
+        """풀이 + 배치 저장. solve_options 는 solve() 참고"""
+        result = self.solve(defects, welders, target_date, target_session, **solve_options)
+        return save_schedule_batch(result, target_date, target_session)
+
+    def hint_assignments(self, defects, welders, target_date, target_session, **solve_options):
+        """ORToolsScheduler.solve(hint_assignments=...) 용 [{welder_id, defect_id, start_minutes}]"""
+        result = self.solve(defects, welders, target_date, target_session, **solve_options)
+        return [
+            {
+                'welder_id': a['welder_id'],
+                'defect_id': a['defect_id'],
+                'start_minutes': a['start_minutes']
+            }
+            for a in result['assignments']
+        ]
+
+    def solve(self, defects, welders, target_date, target_session, cost_matrix=None, eligibility=None,
+              concurrent_restrictions=None, blocked_intervals=None, start_states=None):
+        """
+        DB 저장 없이 풀이만. 반환: {'assignments': [...], 비용/풀이 지표...}
+
+        blocked_intervals : [(location_id, start_minutes, end_minutes)] 다른 곳에서 이미 잡힌 동시작업 금지 구역 작업
+        start_states      : {welder_id: (위치, 셋업, 시작 가능 시각(분))} 앞 세션 끝 상태 (없으면 현재 용접공 상태에서)
+        """
+        solve_started = time.perf_counter()
+
+        if cost_matrix is None:
+            cost_matrix = master_data_cache.get().cost_matrix(self.setup_location_id)
+        if concurrent_restrictions is None:
+            concurrent_restrictions = load_concurrent_restrictions()
+        if eligibility is None:
+            eligibility = build_eligibility_matrix(welders, defects)
+
+        session_start, session_end, horizon = session_window(target_date, target_session)
+        welder_start = start_states or load_welder_start_states(welders, session_start)
+        end_limits = {
+            welder.welder_id: welder_horizon(welder, session_start, session_end, horizon)
+            for welder in welders
+        }
+
+        # 같은 금지 쌍에 속한 구역끼리는 동시에 작업 불가
+        ## ORToolsScheduler.add_concurrency_constraints 와 같게, 쌍의 두 구역 모두 작업(또는 blocked)이 있을 때만
+        eligible_columns = eligibility.matrix.any(axis=0)
+        locations_in_use = {
+            d.location_id for d in defects if eligible_columns[eligibility.defect_index[d.defect_id]]
+        }
+        locations_in_use |= {loc for loc, start, end in blocked_intervals or [] if end > start}
+
+        conflicting = {}
+        for location_pair in concurrent_restrictions:
+            if not set(location_pair) <= locations_in_use:
+                continue
+            for loc in location_pair:
+                conflicting.setdefault(loc, set()).update(location_pair)
+
+        severities = {d.defect_id: d.severity_score for d in defects}
+
+        sequences = {welder.welder_id: [] for welder in welders}  # 용접공별 작업 순서 [defect]
+        timelines = {welder.welder_id: [] for welder in welders}  # 같은 순서의 [(start, end)]
+
+        def restricted_blocks(welder_id):
+            blocks = list(blocked_intervals or [])
+            for other_id, sequence in sequences.items():
+                if other_id == welder_id:
+                    continue
+                for defect, (start, end) in zip(sequence, timelines[other_id]):
+                    if defect.location_id in conflicting:
+                        blocks.append((defect.location_id, start, end))
+            return blocks
+
+        def build_timeline(welder_id, sequence, blocks, prefix=()):
+            """순서대로 시작/끝 시각 계산. prefix 는 안 바뀌는 앞부분. 퇴근 시간을 넘기면 None"""
+            timeline = list(prefix)
+            if timeline:
+                prev = sequence[len(timeline) - 1]
+                prev_end = timeline[-1][1]
+            else:
+                prev = None
+                prev_end = None
+
+            for defect in sequence[len(timeline):]:
+                if prev is None:
+                    # 첫 작업: 시작 위치 → D구역(장비 셋업) → 작업 위치
+                    start_loc, _, earliest_start = welder_start[welder_id]
+                    start = earliest_start + cost_matrix.via_setup_time(
+                        start_loc, defect.setup_type_id, defect.location_id
+                    )
+                else:
+                    overhead, _, _ = cost_matrix.transition(
+                        prev.location_id, prev.setup_type_id, defect.location_id, defect.setup_type_id
+                    )
+                    start = prev_end + overhead
+
+                if defect.location_id in conflicting:
+                    start = push_past_blocks(start, defect, blocks)
+
+                end = start + defect.rework_time
+                if end > end_limits[welder_id]:
+                    return None
+
+                timeline.append((start, end))
+                prev, prev_end = defect, end
+
+            return timeline
+
+        def push_past_blocks(start, defect, blocks):
+            related = conflicting[defect.location_id]
+            moved = True
+            while moved:
+                moved = False
+                for loc, block_start, block_end in blocks:
+                    if loc in related and start < block_end and block_start < start + defect.rework_time:
+                        start = block_end
+                        moved = True
+            return start
+
+        def sequence_cost(sequence):
+            """(이동, 셋업) 합. 첫 작업 전 이동/셋업은 CP-SAT 쪽과 같이 비용에서 제외"""
+            travel_total = 0
+            setup_total = 0
+            for prev, defect in zip(sequence, sequence[1:]):
+                _, travel, setup = cost_matrix.transition(
+                    prev.location_id, prev.setup_type_id, defect.location_id, defect.setup_type_id
+                )
+                travel_total += travel
+                setup_total += setup
+            return travel_total, setup_total
+
+        def weighted(cost):
+            return self.travel_weight * cost[0] + self.setup_weight * cost[1]
+
+        #1. 심각도 높은 순 (같으면 짧은 작업 먼저)
+        ordered = sorted(defects, key=lambda d: (-severities[d.defect_id], d.rework_time, d.defect_id))
+
+        #2. 결함마다 가장 싼 (용접공, 위치)에 삽입
+        for defect in ordered:
+            best = None
+
+            for welder_id in eligibility.eligible_welder_ids(defect.defect_id):
+                if welder_id not in sequences:
+                    continue
+
+                sequence = sequences[welder_id]
+                current_cost = weighted(sequence_cost(sequence))
+                blocks = restricted_blocks(welder_id)
+
+                for position in range(len(sequence) + 1):
+                    candidate = sequence[:position] + [defect] + sequence[position:]
+                    timeline = build_timeline(welder_id, candidate, blocks, timelines[welder_id][:position])
+                    if timeline is None:
+                        continue
+
+                    key = (weighted(sequence_cost(candidate)) - current_cost, timeline[position][1])
+                    if best is None or key < best[0]:
+                        best = (key, welder_id, candidate, timeline)
+
+            if best is not None:
+                _, welder_id, candidate, timeline = best
+                sequences[welder_id] = candidate
+                timelines[welder_id] = timeline
+
+        #3. 결과 정리
+        assignments = []
+        total_travel_cost = 0
+        total_setup_cost = 0
+
+        for welder_id, sequence in sequences.items():
+            travel_cost, setup_cost = sequence_cost(sequence)
+            total_travel_cost += travel_cost
+            total_setup_cost += setup_cost
+
+            for defect, (start, end) in zip(sequence, timelines[welder_id]):
+                assignments.append({
+                    'welder_id': welder_id,
+                    'defect_id': defect.defect_id,
+                    'location_id': defect.location_id,
+                    'start_minutes': start,
+                    'end_minutes': end,
+                    'severity': severities[defect.defect_id]
+                })
+
+        assignments.sort(key=lambda x: (x['welder_id'], x['start_minutes']))
+
+        objective = (
+            sum(int(a['severity'] * 100) for a in assignments)
+            - self.travel_weight * total_travel_cost
+            - self.setup_weight * total_setup_cost
+        )
+
+        return {
+            'assignments': assignments,
+            'objective': objective,
+            'total_travel_cost': int(total_travel_cost),
+            'total_setup_cost': int(total_setup_cost),
+            'solver_time': time.perf_counter() - solve_started
+        }
@@ -13,222 +13,246 @@ TODO : 필요시 가중치 변경!
   
   심각도: severity * 100 (범위: 50~1000)
   가중치: 1,2
+
+작업 순서 모델 (formulation):
+  pairwise : 작업 쌍마다 순서 BoolVar + 비용 IntVar (기존 방식, O(W·D²) 변수/제약)
+  circuit  : 용접공마다 (depot + 가능한 결함) 노드로 AddCircuit
+             arc(i → j) 리터럴 하나에 이동/셋업 overhead 와 목적함수 비용이 같이 붙음
 """
 
+import threading
 from datetime import datetime, timedelta
 from ortools.sat.python import cp_model
-from app.models import ScheduleBatch, ScheduleJob, TravelMatrix, SetupType, Defect, Location
-from app.services.objective import calculate_severity_score
-from app.utils.skill_matcher import check_skill_match
-from app.extensions import db
+from app.models import ScheduleBatch, ScheduleJob
+from app.services.master_data import master_data_cache
+from app.services.scheduling import (
+    SESSION_TIMES, session_window, load_welder_start_states, welder_horizon,
+    load_concurrent_restrictions, save_schedule_batch
+)
+from app.utils.skill_matcher import build_eligibility_matrix
+from app.utils.profiling import PhaseProfiler
 
 
-class ORToolsScheduler:
+FORMULATIONS = ['pairwise', 'circuit']
+
+DEFAULT_TIME_LIMIT_SECONDS = 60.0  # 풀이 시간 제한 기본값
+
+
+class IncumbentRecorder(cp_model.CpSolverSolutionCallback):
+    """CP-SAT가 더 좋은 해를 찾을 때마다 기록 (목적함수, 이동/셋업 비용, 경과 시간, 배정 초안)"""
     
-    def __init__(self):
-        self.session_times = {
-            'morning': (9, 12),
-            'afternoon': (13, 18),
-            'night': (19, 22)
-        }
-        
-        self.setup_location_id = 4
-        self.concurrent_restricted_locations = [(6, 7), (7, 6)]
+    def __init__(self, task_vars, travel_terms, setup_terms, session_start, on_incumbent=None, should_stop=None):
+        super().__init__()
+        self.task_vars = task_vars
+        self.travel_terms = travel_terms
+        self.setup_terms = setup_terms
+        self.session_start = session_start
+        self.on_incumbent = on_incumbent
+        self.should_stop = should_stop
+        self.incumbents = []
+        self.stopped_early = False
     
-    def get_travel_time(self, from_location_id, to_location_id):
-        if from_location_id == to_location_id:
-            return 0
+    def on_solution_callback(self):
+        assignments = []
+        for welder_id in self.task_vars:
+            for defect_id, (start_var, end_var, _, is_assigned_var) in self.task_vars[welder_id].items():
+                if self.Value(is_assigned_var):
+                    start_minutes = self.Value(start_var)
+                    end_minutes = self.Value(end_var)
+                    assignments.append({
+                        'welder_id': welder_id,
+                        'defect_id': defect_id,
+                        'estimated_start_time': (self.session_start + timedelta(minutes=start_minutes)).strftime('%Y-%m-%d %H:%M:%S'),
+                        'estimated_end_time': (self.session_start + timedelta(minutes=end_minutes)).strftime('%Y-%m-%d %H:%M:%S')
+                    })
+        assignments.sort(key=lambda x: (x['welder_id'], x['estimated_start_time']))
+        
+        incumbent = {
+            'index': len(self.incumbents) + 1,
+            'objective': self.ObjectiveValue(),
+            'best_bound': self.BestObjectiveBound(),
+            'total_travel_cost': sum(minutes * self.Value(var) for minutes, var in self.travel_terms),
+            'total_setup_cost': sum(minutes * self.Value(var) for minutes, var in self.setup_terms),
+            'elapsed_seconds': round(self.WallTime(), 3),
+            'total_defects_scheduled': len(assignments),
+            'assignments': assignments
+        }
+        self.incumbents.append(incumbent)
         
-        travel = TravelMatrix.query.filter_by(
-            from_location_id=from_location_id,
-            to_location_id=to_location_id
-        ).first()
+        if self.on_incumbent:
+            self.on_incumbent(incumbent)
         
-        return travel.travel_time_minutes if travel else 0
-    
-    def get_setup_time(self, setup_type_id):
-        setup = SetupType.query.get(setup_type_id)
-        return setup.setup_cost_minutes if setup else 0
-    
-    
-    ###########스케쥴링!!!!!!!!!##############
+        if self.should_stop and self.should_stop():
+            self.stopped_early = True
+            self.StopSearch()
+
+
+class ORToolsScheduler:
     
-    def schedule(self, defects, welders, target_date, target_session):
-        start_hour, end_hour = self.session_times[target_session]
-        session_start = datetime.strptime(f"{target_date} {start_hour:02d}:00:00", '%Y-%m-%d %H:%M:%S')
-        session_end = datetime.strptime(f"{target_date} {end_hour:02d}:00:00", '%Y-%m-%d %H:%M:%S')
-        
-        horizon = int((session_end - session_start).total_seconds() / 60)
+    def __init__(self, formulation='pairwise', warm_start=True):
+        if formulation not in FORMULATIONS:
+            raise ValueError(f'formulation must be one of {FORMULATIONS}')
         
-        model = cp_model.CpModel()
+        self.formulation = formulation
+        self.warm_start = warm_start  # 같은 날짜/세션의 최근 배치를 solution hint 로 사용
         
-        task_vars = {}  # [welder_id][defect_id] = (start_var, end_var, interval_var, is_assigned_var)
-        is_assigned = {}  # (welder_id, defect_id) -> BoolVar
+        self.session_times = SESSION_TIMES
         
-        defect_locations = {d.defect_id: d.location_id for d in defects}
-        defect_setups = {d.defect_id: d.setup_type_id for d in defects}
-        
-        #용접공 시작 정보!
-        welder_start_location = {} # A구역에서 시작
-        welder_start_time = {}
-        welder_start_setup = {}
-        
-        for welder in welders:
-            if welder.status == 'working' and welder.current_defect_id:
-                current_defect = Defect.query.get(welder.current_defect_id)
-                if current_defect:
-                    estimated_end = session_start + timedelta(minutes=current_defect.rework_time)
-                    
-                    if estimated_end > session_start:
-                        welder_start_time[welder.welder_id] = int((estimated_end - session_start).total_seconds() / 60)
-                    else:
-                        welder_start_time[welder.welder_id] = 0
-                    
-                    welder_start_location[welder.welder_id] = current_defect.location_id
-                    welder_start_setup[welder.welder_id] = current_defect.setup_type_id
-                else:
-                    welder_start_time[welder.welder_id] = 0
-                    welder_start_location[welder.welder_id] = 1 # 구역 A
-                    welder_start_setup[welder.welder_id] = welder.current_setup_id or 4
-            else:
-                welder_start_time[welder.welder_id] = 0
-                welder_start_location[welder.welder_id] = 1
-                welder_start_setup[welder.welder_id] = welder.current_setup_id or 4
-        
-        for welder in welders:
-            task_vars[welder.welder_id] = {}
+        self.setup_location_id = 4
+        self.max_time_in_seconds = DEFAULT_TIME_LIMIT_SECONDS
+        self.travel_weight = 1  #이동 가중치 (λ)
+        self.setup_weight = 2  #셋업 가중치 (μ)
+    
+    def load_concurrent_restrictions(self):
+        """ConcurrentRestriction 테이블 → 동시작업 금지 구역 쌍 목록 ((6, 7), (7, 6) 은 하나로)"""
+        return load_concurrent_restrictions()
+    
+    def load_hint_assignments(self, target_date, target_session, batch_id=None):
+        """같은 날짜/세션의 가장 최근 배치(confirmed, draft) → [{welder_id, defect_id, start_minutes}]"""
+        if batch_id is None:
+            target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
+            batch = ScheduleBatch.query.filter(
+                ScheduleBatch.target_date == target_date_obj,
+                ScheduleBatch.target_session == target_session,
+                ScheduleBatch.status.in_(['confirmed', 'draft'])
+            ).order_by(ScheduleBatch.created_at.desc()).first()
             
-            for defect in defects:
-                if not check_skill_match(welder, defect):
-                    continue
-                
-                duration = defect.rework_time
-                suffix = f'_w{welder.welder_id}_d{defect.defect_id}'
-                
-                start_var = model.NewIntVar(0, horizon, f'start{suffix}')
-                end_var = model.NewIntVar(0, horizon, f'end{suffix}')
-                is_assigned_var = model.NewBoolVar(f'assigned{suffix}')
-                
-                interval_var = model.NewOptionalIntervalVar(
-                    start_var, duration, end_var, is_assigned_var, f'interval{suffix}'
-                )
+            if not batch:
+                return []
+            batch_id = batch.batch_id
+        
+        session_start, _, _ = session_window(target_date, target_session)
+        
+        jobs = ScheduleJob.query.with_entities(
+            ScheduleJob.welder_id,
+            ScheduleJob.defect_id,
+            ScheduleJob.estimated_start_time
+        ).filter_by(batch_id=batch_id).all()
+        
+        return [
+            {
+                'welder_id': welder_id,
+                'defect_id': defect_id,
+                'start_minutes': int((start_time - session_start).total_seconds() / 60)
+            }
+            for welder_id, defect_id, start_time in jobs
+        ]
+    
+    def add_solution_hints(self, model, task_vars, hint_assignments, horizon):
+        """할당/시작 변수에 hint. 반환: (hint 변수, hint 값) 목록 → 풀이 후 몇 개가 그대로인지 확인용"""
+        hinted_by_defect = {h['defect_id']: h for h in hint_assignments}
+        hints = []
+        
+        for welder_id in task_vars:
+            for defect_id, (start_var, _, _, is_assigned_var) in task_vars[welder_id].items():
+                hint = hinted_by_defect.get(defect_id)
                 
-                task_vars[welder.welder_id][defect.defect_id] = (
-                    start_var, end_var, interval_var, is_assigned_var
-                )
-                is_assigned[(welder.welder_id, defect.defect_id)] = is_assigned_var
-        
-        #1. 결함은 1명에게만 할당
-        for defect in defects:
-            assigned_to_defect = []
-            for welder in welders:
-                if defect.defect_id in task_vars.get(welder.welder_id, {}):
-                    assigned_to_defect.append(
-                        is_assigned[(welder.welder_id, defect.defect_id)]
-                    )
-            if assigned_to_defect:
-                model.Add(sum(assigned_to_defect) <= 1)
+                if hint and hint['welder_id'] == welder_id:
+                    hints.append((is_assigned_var, 1))
+                    if 0 <= hint['start_minutes'] <= horizon:
+                        hints.append((start_var, hint['start_minutes']))
+                else:
+                    # 이전 배치에 없던 조합은 미할당으로
+                    hints.append((is_assigned_var, 0))
         
-        #2. 각 용접공은 하나의 작업만
-            if welder.welder_id in task_vars:
-                intervals = [
-                    task_vars[welder.welder_id][defect_id][2]
-                    for defect_id in task_vars[welder.welder_id]
-                ]
-                if intervals:
-                    model.AddNoOverlap(intervals)
+        for var, value in hints:
+            model.AddHint(var, value)
         
-        #3. 시간제약 : session + 용접공 퇴근 전
-        for welder in welders:
-            if welder.welder_id not in task_vars:
-                continue
-            welder_end_time = welder.shift_end_time
+        return hints
+    
+    def add_concurrency_constraints(self, model, task_vars, defect_locations, concurrent_restrictions,
+                                    blocked_intervals=None, global_locations_in_use=None):
+        """
+        금지 구역 쌍마다 해당 구역 작업 interval들에 용량 1짜리 cumulative (동시에 최대 1개 작업)
+        global_locations_in_use : 분할 풀이 때 전체 문제에서 작업이 있는 구역 (이 모델엔 한쪽 구역뿐이어도 cumulative)
+        """
+        for location_pair in concurrent_restrictions:
+            intervals = []
+            locations_in_use = set(global_locations_in_use or ())
             
-            if welder_end_time <= session_start:
-                welder_horizon = 0
-            elif welder_end_time >= session_end:
-                welder_horizon = horizon
-            else:
-                welder_horizon = int((welder_end_time - session_start).total_seconds() / 60)
+            for welder_id in task_vars:
+                for defect_id in task_vars[welder_id]:
+                    loc = defect_locations[defect_id]
+                    if loc in location_pair:
+                        intervals.append(task_vars[welder_id][defect_id][2])
+                        locations_in_use.add(loc)
             
-            for defect_id in task_vars[welder.welder_id]:
-                start_var, end_var, _, is_assigned_var = task_vars[welder.welder_id][defect_id]
-                model.Add(end_var <= welder_horizon).OnlyEnforceIf(is_assigned_var)
+            # 이미 확정된 구간(다른 모델에서 잡힌 작업)은 고정 interval 로
+            for loc, start_minutes, end_minutes in blocked_intervals or []:
+                if loc in location_pair and end_minutes > start_minutes:
+                    intervals.append(model.NewIntervalVar(
+                        start_minutes, end_minutes - start_minutes, end_minutes,
+                        f'blocked_l{loc}_{start_minutes}_{end_minutes}'
+                    ))
+                    locations_in_use.add(loc)
+            
+            # 두 구역 모두 작업이 있을 때만 의미 있음
+            if not set(location_pair) <= locations_in_use:
+                continue
             
-            start_loc = welder_start_location[welder.welder_id]
-            start_setup = welder_start_setup[welder.welder_id]
-            earliest_start = welder_start_time[welder.welder_id]
+            model.AddCumulative(intervals, [1] * len(intervals), 1)
+    
+    def _add_pairwise_sequencing(self, model, task_vars, welder_start, defect_locations, defect_setups, cost_matrix):
+        """작업 쌍마다 순서 BoolVar + 이동/셋업 비용 IntVar"""
+        travel_terms = []
+        setup_terms = []
         
+        for welder_id in task_vars:
+            start_loc, start_setup, earliest_start = welder_start[welder_id]
+            
             first_task_vars = {}
-            for defect_id in task_vars[welder.welder_id]:
-                is_first = model.NewBoolVar(f'first_w{welder.welder_id}_d{defect_id}')
+            for defect_id in task_vars[welder_id]:
+                is_first = model.NewBoolVar(f'first_w{welder_id}_d{defect_id}')
                 first_task_vars[defect_id] = is_first
             
-            for defect_id in task_vars[welder.welder_id]:
-                _, _, _, is_assigned_var = task_vars[welder.welder_id][defect_id]
+            for defect_id in task_vars[welder_id]:
+                _, _, _, is_assigned_var = task_vars[welder_id][defect_id]
                 is_first = first_task_vars[defect_id]
                 model.Add(is_first == 0).OnlyEnforceIf(is_assigned_var.Not())
             
             model.Add(sum(first_task_vars.values()) <= 1)
             
-            assigned_vars = [task_vars[welder.welder_id][d][3] for d in task_vars[welder.welder_id]]
-            has_any_task = model.NewBoolVar(f'has_task_w{welder.welder_id}')
+            assigned_vars = [task_vars[welder_id][d][3] for d in task_vars[welder_id]]
+            has_any_task = model.NewBoolVar(f'has_task_w{welder_id}')
             model.Add(sum(assigned_vars) >= 1).OnlyEnforceIf(has_any_task)
             model.Add(sum(assigned_vars) == 0).OnlyEnforceIf(has_any_task.Not())
             model.Add(sum(first_task_vars.values()) == 1).OnlyEnforceIf(has_any_task)
             
-            for defect_id in task_vars[welder.welder_id]:
-                start_var, _, _, is_assigned_var = task_vars[welder.welder_id][defect_id]
+            for defect_id in task_vars[welder_id]:
+                start_var, _, _, is_assigned_var = task_vars[welder_id][defect_id]
                 is_first = first_task_vars[defect_id]
                 
-                for other_defect_id in task_vars[welder.welder_id]:
+                for other_defect_id in task_vars[welder_id]:
                     if other_defect_id != defect_id:
-                        other_start, _, _, other_assigned = task_vars[welder.welder_id][other_defect_id]
+                        other_start, _, _, other_assigned = task_vars[welder_id][other_defect_id]
                         model.Add(start_var <= other_start).OnlyEnforceIf([is_first, other_assigned])
             
-            for defect_id in task_vars[welder.welder_id]:
-                start_var, _, _, is_assigned_var = task_vars[welder.welder_id][defect_id]
+            for defect_id in task_vars[welder_id]:
+                start_var, _, _, is_assigned_var = task_vars[welder_id][defect_id]
                 is_first = first_task_vars[defect_id]
                 
                 defect_loc = defect_locations[defect_id]
                 defect_setup = defect_setups[defect_id]
                 
                 # 무조건 A구역 → D구역(장비 셋업) → 작업 위치
-                travel_to_d = self.get_travel_time(start_loc, self.setup_location_id)
-                setup_time = self.get_setup_time(defect_setup)
-                travel_to_work = self.get_travel_time(self.setup_location_id, defect_loc)
-                min_start_time = earliest_start + travel_to_d + setup_time + travel_to_work
+                min_start_time = earliest_start + cost_matrix.via_setup_time(start_loc, defect_setup, defect_loc)
                 
                 model.Add(start_var >= min_start_time).OnlyEnforceIf(is_first)
-        
-        #4. 작업 순서, 이동, 셋업 비용
-        travel_cost_vars = {}  # [welder_id][(d1, d2)] -> IntVar
-        setup_cost_vars = {}   # [welder_id][(d1, d2)] -> IntVar
-        order_vars = {}        # [welder_id][(d1, d2)] -> BoolVar (순서 추적)
-        
-        for welder in welders:
-            if welder.welder_id not in task_vars:
-                continue
             
-            travel_cost_vars[welder.welder_id] = {}
-            setup_cost_vars[welder.welder_id] = {}
-            order_vars[welder.welder_id] = {}
-            
-            defect_ids = list(task_vars[welder.welder_id].keys())
+            defect_ids = list(task_vars[welder_id].keys())
             
             # 모든 작업 쌍에 대해 순서 제약
             for i, defect_id_1 in enumerate(defect_ids):
                 for defect_id_2 in defect_ids[i+1:]:
-                    _, end_1, _, assigned_1 = task_vars[welder.welder_id][defect_id_1]
-                    start_2, _, _, assigned_2 = task_vars[welder.welder_id][defect_id_2]
+                    _, end_1, _, assigned_1 = task_vars[welder_id][defect_id_1]
+                    start_2, _, _, assigned_2 = task_vars[welder_id][defect_id_2]
                     
                     # 두 작업이 모두 할당된 경우
-                    both_assigned = model.NewBoolVar(f'both_w{welder.welder_id}_d{defect_id_1}_d{defect_id_2}')
+                    both_assigned = model.NewBoolVar(f'both_w{welder_id}_d{defect_id_1}_d{defect_id_2}')
                     model.AddMultiplicationEquality(both_assigned, [assigned_1, assigned_2])
                     
                     # 작업1 -> 작업2 순서인 경우
-                    task1_before_task2 = model.NewBoolVar(f'order_w{welder.welder_id}_d{defect_id_1}_before_d{defect_id_2}')
-                    order_vars[welder.welder_id][(defect_id_1, defect_id_2)] = task1_before_task2
+                    task1_before_task2 = model.NewBoolVar(f'order_w{welder_id}_d{defect_id_1}_before_d{defect_id_2}')
                     
                     # 작업1이 작업2보다 먼저 끝나는 경우
                     model.Add(end_1 < start_2).OnlyEnforceIf([both_assigned, task1_before_task2])
@@ -242,27 +266,14 @@ class ORToolsScheduler:
                     max_travel = 30  # 최대 이동 시간 (분)
                     max_setup = 30   # 최대 셋업 시간 (분)
                     
-                    travel_cost_12 = model.NewIntVar(0, max_travel, f'travel_w{welder.welder_id}_d{defect_id_1}_to_d{defect_id_2}')
-                    setup_cost_12 = model.NewIntVar(0, max_setup, f'setup_w{welder.welder_id}_d{defect_id_1}_to_d{defect_id_2}')
+                    travel_cost_12 = model.NewIntVar(0, max_travel, f'travel_w{welder_id}_d{defect_id_1}_to_d{defect_id_2}')
+                    setup_cost_12 = model.NewIntVar(0, max_setup, f'setup_w{welder_id}_d{defect_id_1}_to_d{defect_id_2}')
                     
-                    travel_cost_vars[welder.welder_id][(defect_id_1, defect_id_2)] = travel_cost_12
-                    setup_cost_vars[welder.welder_id][(defect_id_1, defect_id_2)] = setup_cost_12
+                    travel_terms.append((1, travel_cost_12))
+                    setup_terms.append((1, setup_cost_12))
                     
-                    #셋업 변경 시 구역 D 경유
-                    if setup_1 != setup_2:
-                        # 작업1 끝 -> 구역D 이동 -> 셋업 -> 작업2 위치 이동 -> 작업2 시작
-                        travel_to_setup = self.get_travel_time(loc_1, self.setup_location_id)
-                        setup_time = self.get_setup_time(setup_2)
-                        travel_to_work = self.get_travel_time(self.setup_location_id, loc_2)
-                        
-                        total_overhead = travel_to_setup + setup_time + travel_to_work
-                        travel_time_12 = travel_to_setup + travel_to_work
-                        setup_time_12 = setup_time
-                    else:
-                        # 단순 이동
-                        total_overhead = self.get_travel_time(loc_1, loc_2)
-                        travel_time_12 = total_overhead
-                        setup_time_12 = 0
+                    #셋업 변경 시 구역 D 경유 (작업1 끝 -> 구역D 이동 -> 셋업 -> 작업2 위치 이동), 아니면 단순 이동
+                    total_overhead, travel_time_12, setup_time_12 = cost_matrix.transition(loc_1, setup_1, loc_2, setup_2)
                     
                     #시간적으로 뒤에 와야함 > 작업2 시작 >= 작업1 종료 + overhead!!!!!
                     model.Add(start_2 >= end_1 + total_overhead).OnlyEnforceIf([both_assigned, task1_before_task2])
@@ -277,88 +288,285 @@ class ORToolsScheduler:
                     model.Add(setup_cost_12 == 0).OnlyEnforceIf(both_assigned.Not())
                     
                     # 반대 순서 (작업2 -> 작업1)
-                    start_1, _, _, _ = task_vars[welder.welder_id][defect_id_1]
-                    _, end_2, _, _ = task_vars[welder.welder_id][defect_id_2]
+                    start_1, _, _, _ = task_vars[welder_id][defect_id_1]
+                    _, end_2, _, _ = task_vars[welder_id][defect_id_2]
                     
                     model.Add(end_2 < start_1).OnlyEnforceIf([both_assigned, task1_before_task2.Not()])
                     
                     # 반대 방향 overhead 계산
-                    if setup_2 != setup_1:
-                        travel_to_setup_rev = self.get_travel_time(loc_2, self.setup_location_id)
-                        setup_time_rev = self.get_setup_time(setup_1)
-                        travel_to_work_rev = self.get_travel_time(self.setup_location_id, loc_1)
-                        total_overhead_rev = travel_to_setup_rev + setup_time_rev + travel_to_work_rev
-                    else:
-                        total_overhead_rev = self.get_travel_time(loc_2, loc_1)
+                    total_overhead_rev, _, _ = cost_matrix.transition(loc_2, setup_2, loc_1, setup_1)
                     
                     model.Add(start_1 >= end_2 + total_overhead_rev).OnlyEnforceIf([both_assigned, task1_before_task2.Not()])
         
-        #5. F,G구역 동시 작업X -> 인데 뭔가 이상한데
-        for t in range(horizon):
-            working_at_f = []
-            working_at_g = []
+        return travel_terms, setup_terms
+    
+    def _add_circuit_sequencing(self, model, task_vars, welder_start, defect_locations, defect_setups, cost_matrix):
+        """용접공마다 depot(0) + 결함 노드 회로. 바로 다음 작업으로 가는 arc에만 비용이 붙음"""
+        travel_terms = []
+        setup_terms = []
+        
+        for welder_id in task_vars:
+            if not task_vars[welder_id]:
+                continue
             
-            for welder_id in task_vars:
-                for defect_id in task_vars[welder_id]:
-                    start_var, end_var, _, is_assigned_var = task_vars[welder_id][defect_id]
-                    loc = defect_locations[defect_id]
+            start_loc, start_setup, earliest_start = welder_start[welder_id]
+            defect_ids = list(task_vars[welder_id].keys())
+            
+            # depot self-loop = 이 용접공은 작업 없음
+            arcs = [(0, 0, model.NewBoolVar(f'idle_w{welder_id}'))]
+            
+            for i, defect_id in enumerate(defect_ids, start=1):
+                start_var, _, _, is_assigned_var = task_vars[welder_id][defect_id]
+                
+                # 결함 self-loop = 할당 안 됨
+                arcs.append((i, i, is_assigned_var.Not()))
+                
+                # depot → 첫 작업: 무조건 시작 위치 → D구역(장비 셋업) → 작업 위치
+                first_lit = model.NewBoolVar(f'first_w{welder_id}_d{defect_id}')
+                min_start_time = earliest_start + cost_matrix.via_setup_time(
+                    start_loc, defect_setups[defect_id], defect_locations[defect_id]
+                )
+                model.Add(start_var >= min_start_time).OnlyEnforceIf(first_lit)
+                arcs.append((0, i, first_lit))
+                
+                # 마지막 작업 → depot
+                arcs.append((i, 0, model.NewBoolVar(f'last_w{welder_id}_d{defect_id}')))
+            
+            for i, defect_id_1 in enumerate(defect_ids, start=1):
+                _, end_1, _, _ = task_vars[welder_id][defect_id_1]
+                
+                for j, defect_id_2 in enumerate(defect_ids, start=1):
+                    if i == j:
+                        continue
+                    
+                    start_2, _, _, _ = task_vars[welder_id][defect_id_2]
                     
-                    is_working_at_t = model.NewBoolVar(f'working_w{welder_id}_d{defect_id}_t{t}')
+                    total_overhead, travel_time_12, setup_time_12 = cost_matrix.transition(
+                        defect_locations[defect_id_1], defect_setups[defect_id_1],
+                        defect_locations[defect_id_2], defect_setups[defect_id_2]
+                    )
                     
-                    model.Add(start_var <= t).OnlyEnforceIf([is_assigned_var, is_working_at_t])
-                    model.Add(end_var > t).OnlyEnforceIf([is_assigned_var, is_working_at_t])
+                    arc_lit = model.NewBoolVar(f'arc_w{welder_id}_d{defect_id_1}_to_d{defect_id_2}')
+                    model.Add(start_2 >= end_1 + total_overhead).OnlyEnforceIf(arc_lit)
+                    arcs.append((i, j, arc_lit))
                     
-                    if loc == 6:
-                        working_at_f.append(is_working_at_t)
-                    elif loc == 7:
-                        working_at_g.append(is_working_at_t)
+                    if travel_time_12:
+                        travel_terms.append((travel_time_12, arc_lit))
+                    if setup_time_12:
+                        setup_terms.append((setup_time_12, arc_lit))
             
-            if working_at_f and working_at_g:
-                model.Add(sum(working_at_f) + sum(working_at_g) <= 1)
+            model.AddCircuit(arcs)
+        
+        return travel_terms, setup_terms
+    
+    
+    ###########스케쥴링!!!!!!!!!##############
+    
+    def schedule(self, defects, welders, target_date, target_session, profiler=None, **solve_options):
+        """풀이 + 배치 저장. solve_options 는 solve() 참고"""
+        profiler = profiler or PhaseProfiler()
+        result = self.solve(defects, welders, target_date, target_session, profiler=profiler, **solve_options)
+        return self.persist(result, target_date, target_session, profiler)
+    
+    def persist(self, result, target_date, target_session, profiler, commit=True):
+        """solve() 결과 저장 (persist 단계), batch.phases 에 단계별 기록. commit 은 save_schedule_batch 참고"""
+        profiler.phase('persist')
+        profiler.count('rows_written', 1 + len(result['assignments']))  # 배치 1 + 작업
+        batch = self.save_batch(result, target_date, target_session, commit=commit)
+        profiler.stop()
+        
+        batch.phases = profiler.as_dict()
+        return batch
+    
+    def solve(self, defects, welders, target_date, target_session, cost_matrix=None, eligibility=None,
+              concurrent_restrictions=None, on_incumbent=None, should_stop=None, hint_assignments=None,
+              blocked_intervals=None, start_states=None, global_locations_in_use=None, profiler=None):
+        """
+        DB 저장 없이 풀이만. 반환: {'assignments': [...], 비용/풀이 지표...}
+        
+        on_incumbent(dict) : 더 좋은 해를 찾을 때마다 호출
+        should_stop()      : True 가 되면 탐색을 멈추고 지금까지 찾은 최선 해로 배치 생성
+        hint_assignments   : [{welder_id, defect_id, start_minutes}] warm start (없으면 최근 배치에서 로드)
+        blocked_intervals  : [(location_id, start_minutes, end_minutes)] 다른 곳에서 이미 잡힌 동시작업 금지 구역 작업
+        start_states       : {welder_id: (위치, 셋업, 시작 가능 시각(분))} 앞 세션 끝 상태 (없으면 현재 용접공 상태에서)
+        global_locations_in_use : add_concurrency_constraints 참고
+        profiler           : PhaseProfiler (load → build → solve → extract 단계별 시간/개수, 결과 'phases')
+        """
+        profiler = profiler or PhaseProfiler()
+        profiler.phase('load')
+        
+        # 이동/셋업 비용은 미리 읽어둔 행렬에서 조회 (없으면 기준정보 캐시에서)
+        if cost_matrix is None:
+            cost_matrix = master_data_cache.get().cost_matrix(self.setup_location_id)
+        
+        if concurrent_restrictions is None:
+            concurrent_restrictions = self.load_concurrent_restrictions()
+        
+        # 용접공 x 결함 스킬 매칭도 행렬 한 번으로
+        if eligibility is None:
+            eligibility = build_eligibility_matrix(welders, defects)
+        
+        session_start, session_end, horizon = session_window(target_date, target_session)
+        
+        #용접공 시작 정보! (위치, 셋업, 시작 가능 시각) - 작업 중인 결함은 한 번에 조회
+        welder_start_states = start_states or load_welder_start_states(welders, session_start)
+        
+        # warm start : 이전 배치 결과를 hint 로 (모델에는 #7 에서)
+        if hint_assignments is None and self.warm_start:
+            hint_assignments = self.load_hint_assignments(target_date, target_session)
+        
+        profiler.phase('build')
+        
+        model = cp_model.CpModel()
+        
+        task_vars = {}  # [welder_id][defect_id] = (start_var, end_var, interval_var, is_assigned_var)
+        is_assigned = {}  # (welder_id, defect_id) -> BoolVar
+        
+        defect_locations = {d.defect_id: d.location_id for d in defects}
+        defect_setups = {d.defect_id: d.setup_type_id for d in defects}
+        
+        for welder in welders:
+            task_vars[welder.welder_id] = {}
+            
+            for defect in defects:
+                if not eligibility.is_eligible(welder.welder_id, defect.defect_id):
+                    continue
+                
+                duration = defect.rework_time
+                suffix = f'_w{welder.welder_id}_d{defect.defect_id}'
+                
+                start_var = model.NewIntVar(0, horizon, f'start{suffix}')
+                end_var = model.NewIntVar(0, horizon, f'end{suffix}')
+                is_assigned_var = model.NewBoolVar(f'assigned{suffix}')
+                
+                interval_var = model.NewOptionalIntervalVar(
+                    start_var, duration, end_var, is_assigned_var, f'interval{suffix}'
+                )
+                
+                task_vars[welder.welder_id][defect.defect_id] = (
+                    start_var, end_var, interval_var, is_assigned_var
+                )
+                is_assigned[(welder.welder_id, defect.defect_id)] = is_assigned_var
+        
+        #1. 결함은 1명에게만 할당
+        for defect in defects:
+            assigned_to_defect = []
+            for welder in welders:
+                if defect.defect_id in task_vars.get(welder.welder_id, {}):
+                    assigned_to_defect.append(
+                        is_assigned[(welder.welder_id, defect.defect_id)]
+                    )
+            if assigned_to_defect:
+                model.Add(sum(assigned_to_defect) <= 1)
+        
+        #2. 각 용접공은 하나의 작업만
+        for welder_id in task_vars:
+            intervals = [
+                task_vars[welder_id][defect_id][2]
+                for defect_id in task_vars[welder_id]
+            ]
+            if intervals:
+                model.AddNoOverlap(intervals)
+        
+        #3. 시간제약 : session + 용접공 퇴근 전
+        for welder in welders:
+            if welder.welder_id not in task_vars:
+                continue
+            end_limit = welder_horizon(welder, session_start, session_end, horizon)
+            
+            for defect_id in task_vars[welder.welder_id]:
+                start_var, end_var, _, is_assigned_var = task_vars[welder.welder_id][defect_id]
+                model.Add(end_var <= end_limit).OnlyEnforceIf(is_assigned_var)
+        
+        #4. 작업 순서, 이동, 셋업 비용 (첫 작업 시작 위치 포함)
+        ## travel_terms / setup_terms : (분, 변수) 목록. Σ 분 * 값 = 실제 이동/셋업 시간
+        welder_start = {welder_id: welder_start_states[welder_id] for welder_id in task_vars}
+        
+        if self.formulation == 'circuit':
+            travel_terms, setup_terms = self._add_circuit_sequencing(
+                model, task_vars, welder_start, defect_locations, defect_setups, cost_matrix
+            )
+        else:
+            travel_terms, setup_terms = self._add_pairwise_sequencing(
+                model, task_vars, welder_start, defect_locations, defect_setups, cost_matrix
+            )
+        
+        #5. 동시작업 금지 구역 (F,G구역 등) -> 분 단위 변수 대신 interval로 직접 제약
+        self.add_concurrency_constraints(
+            model, task_vars, defect_locations, concurrent_restrictions, blocked_intervals, global_locations_in_use
+        )
         
         #6.목적함수 세팅
         objective_terms = []
         
         for defect in defects:
-            severity = int(calculate_severity_score(defect) * 100)
+            severity = int(defect.severity_score * 100)
             for welder in welders:
                 if (welder.welder_id, defect.defect_id) in is_assigned:
                     objective_terms.append(
                         severity * is_assigned[(welder.welder_id, defect.defect_id)]
                     )
         
-        lambda_weight = 1  #이동 가중치
+        lambda_weight = self.travel_weight  #이동 가중치
         
-        for welder_id in travel_cost_vars:
-            for (d1, d2), travel_var in travel_cost_vars[welder_id].items():
-                objective_terms.append(-lambda_weight * travel_var)
+        for minutes, travel_var in travel_terms:
+            objective_terms.append(-lambda_weight * minutes * travel_var)
         
-        mu_weight = 2  #셋업 가중치
+        mu_weight = self.setup_weight  #셋업 가중치
         
-        for welder_id in setup_cost_vars:
-            for (d1, d2), setup_var in setup_cost_vars[welder_id].items():
-                objective_terms.append(-mu_weight * setup_var)
+        for minutes, setup_var in setup_terms:
+            objective_terms.append(-mu_weight * minutes * setup_var)
         
         model.Maximize(sum(objective_terms))
         
+        #7. warm start hint
+        hints = self.add_solution_hints(model, task_vars, hint_assignments, horizon) if hint_assignments else []
+        
+        model_proto = model.Proto()
+        num_variables = len(model_proto.variables)
+        num_constraints = len(model_proto.constraints)
+        profiler.count('variables', num_variables)
+        profiler.count('constraints', num_constraints)
+        
+        profiler.phase('solve')
+        
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 60.0
+        solver.parameters.max_time_in_seconds = self.max_time_in_seconds
+        if hints:
+            # 결함이 바뀌어서 hint 가 그대로는 불가능해도 근처 해로 고쳐서 시작
+            solver.parameters.repair_hint = True
+        
+        recorder = IncumbentRecorder(
+            task_vars, travel_terms, setup_terms, session_start,
+            on_incumbent=on_incumbent, should_stop=should_stop
+        )
         
-        status = solver.Solve(model)
+        # 새 해가 안 나와도 멈출 수 있게 따로 감시 (0.5초 간격)
+        ## 아직 해가 하나도 없으면 멈추지 않음 → 첫 해가 나오면 recorder 가 바로 멈춤
+        solve_finished = threading.Event()
+        stopped_early = threading.Event()
+        if should_stop:
+            def watch_stop_request():
+                while not solve_finished.wait(0.5):
+                    if recorder.incumbents and should_stop():
+                        stopped_early.set()
+                        solver.StopSearch()
+                        return
+            threading.Thread(target=watch_stop_request, daemon=True).start()
+        
+        try:
+            status = solver.Solve(model, recorder)
+        finally:
+            solve_finished.set()
         
         if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            profiler.stop()
             raise Exception(f"No feasible solution found. Status: {solver.StatusName(status)}")
-        batch = ScheduleBatch(
-            target_date=datetime.strptime(target_date, '%Y-%m-%d').date(),
-            target_session=target_session,
-            status='draft'
-        )
-        db.session.add(batch)
-        db.session.flush()
         
+        profiler.phase('extract')
+        
+        defect_by_id = {d.defect_id: d for d in defects}
         assignments = []
-        total_travel_cost = 0
-        total_setup_cost = 0
         
         for welder in welders:
             if welder.welder_id not in task_vars:
@@ -371,50 +579,41 @@ class ORToolsScheduler:
                     start_minutes = solver.Value(start_var)
                     end_minutes = solver.Value(end_var)
                     
-                    defect = next(d for d in defects if d.defect_id == defect_id)
+                    defect = defect_by_id[defect_id]
                     
                     assignments.append({
                         'welder_id': welder.welder_id,
                         'defect_id': defect_id,
+                        'location_id': defect.location_id,
                         'start_minutes': start_minutes,
                         'end_minutes': end_minutes,
-                        'severity': calculate_severity_score(defect)
+                        'severity': defect.severity_score
                     })
         
-        #실제 발생한 이동/셋업 비용 계산
-        for welder_id in travel_cost_vars:
-            for (d1, d2), travel_var in travel_cost_vars[welder_id].items():
-                total_travel_cost += solver.Value(travel_var)
-        
-        for welder_id in setup_cost_vars:
-            for (d1, d2), setup_var in setup_cost_vars[welder_id].items():
-                total_setup_cost += solver.Value(setup_var)
-        
         assignments.sort(key=lambda x: (x['welder_id'], x['start_minutes']))
         
-        #ScheduleJob 생성
-        jobs = []
-        for job_order, assignment in enumerate(assignments, start=1):
-            job_start = session_start + timedelta(minutes=assignment['start_minutes'])
-            job_end = session_start + timedelta(minutes=assignment['end_minutes'])
-            
-            job = ScheduleJob(
-                batch_id=batch.batch_id,
-                welder_id=assignment['welder_id'],
-                defect_id=assignment['defect_id'],
-                job_order=job_order,
-                estimated_start_time=job_start,
-                estimated_end_time=job_end,
-                status='pending'
-            )
-            jobs.append(job)
-        
-        db.session.bulk_save_objects(jobs)
-        db.session.commit()
-        
-        #API 응답 용으로 비용 정보를 배치 객체에 임시 저장
-        batch.total_travel_cost = total_travel_cost
-        batch.total_setup_cost = total_setup_cost
-        batch.solver_time = solver.WallTime()
+        result = {
+            'assignments': assignments,
+            'objective': solver.ObjectiveValue(),
+            #실제 발생한 이동/셋업 비용 계산
+            'total_travel_cost': sum(minutes * solver.Value(var) for minutes, var in travel_terms),
+            'total_setup_cost': sum(minutes * solver.Value(var) for minutes, var in setup_terms),
+            'solver_time': solver.WallTime(),
+            'solver_status': solver.StatusName(status),
+            'best_bound': solver.BestObjectiveBound(),
+            'num_variables': num_variables,
+            'num_constraints': num_constraints,
+            'formulation': self.formulation,
+            'incumbent_count': len(recorder.incumbents),
+            'stopped_early': stopped_early.is_set() or recorder.stopped_early,
+            'hints_total': len(hints),
+            'hints_accepted': sum(1 for var, value in hints if solver.Value(var) == value)
+        }
         
-        return batch
\ No newline at end of file
+        profiler.stop()
+        result['phases'] = profiler.as_dict()
+        return result
+    
+    def save_batch(self, result, target_date, target_session, commit=True):
+        """solve() 결과 → draft ScheduleBatch + ScheduleJob 저장"""
+        return save_schedule_batch(result, target_date, target_session, commit=commit)
@@ -0,0 +1,159 @@
+#스케쥴러 공용 (ORToolsScheduler, GreedyScheduler)
+## 세션 시간, 용접공 시작 상태/퇴근 시간, 동시작업 금지 구역, 배치 저장
+
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.extensions import db
+from app.models import ScheduleBatch, ScheduleJob, Defect
+from app.services.master_data import master_data_cache
+
+SESSION_TIMES = {
+    'morning': (9, 12),
+    'afternoon': (13, 18),
+    'night': (19, 22)
+}
+
+SESSION_ORDER = {'morning': 1, 'afternoon': 2, 'night': 3}
+
+# 배치 컬럼으로 저장하는 결과 지표 (나머지는 응답용 임시 속성)
+## numpy 정수 등은 DB 드라이버가 못 받으니 타입 변환
+BATCH_METRIC_COLUMNS = {'total_travel_cost': int, 'total_setup_cost': int, 'solver_time': float, 'formulation': str}
+
+START_LOCATION_ID = 1  # 구역 A
+BASE_SETUP_ID = 4
+
+
+def session_window(target_date, target_session):
+    """(세션 시작, 세션 끝, 세션 길이(분))"""
+    start_hour, end_hour = SESSION_TIMES[target_session]
+    session_start = datetime.strptime(f"{target_date} {start_hour:02d}:00:00", '%Y-%m-%d %H:%M:%S')
+    session_end = datetime.strptime(f"{target_date} {end_hour:02d}:00:00", '%Y-%m-%d %H:%M:%S')
+
+    horizon = int((session_end - session_start).total_seconds() / 60)
+    return session_start, session_end, horizon
+
+
+def load_welder_start_states(welders, session_start):
+    """용접공별 (시작 위치, 시작 셋업, 가장 빠른 시작 시각(분)). 작업 중이면 그 작업 끝난 뒤부터"""
+    current_defect_ids = [
+        w.current_defect_id for w in welders
+        if w.status == 'working' and w.current_defect_id
+    ]
+    current_defects = {}
+    if current_defect_ids:
+        current_defects = {
+            d.defect_id: d
+            for d in Defect.query.filter(Defect.defect_id.in_(current_defect_ids)).all()
+        }
+
+    start_states = {}
+    for welder in welders:
+        current_defect = None
+        if welder.status == 'working' and welder.current_defect_id:
+            current_defect = current_defects.get(welder.current_defect_id)
+
+        if current_defect:
+            estimated_end = session_start + timedelta(minutes=current_defect.rework_time)
+
+            if estimated_end > session_start:
+                earliest_start = int((estimated_end - session_start).total_seconds() / 60)
+            else:
+                earliest_start = 0
+
+            start_states[welder.welder_id] = (current_defect.location_id, current_defect.setup_type_id, earliest_start)
+        else:
+            start_states[welder.welder_id] = (START_LOCATION_ID, welder.current_setup_id or BASE_SETUP_ID, 0)
+
+    return start_states
+
+
+def welder_horizon(welder, session_start, session_end, horizon):
+    """세션 안에서 퇴근 전까지 일할 수 있는 시간(분)"""
+    welder_end_time = welder.shift_end_time
+
+    if welder_end_time <= session_start:
+        return 0
+    elif welder_end_time >= session_end:
+        return horizon
+    return int((welder_end_time - session_start).total_seconds() / 60)
+
+
+def carry_over_states(assignments, defects, start_states, session_start, next_session_start):
+    """
+    세션 결과 → 다음 세션 시작 상태. 마지막 작업 위치/셋업에서
+    시작 가능 시각은 실제로 끝나는 시각 기준 (다음 세션 시작 전에 끝나면 0분, 넘기면 넘긴 만큼 뒤로)
+    """
+    defect_by_id = {d.defect_id: d for d in defects}
+
+    def next_earliest(minutes):
+        finished_at = session_start + timedelta(minutes=minutes)
+        return max(int((finished_at - next_session_start).total_seconds() / 60), 0)
+
+    next_states = {
+        welder_id: (location_id, setup_type_id, next_earliest(earliest))
+        for welder_id, (location_id, setup_type_id, earliest) in start_states.items()
+    }
+    for assignment in sorted(assignments, key=lambda a: a['end_minutes']):
+        defect = defect_by_id[assignment['defect_id']]
+        next_states[assignment['welder_id']] = (
+            defect.location_id, defect.setup_type_id, next_earliest(assignment['end_minutes'])
+        )
+    return next_states
+
+
+def load_concurrent_restrictions():
+    """동시작업 금지 구역 쌍 목록 ((6, 7), (7, 6) 은 하나로), 기준정보 캐시에서"""
+    return list(master_data_cache.get().concurrent_restrictions)
+
+
+def save_schedule_batch(result, target_date, target_session, parent_batch_id=None, commit=True):
+    """
+    스케쥴 결과 {'assignments': [...], 지표...} → draft ScheduleBatch + ScheduleJob 저장
+    (작업 상태는 assignment 'status', 없으면 pending)
+
+    - 지표 중 BATCH_METRIC_COLUMNS 는 배치 컬럼으로, 나머지는 응답용 임시 속성으로
+    - 작업은 multi-row INSERT ... RETURNING 한 번 (batch.job_ids)
+    - commit=False 면 flush 까지만 (여러 배치를 한 트랜잭션으로 묶을 때 호출하는 쪽에서 commit)
+    """
+    session_start, _, _ = session_window(target_date, target_session)
+
+    metrics = {
+        key: to_type(result[key])
+        for key, to_type in BATCH_METRIC_COLUMNS.items() if result.get(key) is not None
+    }
+    batch = ScheduleBatch(
+        target_date=datetime.strptime(target_date, '%Y-%m-%d').date(),
+        target_session=target_session,
+        status='draft',
+        parent_batch_id=parent_batch_id,
+        **metrics
+    )
+    db.session.add(batch)
+    db.session.flush()
+
+    #ScheduleJob 생성
+    rows = []
+    for job_order, assignment in enumerate(result['assignments'], start=1):
+        rows.append({
+            'batch_id': batch.batch_id,
+            'welder_id': assignment['welder_id'],
+            'defect_id': assignment['defect_id'],
+            'job_order': job_order,
+            'estimated_start_time': session_start + timedelta(minutes=assignment['start_minutes']),
+            'estimated_end_time': session_start + timedelta(minutes=assignment['end_minutes']),
+            'status': assignment.get('status', 'pending')
+        })
+
+    job_ids = []
+    if rows:
+        job_ids = db.session.scalars(insert(ScheduleJob).returning(ScheduleJob.job_id), rows).all()
+    if commit:
+        db.session.commit()
+
+    #API 응답 용으로 나머지 결과 값(단계별 시간, hint 수 등)을 배치 객체에 임시 저장
+    for key, value in result.items():
+        if key not in ['assignments', 'objective'] and key not in BATCH_METRIC_COLUMNS:
+            setattr(batch, key, value)
+    batch.job_ids = job_ids
+
+    return batch
@@ -0,0 +1,107 @@
+#결함 심각도 점수 (defects.severity_score) 일괄 재계산
+## 평소에는 Defect 저장할 때 한 건씩 갱신 (app/models/defect.py)
+## 공식이나 CRITICAL_DEFECT_TYPES 가 바뀌면 → defect_id 순으로 chunk_size 개씩 읽어서 numpy 로 계산, 바뀐 행만 UPDATE
+## 우선순위 일괄 변경 (PATCH /api/defects/batch-priority) 도 여기서 심각도까지 같이 계산해서 한 번에 UPDATE
+
+import numpy as np
+from sqlalchemy import select, update, values, column
+from app.extensions import db
+from app.models import Defect
+from app.services.objective import severity_scores
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def recompute_severity_scores(chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """전체 결함 severity_score 다시 계산 → (확인한 결함 수, 바뀐 결함 수). 한 트랜잭션"""
+    checked = 0
+    changed = 0
+    last_id = 0
+
+    while True:
+        rows = db.session.execute(
+            select(Defect.defect_id, Defect.defect_type, Defect.p_in, Defect.p_out,
+                   Defect.priority_factor, Defect.severity_score)
+            .where(Defect.defect_id > last_id)
+            .order_by(Defect.defect_id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+
+        defect_ids, defect_types, p_in, p_out, priority_factors, old_scores = zip(*rows)
+        scores = severity_scores(defect_types, p_in, p_out, priority_factors)
+        old_scores = np.array([np.nan if score is None else score for score in old_scores], dtype=float)
+
+        # 바뀐 행만 (NULL 포함), PK 기준 bulk UPDATE (executemany)
+        stale = np.flatnonzero(~np.isclose(scores, old_scores, rtol=0, atol=1e-9))
+        if len(stale) and not dry_run:
+            db.session.execute(
+                update(Defect),
+                [{'defect_id': defect_ids[i], 'severity_score': float(scores[i])} for i in stale]
+            )
+
+        checked += len(rows)
+        changed += len(stale)
+        last_id = defect_ids[-1]
+
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    return checked, changed
+
+
+def update_priorities(priorities):
+    """
+    {defect_id: priority_factor} 한 번에 반영 → ({defect_id: 저장된 severity_score}, 없는 defect_id 목록)
+    커밋은 호출한 쪽에서
+
+    - 없는 결함은 조회 한 번으로 확인 (그 조회 결과로 새 심각도를 numpy 로 계산)
+    - PostgreSQL: UPDATE ... FROM (VALUES ...) RETURNING 한 번 → 저장된 값 그대로 반환
+    """
+    rows = db.session.execute(
+        select(Defect.defect_id, Defect.defect_type, Defect.p_in, Defect.p_out)
+        .where(Defect.defect_id.in_(list(priorities)))
+    ).all()
+
+    found = {row.defect_id for row in rows}
+    missing_ids = [defect_id for defect_id in priorities if defect_id not in found]
+    if not rows:
+        return {}, missing_ids
+
+    defect_ids, defect_types, p_in, p_out = zip(*rows)
+    priority_factors = [priorities[defect_id] for defect_id in defect_ids]
+    scores = severity_scores(defect_types, p_in, p_out, priority_factors)
+    data = [
+        (defect_id, priority_factor, float(score))
+        for defect_id, priority_factor, score in zip(defect_ids, priority_factors, scores)
+    ]
+
+    if db.engine.dialect.name == 'postgresql':
+        new_values = values(
+            column('defect_id', db.BigInteger),
+            column('priority_factor', db.Integer),
+            column('severity_score', db.Float),
+            name='new_values'
+        ).data(data)
+
+        updated = db.session.execute(
+            update(Defect)
+            .where(Defect.defect_id == new_values.c.defect_id)
+            .values(priority_factor=new_values.c.priority_factor, severity_score=new_values.c.severity_score)
+            .returning(Defect.defect_id, Defect.severity_score),
+            execution_options={'synchronize_session': False}
+        ).all()
+    else:
+        # VALUES 컬럼 별칭을 못 쓰는 DB (SQLite 등) → PK 기준 executemany
+        db.session.execute(
+            update(Defect),
+            [
+                {'defect_id': defect_id, 'priority_factor': priority_factor, 'severity_score': score}
+                for defect_id, priority_factor, score in data
+            ]
+        )
+        updated = [(defect_id, score) for defect_id, _, score in data]
+
+    return dict(updated), missing_ids
@@ -0,0 +1,54 @@
+#로컬 프로세스 풀 (최적화 작업, 분할 풀이 공용)
+## fork 하면 부모의 DB 커넥션을 물려받으므로 spawn + 프로세스마다 앱 하나
+## 풀 프로세스 시작(create_app 포함)이 비싸서 분할 풀이 풀/Manager 는 프로세스마다 하나 만들어 계속 재사용
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_worker_app = None
+
+_shared_lock = threading.Lock()
+_shared_pool = None
+_shared_manager = None
+
+
+def init_worker_app():
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app()
+
+
+def worker_app():
+    return _worker_app
+
+
+def spawn_context():
+    return multiprocessing.get_context('spawn')
+
+
+def create_process_pool(max_workers):
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=spawn_context(),
+        initializer=init_worker_app
+    )
+
+
+def shared_process_pool(max_workers):
+    """이 프로세스의 공용 풀 (처음 부른 max_workers 크기로 한 번만 생성)"""
+    global _shared_pool
+    with _shared_lock:
+        # 풀 프로세스가 죽으면(BrokenProcessPool) 그 풀은 다시 못 쓰니 새로
+        if _shared_pool is None or getattr(_shared_pool, '_broken', False):
+            _shared_pool = create_process_pool(max_workers)
+        return _shared_pool
+
+
+def shared_manager():
+    """풀 프로세스와 주고받을 Event 등을 만드는 공용 Manager"""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = spawn_context().Manager()
+        return _shared_manager
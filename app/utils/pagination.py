@@ -0,0 +1,60 @@
+#keyset 페이지네이션 (목록 API 공용)
+## cursor = 마지막으로 준 행의 (정렬 키...) 를 base64 로 감싼 문자열 → 다음 페이지는 그 뒤부터
+## OFFSET 과 달리 몇 번째 페이지든 인덱스로 바로 찾아감
+
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+def parse_limit(value, default=DEFAULT_PAGE_LIMIT, maximum=MAX_PAGE_LIMIT):
+    """limit 파라미터 → 1 ~ maximum. 양의 정수가 아니면 ValueError"""
+    if value is None:
+        return default
+
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        limit = 0
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, maximum)
+
+
+def encode_cursor(*keys):
+    values = [key.isoformat() if isinstance(key, datetime) else key for key in keys]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, types):
+    """encode_cursor 결과 → 키 튜플. types 는 키별 타입 (datetime 이면 isoformat 파싱). 잘못되면 ValueError"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeError):
+        raise ValueError('invalid cursor')
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError('invalid cursor')
+
+    keys = []
+    for value, key_type in zip(values, types):
+        try:
+            keys.append(datetime.fromisoformat(value) if key_type is datetime else key_type(value))
+        except (TypeError, ValueError):
+            raise ValueError('invalid cursor')
+    return tuple(keys)
+
+
+def parse_fields(value, allowed):
+    """fields=a,b,c → 순서 유지한 목록. 없으면 전체, 모르는 필드는 ValueError"""
+    if not value:
+        return list(allowed)
+
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f'unknown fields: {unknown}')
+    return fields
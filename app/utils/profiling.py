@@ -0,0 +1,98 @@
+#최적화 단계별 시간/개수 기록 + 디버그용 프로파일 리포트
+## phase(name) 으로 다음 단계 시작 (이전 단계는 자동 종료), 같은 이름은 누적
+## engine 을 주면 단계마다 SQL 실행 횟수도 셈 (만든 스레드에서 실행된 것만)
+
+import cProfile
+import importlib.util
+import io
+import os
+import pstats
+import threading
+import time
+from sqlalchemy import event
+
+PROFILERS = ['cprofile', 'pyinstrument']
+
+
+class PhaseProfiler:
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.phases = {}  # 이름 → {'seconds': ..., 'queries': ..., 그 외 개수}
+        self._current = None
+        self._started = None
+        self._thread_id = threading.get_ident()
+
+        if engine is not None:
+            event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self._thread_id:
+            self.count('queries')
+
+    def phase(self, name):
+        self.stop()
+        default = {'seconds': 0.0, 'queries': 0} if self.engine is not None else {'seconds': 0.0}
+        self._current = self.phases.setdefault(name, default)
+        self._started = time.perf_counter()
+
+    def count(self, key, amount=1):
+        """지금 단계에 개수 더하기 (변수/제약 수, 저장 행 수 등)"""
+        if self._current is not None:
+            self._current[key] = self._current.get(key, 0) + amount
+
+    def stop(self):
+        if self._current is not None:
+            self._current['seconds'] += time.perf_counter() - self._started
+            self._current = None
+
+    def close(self):
+        self.stop()
+        if self.engine is not None:
+            event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+            self.engine = None
+
+    def as_dict(self):
+        return {name: dict(values) for name, values in self.phases.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def available_profilers():
+    # pyinstrument 는 선택 설치
+    return [kind for kind in PROFILERS if kind != 'pyinstrument' or importlib.util.find_spec('pyinstrument')]
+
+
+def run_profiled(kind, report_dir, name, func, *args, **kwargs):
+    """func 실행을 cProfile / pyinstrument 로 감싸서 리포트 저장. 반환: (func 결과, 리포트 경로)"""
+    os.makedirs(report_dir, exist_ok=True)
+    base_path = os.path.join(report_dir, name)
+
+    if kind == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.stop()
+            with open(f'{base_path}.html', 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        return result, f'{base_path}.html'
+
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(func, *args, **kwargs)
+    finally:
+        # .prof 는 snakeviz 등으로, .txt 는 바로 읽기용 (누적 시간 상위 50개)
+        profiler.dump_stats(f'{base_path}.prof')
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(50)
+        with open(f'{base_path}.txt', 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+    return result, f'{base_path}.prof'
@@ -1,34 +1,119 @@
-from app.models import WelderSkill, Skill
+import numpy as np
+from app.models import WelderSkill
+from app.services.master_data import master_data_cache
+
+
+#스킬 매칭 조건: process 같고, material 같고, 용접공 position_level >= 요구 position_level
+## skills 는 기준정보 캐시, welder_skills 는 쿼리 1번으로 읽고, 문자열은 정수 코드로 바꿔서 numpy로 한 번에 비교
+class EligibilityMatrix:
+
+    def __init__(self, matrix, welder_ids, defect_ids):
+        self.matrix = matrix  # [welder_idx, defect_idx] -> bool
+        self.welder_ids = list(welder_ids)
+        self.defect_ids = list(defect_ids)
+        self.welder_index = {welder_id: i for i, welder_id in enumerate(self.welder_ids)}
+        self.defect_index = {defect_id: j for j, defect_id in enumerate(self.defect_ids)}
+
+    def is_eligible(self, welder_id, defect_id):
+        i = self.welder_index.get(welder_id)
+        j = self.defect_index.get(defect_id)
+        if i is None or j is None:
+            return False
+        return bool(self.matrix[i, j])
+
+    def eligible_welder_ids(self, defect_id):
+        j = self.defect_index.get(defect_id)
+        if j is None:
+            return []
+        return [self.welder_ids[i] for i in np.flatnonzero(self.matrix[:, j])]
+
+    def eligible_defect_ids(self, welder_id):
+        i = self.welder_index.get(welder_id)
+        if i is None:
+            return []
+        return [self.defect_ids[j] for j in np.flatnonzero(self.matrix[i, :])]
+
+
+class SkillEligibility:
+
+    def __init__(self, skill_rows, welder_skill_rows):
+        # skill_rows: (skill_id, process, material, position_level)
+        # welder_skill_rows: (welder_id, skill_id)
+        self.skill_index = {row[0]: k for k, row in enumerate(skill_rows)}
+
+        process_codes = {}
+        material_codes = {}
+        process = np.array([process_codes.setdefault(row[1], len(process_codes)) for row in skill_rows], dtype=np.int32)
+        material = np.array([material_codes.setdefault(row[2], len(material_codes)) for row in skill_rows], dtype=np.int32)
+        level = np.array([row[3] for row in skill_rows], dtype=np.int32)
+
+        # covers[보유 스킬, 요구 스킬] : 보유 스킬로 요구 스킬 작업 가능 여부
+        self.covers = (
+            (process[:, None] == process[None, :])
+            & (material[:, None] == material[None, :])
+            & (level[:, None] >= level[None, :])
+        )
+
+        self.welder_skill_ids = {}
+        for welder_id, skill_id in welder_skill_rows:
+            self.welder_skill_ids.setdefault(welder_id, []).append(skill_id)
+
+    @classmethod
+    def load(cls, welder_ids=None):
+        # 스킬 목록은 기준정보 캐시에서, 용접공 보유 스킬만 조회
+        skill_rows = master_data_cache.get().skill_rows()
+
+        query = WelderSkill.query.with_entities(WelderSkill.welder_id, WelderSkill.skill_id)
+        if welder_ids is not None:
+            query = query.filter(WelderSkill.welder_id.in_(list(welder_ids)))
+
+        return cls(skill_rows, query.all())
+
+    def matrix(self, welders, defects):
+        welder_ids = [w.welder_id for w in welders]
+        defect_ids = [d.defect_id for d in defects]
+        num_skills = len(self.skill_index)
+
+        # has_skill[용접공, 스킬]
+        has_skill = np.zeros((len(welder_ids), num_skills), dtype=np.int32)
+        for i, welder_id in enumerate(welder_ids):
+            for skill_id in self.welder_skill_ids.get(welder_id, []):
+                k = self.skill_index.get(skill_id)
+                if k is not None:
+                    has_skill[i, k] = 1
+
+        # 없는 스킬을 요구하는 결함은 아무도 못 함
+        required = np.array([self.skill_index.get(d.required_skill_id, -1) for d in defects], dtype=np.int64)
+        known = required >= 0
+        required_covers = np.zeros((num_skills, len(defect_ids)), dtype=np.int32)
+        if num_skills:
+            required_covers[:, known] = self.covers[:, required[known]]
+
+        matrix = (has_skill @ required_covers) > 0
+        return EligibilityMatrix(matrix, welder_ids, defect_ids)
+
+
+def build_eligibility_matrix(welders, defects):
+    """용접공 x 결함 작업 가능 행렬 (용접공 스킬 쿼리 1번)"""
+    engine = SkillEligibility.load([w.welder_id for w in welders])
+    return engine.matrix(welders, defects)
 
 
 def check_skill_match(welder, defect):
-    required_skill = Skill.query.get(defect.required_skill_id)
-    welder_skills = WelderSkill.query.filter_by(welder_id=welder.welder_id).all()
-    
-    for ws in welder_skills:
-        welder_skill = Skill.query.get(ws.skill_id)
-        
-        if welder_skill.process != required_skill.process:
-            continue
-        
-        if welder_skill.material != required_skill.material:
-            continue
-        
-        if welder_skill.position_level >= required_skill.position_level:
-            return True
-    
-    return False
+    return build_eligibility_matrix([welder], [defect]).is_eligible(welder.welder_id, defect.defect_id)
 
 
-def get_available_welders(defect, welders):
+def get_available_welders(defect, welders, eligibility=None):
+    if eligibility is None:
+        eligibility = build_eligibility_matrix(welders, [defect])
+
     available = []
-    
+
     for welder in welders:
         if welder.status not in ['available', 'working']:
             continue
-        
-        if check_skill_match(welder, defect):
+
+        if eligibility.is_eligible(welder.welder_id, defect.defect_id):
             available.append(welder)
-    
-    return available
 
+    return available
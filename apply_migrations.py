@@ -0,0 +1,82 @@
+"""
+DB 마이그레이션 적용 스크립트
+
+- migrations/*.sql 을 파일 이름 순서대로 실행
+- 적용한 파일은 schema_migrations 테이블에 기록 → 다시 실행해도 새 파일만 적용
+- 파일 하나 = 트랜잭션 하나 (실패하면 그 파일은 롤백하고 중단)
+
+실행 방법:
+    python apply_migrations.py
+    python apply_migrations.py --list   # 적용 여부만 확인
+"""
+
+import os
+import sys
+from app import create_app
+from app.extensions import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+
+def ensure_migrations_table():
+    db.session.execute(db.text(
+        'CREATE TABLE IF NOT EXISTS schema_migrations ('
+        ' filename VARCHAR(255) PRIMARY KEY,'
+        ' applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP'
+        ')'
+    ))
+    db.session.commit()
+
+
+def migration_files():
+    return sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith('.sql'))
+
+
+def applied_migrations():
+    rows = db.session.execute(db.text('SELECT filename FROM schema_migrations')).all()
+    return {row[0] for row in rows}
+
+
+def apply_migration(filename):
+    with open(os.path.join(MIGRATIONS_DIR, filename), encoding='utf-8') as f:
+        sql = f.read()
+
+    try:
+        # 함수 정의($$ ... $$) 등 여러 문장을 그대로 드라이버에 전달
+        db.session.connection().exec_driver_sql(sql)
+        db.session.execute(
+            db.text('INSERT INTO schema_migrations (filename) VALUES (:filename)'),
+            {'filename': filename}
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def main():
+    app = create_app()
+
+    with app.app_context():
+        ensure_migrations_table()
+        applied = applied_migrations()
+        pending = [f for f in migration_files() if f not in applied]
+
+        if '--list' in sys.argv:
+            for filename in migration_files():
+                print(f"{'✅' if filename in applied else '⏳'} {filename}")
+            return
+
+        if not pending:
+            print("✅ No pending migrations")
+            return
+
+        for filename in pending:
+            print(f"🔧 Applying {filename}...")
+            apply_migration(filename)
+
+        print(f"✅ {len(pending)} migrations applied")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+동시작업 금지(F, G구역) 제약 인코딩 벤치마크
+
+- legacy   : 기존 방식. 분(t)마다 작업별 BoolVar + reified 제약 2개
+- interval : 금지 구역 쌍마다 optional interval 에 용량 1 cumulative
+
+DB 없이 임의 데이터로 모델만 만들어서 변수/제약 개수, 풀이 시간을 비교함
+
+실행 방법:
+    python benchmark_concurrency.py
+    python benchmark_concurrency.py --welders 7 --defects 80 --session afternoon --time-limit 10
+"""
+
+import argparse
+import random
+import time
+from ortools.sat.python import cp_model
+from app.services.scheduler_ortools import ORToolsScheduler
+
+WORK_LOCATIONS = [2, 5, 6, 7]  # B, E, F, G
+RESTRICTIONS = [(6, 7)]
+
+
+def make_instance(num_welders, num_defects, seed):
+    rng = random.Random(seed)
+    defects = [
+        {
+            'defect_id': d,
+            'location_id': rng.choice(WORK_LOCATIONS),
+            'rework_time': rng.randint(30, 120),
+            'severity': rng.randint(50, 1000)
+        }
+        for d in range(1, num_defects + 1)
+    ]
+    # 용접공마다 대략 1/3 결함 가능
+    eligible = {
+        w: [d['defect_id'] for d in defects if rng.random() < 0.35]
+        for w in range(1, num_welders + 1)
+    }
+    return defects, eligible
+
+
+def build_base_model(defects, eligible, horizon):
+    model = cp_model.CpModel()
+    task_vars = {}
+    defect_by_id = {d['defect_id']: d for d in defects}
+
+    for welder_id, defect_ids in eligible.items():
+        task_vars[welder_id] = {}
+        for defect_id in defect_ids:
+            duration = defect_by_id[defect_id]['rework_time']
+            suffix = f'_w{welder_id}_d{defect_id}'
+            start_var = model.NewIntVar(0, horizon, f'start{suffix}')
+            end_var = model.NewIntVar(0, horizon, f'end{suffix}')
+            is_assigned_var = model.NewBoolVar(f'assigned{suffix}')
+            interval_var = model.NewOptionalIntervalVar(start_var, duration, end_var, is_assigned_var, f'interval{suffix}')
+            task_vars[welder_id][defect_id] = (start_var, end_var, interval_var, is_assigned_var)
+
+        model.AddNoOverlap([v[2] for v in task_vars[welder_id].values()])
+
+    for defect in defects:
+        assigned = [task_vars[w][defect['defect_id']][3] for w in task_vars if defect['defect_id'] in task_vars[w]]
+        if assigned:
+            model.Add(sum(assigned) <= 1)
+
+    model.Maximize(sum(
+        defect_by_id[defect_id]['severity'] * task_vars[w][defect_id][3]
+        for w in task_vars for defect_id in task_vars[w]
+    ))
+    return model, task_vars
+
+
+def add_legacy_concurrency(model, task_vars, defect_locations, horizon):
+    # 기존 scheduler_ortools.py #5 그대로
+    for t in range(horizon):
+        working_at_f = []
+        working_at_g = []
+
+        for welder_id in task_vars:
+            for defect_id in task_vars[welder_id]:
+                start_var, end_var, _, is_assigned_var = task_vars[welder_id][defect_id]
+                loc = defect_locations[defect_id]
+
+                is_working_at_t = model.NewBoolVar(f'working_w{welder_id}_d{defect_id}_t{t}')
+
+                model.Add(start_var <= t).OnlyEnforceIf([is_assigned_var, is_working_at_t])
+                model.Add(end_var > t).OnlyEnforceIf([is_assigned_var, is_working_at_t])
+
+                if loc == 6:
+                    working_at_f.append(is_working_at_t)
+                elif loc == 7:
+                    working_at_g.append(is_working_at_t)
+
+        if working_at_f and working_at_g:
+            model.Add(sum(working_at_f) + sum(working_at_g) <= 1)
+
+
+def run(encoding, defects, eligible, horizon, time_limit):
+    build_started = time.perf_counter()
+    model, task_vars = build_base_model(defects, eligible, horizon)
+    defect_locations = {d['defect_id']: d['location_id'] for d in defects}
+
+    if encoding == 'legacy':
+        add_legacy_concurrency(model, task_vars, defect_locations, horizon)
+    else:
+        ORToolsScheduler().add_concurrency_constraints(model, task_vars, defect_locations, RESTRICTIONS)
+    build_time = time.perf_counter() - build_started
+
+    proto = model.Proto()
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    status = solver.Solve(model)
+
+    return {
+        'encoding': encoding,
+        'variables': len(proto.variables),
+        'constraints': len(proto.constraints),
+        'build_time': build_time,
+        'solve_time': solver.WallTime(),
+        'status': solver.StatusName(status),
+        'objective': solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='F/G 동시작업 제약 인코딩 비교')
+    parser.add_argument('--welders', type=int, default=7)
+    parser.add_argument('--defects', type=int, default=80)
+    parser.add_argument('--session', choices=['morning', 'afternoon', 'night'], default='afternoon')
+    parser.add_argument('--time-limit', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    start_hour, end_hour = ORToolsScheduler().session_times[args.session]
+    horizon = (end_hour - start_hour) * 60
+
+    defects, eligible = make_instance(args.welders, args.defects, args.seed)
+    print(f"용접공 {args.welders}명, 결함 {args.defects}개, {args.session} ({horizon}분)\n")
+    print(f"{'encoding':10s} {'variables':>10s} {'constraints':>12s} {'build(s)':>9s} {'solve(s)':>9s} {'status':>10s} {'objective':>10s}")
+
+    for encoding in ['legacy', 'interval']:
+        r = run(encoding, defects, eligible, horizon, args.time_limit)
+        objective = f"{r['objective']:.0f}" if r['objective'] is not None else '-'
+        print(f"{r['encoding']:10s} {r['variables']:10d} {r['constraints']:12d} "
+              f"{r['build_time']:9.2f} {r['solve_time']:9.2f} {r['status']:>10s} {objective:>10s}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+ORToolsScheduler 규모별 벤치마크
+
+- DB 없이 고정 seed 로 만든 기준정보/용접공/결함으로 solve() 만 실행 (저장 X)
+- 결함 수 x 용접공 수 x 세션 조합마다 모델 크기, 빌드/풀이 시간, 목적함수, gap, 최대 RSS 기록
+- 조합마다 새 프로세스에서 돌려서 RSS 가 앞 조합에 영향 안 받게 함
+- --baseline 으로 이전 결과 JSON 과 비교 (풀이 시간 / 목적함수 회귀 표시)
+
+실행 방법:
+    python benchmark_scheduler.py                                  # 기본: 20/80/200/500 x 5/20/50 x 3세션
+    python benchmark_scheduler.py --defects 20 80 --welders 5 20 --sessions morning --time-limit 5
+    python benchmark_scheduler.py --output baseline.json           # 기준 결과 저장
+    python benchmark_scheduler.py --baseline baseline.json --output latest.json --fail-on-regression
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from app.services.master_data import MasterData
+from app.services.objective import calculate_severity_score
+from app.services.scheduler_ortools import FORMULATIONS, ORToolsScheduler
+from app.services.scheduling import SESSION_TIMES
+from app.utils.skill_matcher import SkillEligibility
+
+TARGET_DATE = '2025-11-18'
+WORK_LOCATIONS = [2, 3, 5, 6, 7]  # 작업 구역 (A: 대기, D: 셋업)
+
+BenchWelder = namedtuple('BenchWelder', [
+    'welder_id', 'status', 'current_defect_id', 'current_setup_id', 'shift_end_time'
+])
+BenchDefect = namedtuple('BenchDefect', [
+    'defect_id', 'location_id', 'defect_type', 'p_in', 'p_out', 'priority_factor',
+    'required_skill_id', 'setup_type_id', 'rework_time', 'severity_score'
+])
+
+
+def make_master_data():
+    """구역 A~G, 셋업 3종 + Base, 스킬 (공정 x 재질 x 자세), 이동시간 |a-b| * 3분, F/G 동시작업 금지"""
+    locations = [(i, f'구역 {name}') for i, name in enumerate('ABCDEFG', start=1)]
+    setup_types = [(1, 'SMAW', 10), (2, 'GTAW', 15), (3, 'GMAW', 12), (4, 'Base', 0)]
+
+    skills = []
+    for process in ['SMAW', 'GTAW', 'GMAW']:
+        for material in ['탄소강', '스테인리스강']:
+            for level in [1, 3, 6]:
+                skills.append((len(skills) + 1, process, f'{level}G', level, material))
+
+    travel_rows = [
+        (a, b, abs(a - b) * 3)
+        for a, _ in locations for b, _ in locations if a != b
+    ]
+    return MasterData(0, locations, setup_types, skills, travel_rows, [(6, 7)])
+
+
+def make_instance(master_data, num_defects, num_welders, seed):
+    """용접공 (스킬 4개씩, 절반은 18시 / 절반은 20시 퇴근) + pending 결함"""
+    rng = random.Random(seed)
+    skill_ids = list(master_data.skills)
+
+    welders = []
+    welder_skill_rows = []
+    for welder_id in range(1, num_welders + 1):
+        shift_end = datetime.strptime(f'{TARGET_DATE} {18 if welder_id % 2 else 20}:00:00', '%Y-%m-%d %H:%M:%S')
+        welders.append(BenchWelder(welder_id, 'available', None, None, shift_end))
+        for skill_id in rng.sample(skill_ids, 4):
+            welder_skill_rows.append((welder_id, skill_id))
+
+    process_setups = {'SMAW': 1, 'GTAW': 2, 'GMAW': 3}
+    defects = []
+    for defect_id in range(1, num_defects + 1):
+        skill = master_data.skills[rng.choice(skill_ids)]
+        defect = BenchDefect(
+            defect_id=defect_id,
+            location_id=rng.choice(WORK_LOCATIONS),
+            defect_type=rng.randint(0, 6),
+            p_in=round(rng.random(), 2),
+            p_out=round(rng.random(), 2),
+            priority_factor=rng.choice([1, 1, 1, 2, 5]),
+            required_skill_id=skill.skill_id,
+            setup_type_id=process_setups[skill.process],
+            rework_time=rng.randint(20, 90),
+            severity_score=None
+        )
+        defects.append(defect._replace(severity_score=calculate_severity_score(defect)))  # DB 컬럼처럼 미리 계산
+
+    eligibility = SkillEligibility(master_data.skill_rows(), welder_skill_rows).matrix(welders, defects)
+    return welders, defects, eligibility
+
+
+def run_case(case):
+    """조합 하나 실행 (별도 프로세스). 실패해도 결과 dict 로 돌려줌"""
+    master_data = make_master_data()
+    welders, defects, eligibility = make_instance(master_data, case['defects'], case['welders'], case['seed'])
+
+    scheduler = ORToolsScheduler(formulation=case['formulation'], warm_start=False)
+    scheduler.max_time_in_seconds = case['time_limit']
+
+    row = dict(case)
+    started = time.perf_counter()
+    try:
+        result = scheduler.solve(
+            defects, welders, TARGET_DATE, case['session'],
+            cost_matrix=master_data.cost_matrix(scheduler.setup_location_id),
+            eligibility=eligibility,
+            concurrent_restrictions=list(master_data.concurrent_restrictions)
+        )
+    except Exception as e:
+        row.update({'error': str(e), 'wall_time': time.perf_counter() - started})
+    else:
+        objective = result['objective']
+        bound = result['best_bound']
+        row.update({
+            'status': result['solver_status'],
+            'num_variables': result['num_variables'],
+            'num_constraints': result['num_constraints'],
+            'build_time': result['phases']['build']['seconds'],
+            'solve_time': result['solver_time'],
+            'wall_time': time.perf_counter() - started,
+            'objective': objective,
+            'best_bound': bound,
+            'gap': abs(bound - objective) / max(abs(objective), 1.0),
+            'assigned': len(result['assignments']),
+            'travel_cost': result['total_travel_cost'],
+            'setup_cost': result['total_setup_cost']
+        })
+
+    # linux: KB, macOS: bytes
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    row['peak_rss_mb'] = peak_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return row
+
+
+def case_key(row):
+    return (row['formulation'], row['session'], row['defects'], row['welders'])
+
+
+def compare(rows, baseline_rows, tolerance):
+    """baseline 대비 풀이 시간이 (1 + tolerance) 배 넘게 늘었거나 목적함수가 tolerance 넘게 줄면 회귀"""
+    baseline = {case_key(row): row for row in baseline_rows}
+    comparisons = []
+
+    for row in rows:
+        base = baseline.get(case_key(row))
+        if not base or 'error' in base:
+            continue
+
+        item = {'case': '/'.join(str(k) for k in case_key(row)), 'regressions': []}
+        if 'error' in row:
+            item['regressions'].append('error')
+            comparisons.append(item)
+            continue
+
+        item['solve_time_ratio'] = row['solve_time'] / max(base['solve_time'], 1e-3)
+        item['objective_delta'] = row['objective'] - base['objective']
+        item['peak_rss_delta_mb'] = row['peak_rss_mb'] - base['peak_rss_mb']
+
+        if item['solve_time_ratio'] > 1 + tolerance:
+            item['regressions'].append('solve_time')
+        if row['objective'] < base['objective'] - abs(base['objective']) * tolerance:
+            item['regressions'].append('objective')
+        comparisons.append(item)
+
+    return comparisons
+
+
+def print_rows(rows):
+    print(f"{'formulation':11s} {'session':9s} {'defects':>7s} {'welders':>7s} {'vars':>8s} {'cons':>8s} "
+          f"{'build(s)':>8s} {'solve(s)':>8s} {'status':>9s} {'objective':>10s} {'gap':>7s} {'rss(MB)':>8s}")
+    for r in rows:
+        if 'error' in r:
+            print(f"{r['formulation']:11s} {r['session']:9s} {r['defects']:7d} {r['welders']:7d}  ❌ {r['error']}")
+            continue
+        print(f"{r['formulation']:11s} {r['session']:9s} {r['defects']:7d} {r['welders']:7d} "
+              f"{r['num_variables']:8d} {r['num_constraints']:8d} {r['build_time']:8.2f} {r['solve_time']:8.2f} "
+              f"{r['status']:>9s} {r['objective']:10.0f} {r['gap']:7.1%} {r['peak_rss_mb']:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ORToolsScheduler 규모별 벤치마크')
+    parser.add_argument('--defects', type=int, nargs='+', default=[20, 80, 200, 500])
+    parser.add_argument('--welders', type=int, nargs='+', default=[5, 20, 50])
+    parser.add_argument('--sessions', nargs='+', choices=list(SESSION_TIMES), default=list(SESSION_TIMES))
+    parser.add_argument('--formulation', nargs='+', choices=FORMULATIONS, default=['pairwise'])
+    parser.add_argument('--time-limit', type=float, default=10.0, help='조합마다 풀이 시간 제한(초)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='회귀 판정 허용 비율 (기본 20%%)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='회귀가 있으면 exit 1')
+    args = parser.parse_args()
+
+    cases = [
+        {
+            'formulation': formulation,
+            'session': session,
+            'defects': num_defects,
+            'welders': num_welders,
+            'seed': args.seed,
+            'time_limit': args.time_limit
+        }
+        for formulation in args.formulation
+        for session in args.sessions
+        for num_defects in args.defects
+        for num_welders in args.welders
+    ]
+    print(f"🚀 {len(cases)} cases (time limit {args.time_limit}s each)\n")
+
+    # 조합마다 새 프로세스 (spawn) → ru_maxrss 가 그 조합의 최대값
+    rows = []
+    context = multiprocessing.get_context('spawn')
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            rows.append(executor.submit(run_case, case).result())
+
+    print_rows(rows)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'results': rows
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline_rows = json.load(f)['results']
+
+        report['comparison'] = compare(rows, baseline_rows, args.tolerance)
+        regressions = [c for c in report['comparison'] if c['regressions']]
+
+        print(f"\n📊 Baseline: {args.baseline} ({len(report['comparison'])} matching cases)")
+        for c in report['comparison']:
+            if 'error' in c['regressions']:
+                print(f"   ❌ {c['case']}: error")
+                continue
+            mark = '⚠️ ' if c['regressions'] else '  '
+            print(f"   {mark}{c['case']}: solve x{c['solve_time_ratio']:.2f}, "
+                  f"objective {c['objective_delta']:+.0f}, rss {c['peak_rss_delta_mb']:+.1f}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Saved {args.output}")
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regression(s)")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,3 +7,13 @@ load_dotenv()
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    OPTIMIZATION_MAX_WORKERS = int(os.getenv("OPTIMIZATION_MAX_WORKERS", "2"))
+    OPTIMIZATION_COMPONENT_WORKERS = int(os.getenv("OPTIMIZATION_COMPONENT_WORKERS", str(os.cpu_count() or 1)))
+    # /jobs/<id>/events 스트림 최대 길이(초). 스트림 하나가 웹 워커 하나를 잡고 있으므로 제한
+    OPTIMIZATION_SSE_MAX_SECONDS = float(os.getenv("OPTIMIZATION_SSE_MAX_SECONDS", "90"))
+    MASTER_DATA_CHECK_INTERVAL = float(os.getenv("MASTER_DATA_CHECK_INTERVAL", "5"))  # 기준정보 version 확인 주기(초)
+    MASTER_DATA_FALLBACK_TTL = float(os.getenv("MASTER_DATA_FALLBACK_TTL", "60"))  # version 행이 없을 때 다시 로드 주기(초)
+    # /optimize2 요청에 X-Debug-Profile: cprofile | pyinstrument 헤더가 있으면 리포트 저장 (켜져 있을 때만)
+    OPTIMIZATION_PROFILING = os.getenv("OPTIMIZATION_PROFILING", "false").lower() in ["1", "true", "yes"]
+    OPTIMIZATION_PROFILE_DIR = os.getenv("OPTIMIZATION_PROFILE_DIR", "profiles")
+    OPTIMIZATION_CACHE_SIZE = int(os.getenv("OPTIMIZATION_CACHE_SIZE", "200"))  # 결과 캐시 최대 개수 (LRU)
@@ -0,0 +1,185 @@
+"""
+스케쥴링 hot path 쿼리 실행 계획 수집 스크립트
+
+- 각 API 라우트(조회용)와 /optimize 후보 선택 함수를 실제로 한 번씩 호출
+- 그 사이 실행된 SELECT 문을 잡아서 EXPLAIN (ANALYZE, BUFFERS) 로 다시 실행
+- 큰 테이블(defects, schedule_jobs, ...)에 Seq Scan 이 있으면 표시 → 인덱스 회귀 확인용
+  (작은 테이블은 Seq Scan 이 더 빠를 수 있으니 대량 데이터에서 돌릴 것)
+
+실행 방법:
+    python init_large_sample_data.py            # (또는 더 큰 데이터) 먼저 채우고
+    python explain_hot_paths.py
+    python explain_hot_paths.py --date 2025-11-18 --session afternoon --json plans.json
+    python explain_hot_paths.py --fail-on-seq-scan   # Seq Scan 있으면 exit 1
+"""
+
+import argparse
+import json
+import re
+import sys
+from datetime import date
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models import ScheduleBatch, ScheduleJob
+from app.services.optimization import select_candidate_defects, select_candidate_welders
+from app.services.scheduler_ortools import ORToolsScheduler
+from app.utils.skill_matcher import build_eligibility_matrix
+
+HOT_TABLES = ['defects', 'schedule_batches', 'schedule_jobs', 'welder_skills', 'scheduled_defects']
+
+
+class StatementRecorder:
+    """블록 안에서 실행된 SELECT 문 (statement, parameters) 기록"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and not executemany:
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+
+def explain(statement, parameters):
+    if db.engine.dialect.name == 'postgresql':
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+    else:
+        prefix = 'EXPLAIN QUERY PLAN '  # 로컬 sqlite 확인용 (ANALYZE 없음)
+
+    rows = db.session.connection().exec_driver_sql(prefix + statement, parameters).all()
+    db.session.rollback()
+    return [' | '.join(str(col) for col in row) if len(row) > 1 else str(row[0]) for row in rows]
+
+
+def seq_scans(plan_lines):
+    found = []
+    for line in plan_lines:
+        match = re.search(r'Seq Scan on (\w+)|SCAN (\w+)(?! USING)', line)
+        if match:
+            table = match.group(1) or match.group(2)
+            if table in HOT_TABLES:
+                found.append(table)
+    return found
+
+
+def execution_time(plan_lines):
+    for line in plan_lines:
+        match = re.search(r'Execution Time: ([\d.]+) ms', line)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def default_target():
+    batch = ScheduleBatch.query.order_by(ScheduleBatch.created_at.desc()).first()
+    if batch:
+        return batch.target_date.strftime('%Y-%m-%d'), batch.target_session
+    return date.today().strftime('%Y-%m-%d'), 'morning'
+
+
+def hot_paths(client, target_date, target_session):
+    """(이름, 호출) 목록"""
+    batch = ScheduleBatch.query.filter_by(
+        target_date=date.fromisoformat(target_date), target_session=target_session
+    ).order_by(ScheduleBatch.created_at.desc()).first()
+    welder_id = None
+    if batch:
+        job = ScheduleJob.query.filter_by(batch_id=batch.batch_id).first()
+        welder_id = job.welder_id if job else None
+
+    slot = f'target_date={target_date}&target_session={target_session}'
+    paths = [
+        ('GET /api/master', lambda: client.get('/api/master')),
+        ('GET /api/defects?status=pending', lambda: client.get('/api/defects?status=pending')),
+        ('GET /api/defects?status=completed', lambda: client.get('/api/defects?status=completed')),
+        ('GET /api/welders', lambda: client.get('/api/welders')),
+        ('GET /api/welders?compact=true', lambda: client.get('/api/welders?compact=true')),
+        ('GET /api/schedules/query', lambda: client.get(f'/api/schedules/query?{slot}')),
+    ]
+    if batch:
+        paths.append(('GET /api/schedules/<batch_id>', lambda: client.get(f'/api/schedules/{batch.batch_id}')))
+    if welder_id:
+        paths.append((
+            'GET /api/schedules/welder/<welder_id>/ticket',
+            lambda: client.get(f'/api/schedules/welder/{welder_id}/ticket?{slot}')
+        ))
+
+    def candidates():
+        defects = select_candidate_defects(target_date, target_session)
+        welders = select_candidate_welders()
+        build_eligibility_matrix(welders, defects)
+        ORToolsScheduler().load_hint_assignments(target_date, target_session)
+
+    paths.append(('optimize: candidate selection + eligibility + hints', candidates))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='hot path 쿼리 EXPLAIN ANALYZE')
+    parser.add_argument('--date', help='대상 날짜 (기본: 가장 최근 배치)')
+    parser.add_argument('--session', choices=['morning', 'afternoon', 'night'])
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    parser.add_argument('--fail-on-seq-scan', action='store_true', help='큰 테이블 Seq Scan 이 있으면 exit 1')
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        target_date, target_session = default_target()
+        target_date = args.date or target_date
+        target_session = args.session or target_session
+        print(f"📋 Target: {target_date} {target_session} ({db.engine.dialect.name})")
+
+        report = []
+        for name, call in hot_paths(client, target_date, target_session):
+            with StatementRecorder(db.engine) as recorder:
+                call()
+
+            print(f"\n{'=' * 80}\n{name}  ({len(recorder.statements)} queries)\n{'=' * 80}")
+
+            seen = set()
+            for statement, parameters in recorder.statements:
+                if statement in seen:
+                    continue
+                seen.add(statement)
+
+                plan = explain(statement, parameters)
+                scans = seq_scans(plan)
+                report.append({
+                    'path': name,
+                    'sql': statement,
+                    'plan': plan,
+                    'execution_time_ms': execution_time(plan),
+                    'seq_scans': scans
+                })
+
+                print(f"\n{' '.join(statement.split())[:300]}")
+                for line in plan:
+                    print(f"    {line}")
+                if scans:
+                    print(f"    ⚠️  Seq Scan: {', '.join(scans)}")
+
+    flagged = [r for r in report if r['seq_scans']]
+    print(f"\n✅ {len(report)} queries explained, {len(flagged)} with Seq Scan on hot tables")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Saved {args.json}")
+
+    if args.fail_on_seq_scan and flagged:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+"""
+대량 공장 데이터 생성 스크립트 (솔버/API 벤치마크용)
+
+- 용접공, 결함, 이력(확정 배치 + 작업) 수를 인자로 지정
+- 기준정보(location, setup_types, skills, travel_matrix)는 이미 있다고 가정
+- 행은 메모리에서 한 번에 만들고 PostgreSQL 은 COPY, 그 외는 executemany 로 적재
+- 이력 배치에 들어간 결함은 completed, 나머지는 pending
+- 재작업 시간은 init_large_sample_data.calculate_rework_time 과 같은 분포
+
+실행 방법:
+    python generate_factory_data.py                                  # 200명, 결함 50,000개, 30일 이력
+    python generate_factory_data.py --welders 50 --defects 5000 --days 7
+    python generate_factory_data.py --method executemany --seed 42
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from app import create_app
+from app.extensions import db
+from app.models import (
+    Pipe, Welder, WelderSkill, Defect, Skill, ScheduleBatch, ScheduleJob, ScheduledDefect
+)
+from app.services.objective import severity_scores
+from app.services.scheduling import SESSION_TIMES, SESSION_ORDER
+from app.utils.skill_matcher import SkillEligibility
+from init_large_sample_data import calculate_rework_time
+
+MATERIALS = ['탄소강', '스테인리스강', '합강']
+WORK_LOCATIONS = [2, 5, 6, 7]  # B, E, F, G (작업 가능 구역)
+SETUP_TYPE_MAP = {'SMAW': 1, 'GTAW': 2, 'GMAW': 3, 'FCAW': 3}
+
+SURNAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임', '한', '오', '서', '신', '권']
+GIVEN_NAMES = ['민수', '영희', '철수', '수진', '동욱', '재호', '이준', '지훈', '서연', '현우', '지민', '태윤', '하준', '유진']
+
+# (퇴근 시각, 비율)
+SHIFT_ENDS = [('18:00:00', 0.6), ('20:00:00', 0.2), ('21:00:00', 0.1), ('22:00:00', 0.1)]
+WELDER_STATUSES = [('available', 0.85), ('on_break', 0.05), ('off_duty', 0.10)]
+
+MIN_JOB_MINUTES = 35  # 이동 5분 + 가장 짧은 재작업 30분
+MAX_MISSES = 500  # 연속으로 이만큼 못 넣으면 남은 시간 조각이 작다고 보고 세션 종료
+
+# 배치/스케쥴 테이블 먼저 (FK 순서)
+CLEAR_TABLES = ['scheduled_defects', 'schedule_jobs', 'schedule_batches', 'welder_skills', 'welders', 'defects', 'pipes']
+
+WelderRef = namedtuple('WelderRef', ['welder_id'])
+DefectRef = namedtuple('DefectRef', ['defect_id', 'required_skill_id'])
+
+
+def weighted_choice(choices):
+    values, weights = zip(*choices)
+    return random.choices(values, weights=weights)[0]
+
+
+def clear_existing_data():
+    print("🗑️  Clearing existing data...")
+
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(db.text(f"TRUNCATE TABLE {', '.join(CLEAR_TABLES)} RESTART IDENTITY CASCADE"))
+    else:
+        for table in CLEAR_TABLES:
+            db.session.execute(db.text(f'DELETE FROM {table}'))
+
+    db.session.commit()
+
+
+def bulk_load(model, columns, rows, method):
+    """rows (튜플 목록) → 테이블. copy: PostgreSQL COPY, executemany: 5000행씩 INSERT"""
+    table = model.__table__
+    started = time.perf_counter()
+
+    if method == 'copy':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(rows)  # None → 빈 값 = NULL (csv 형식 기본)
+        buffer.seek(0)
+
+        cursor = db.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+    else:
+        for k in range(0, len(rows), 5000):
+            db.session.execute(table.insert(), [dict(zip(columns, row)) for row in rows[k:k + 5000]])
+
+    db.session.commit()
+    print(f"   - {table.name}: {len(rows):,} rows ({time.perf_counter() - started:.2f}s)")
+
+
+def reset_sequences():
+    """id 를 직접 넣었으니 PostgreSQL 시퀀스를 max(id) 로"""
+    if db.engine.dialect.name != 'postgresql':
+        return
+
+    for table, column in [('pipes', 'pipe_id'), ('welders', 'welder_id'), ('defects', 'defect_id'),
+                          ('schedule_batches', 'batch_id'), ('schedule_jobs', 'job_id')]:
+        db.session.execute(db.text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+            f"COALESCE((SELECT MAX({column}) FROM {table}), 0) + 1, false)"
+        ))
+    db.session.commit()
+
+
+def generate_welders(num_welders, end_date, skills):
+    welders = []
+    welder_skills = []
+
+    for welder_id in range(1, num_welders + 1):
+        shift_end = weighted_choice(SHIFT_ENDS)
+        welders.append((
+            welder_id,
+            f"{random.choice(SURNAMES)}{random.choice(GIVEN_NAMES)}{welder_id}",
+            1,     # 구역 A (시작)
+            None,  # Base Setup
+            None,
+            weighted_choice(WELDER_STATUSES),
+            datetime.strptime(f'{end_date} {shift_end}', '%Y-%m-%d %H:%M:%S')
+        ))
+
+        for skill in random.sample(skills, random.randint(1, min(4, len(skills)))):
+            welder_skills.append((welder_id, skill.skill_id))
+
+    return welders, welder_skills
+
+
+def generate_defects(num_defects, start_time, end_time, skills):
+    """(pipes, defects). 결함 하나당 파이프 하나"""
+    pipes = []
+    defects = []
+
+    # 결함 크기 분포: 소형 많고, 중형 보통, 대형 적음
+    sizes = [('small', 50), ('medium', 25), ('large', 5)]
+    span_seconds = int((end_time - start_time).total_seconds())
+
+    for defect_id in range(1, num_defects + 1):
+        material = random.choice(MATERIALS)
+        pipes.append((defect_id, material, random.choice(WORK_LOCATIONS)))
+
+        defect_type = random.choice([0, 1, 2]) if random.random() < 0.3 else random.randint(0, 6)
+        priority_factor = 1 if random.random() < 0.8 else random.randint(6, 10)
+        skill = random.choice(skills)
+
+        defects.append([
+            defect_id,
+            defect_id,  # pipe_id
+            random.choice(WORK_LOCATIONS),
+            defect_type,
+            round(random.uniform(0.1, 1.0), 2),
+            round(random.uniform(0.1, 1.0), 2),
+            skill.skill_id,
+            SETUP_TYPE_MAP.get(skill.process, 1),
+            priority_factor,
+            calculate_rework_time(material, weighted_choice(sizes)),
+            'pending',
+            start_time + timedelta(seconds=random.randint(0, span_seconds))
+        ])
+
+    # created_at 순으로 id 부여 (실제 적재 순서와 비슷하게)
+    defects.sort(key=lambda row: row[11])
+    for defect_id, row in enumerate(defects, start=1):
+        row[0] = defect_id
+
+    return pipes, defects
+
+
+def generate_history(defects, welders, welder_skills, skills, start_date, num_days, jobs_per_batch):
+    """날짜 x 세션마다 확정 배치 하나, 그 전에 생긴 결함 중에서 작업 배정 → completed 로"""
+    # 작업 가능 용접공은 요구 스킬로만 정해짐 → 스킬별로 한 번만 계산
+    skill_rows = [(s.skill_id, s.process, s.material, s.position_level) for s in skills]
+    eligibility = SkillEligibility(skill_rows, welder_skills).matrix(
+        [WelderRef(w[0]) for w in welders],
+        [DefectRef(s.skill_id, s.skill_id) for s in skills]
+    )
+    eligible_by_skill = {s.skill_id: eligibility.eligible_welder_ids(s.skill_id) for s in skills}
+    skills_by_welder = {w[0]: [] for w in welders}
+    for skill_id, welder_ids in eligible_by_skill.items():
+        for welder_id in welder_ids:
+            skills_by_welder[welder_id].append(skill_id)
+    shift_end_hours = {w[0]: w[6].hour for w in welders}
+
+    batches = []
+    jobs = []
+    scheduled = []
+    backlog = []  # 생겼지만 아직 배정 안 된 결함
+    next_defect = 0  # created_at 순이라 앞에서부터 backlog 로
+    job_id = 1
+
+    for day in range(num_days):
+        target_date = start_date + timedelta(days=day)
+
+        for session, (start_hour, end_hour) in SESSION_TIMES.items():
+            session_start = datetime.combine(target_date, datetime.min.time()) + timedelta(hours=start_hour)
+            batch_id = len(batches) + 1
+            batches.append((batch_id, target_date, session, 'confirmed', session_start - timedelta(hours=1)))
+
+            while next_defect < len(defects) and defects[next_defect][11] < session_start:
+                backlog.append(defects[next_defect])
+                next_defect += 1
+
+            # 용접공별 다음 작업 가능 시각 / 퇴근(또는 세션 끝) 시각
+            welder_free_at = {}
+            welder_limit = {
+                welder_id: session_start.replace(hour=min(end_hour, shift_end))
+                for welder_id, shift_end in shift_end_hours.items()
+            }
+
+            # 가장 짧은 작업(30분)도 못 넣는 용접공은 제외 → 다 차면 이번 세션 끝
+            open_welders = {
+                welder_id for welder_id, limit in welder_limit.items()
+                if limit - session_start >= timedelta(minutes=MIN_JOB_MINUTES)
+            }
+            # 스킬별 남은 용접공 수 → 0 이면 후보 목록 안 만들고 바로 넘김
+            open_count = {
+                skill_id: sum(1 for welder_id in welder_ids if welder_id in open_welders)
+                for skill_id, welder_ids in eligible_by_skill.items()
+            }
+
+            remaining = []
+            job_order = 0
+            k = 0
+            misses = 0
+            while k < len(backlog) and job_order < jobs_per_batch and open_welders and misses < MAX_MISSES:
+                defect = backlog[k]
+                k += 1
+
+                placed = False
+                if not open_count[defect[6]]:
+                    remaining.append(defect)
+                    misses += 1
+                    continue
+
+                candidates = [welder_id for welder_id in eligible_by_skill[defect[6]] if welder_id in open_welders]
+                for welder_id in random.sample(candidates, min(3, len(candidates))):
+                    start = welder_free_at.get(welder_id, session_start) + timedelta(minutes=random.randint(5, 20))
+                    end = start + timedelta(minutes=defect[9])
+                    if end > welder_limit[welder_id]:
+                        continue
+
+                    welder_free_at[welder_id] = end
+                    if welder_limit[welder_id] - end < timedelta(minutes=MIN_JOB_MINUTES):
+                        open_welders.discard(welder_id)
+                        for skill_id in skills_by_welder[welder_id]:
+                            open_count[skill_id] -= 1
+                    job_order += 1
+                    defect[10] = 'completed'
+
+                    jobs.append((job_id, batch_id, welder_id, defect[0], job_order, start, end, 'completed'))
+                    scheduled.append((defect[0], batch_id, target_date, SESSION_ORDER[session], session_start))
+                    job_id += 1
+                    placed = True
+                    misses = 0
+                    break
+
+                if not placed:
+                    remaining.append(defect)
+                    misses += 1
+
+            backlog = remaining + backlog[k:]
+
+    return batches, jobs, scheduled
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대량 공장 데이터 생성')
+    parser.add_argument('--welders', type=int, default=200)
+    parser.add_argument('--defects', type=int, default=50000)
+    parser.add_argument('--days', type=int, default=30, help='이력 일수 (하루 3세션, 세션마다 확정 배치 1개)')
+    parser.add_argument('--jobs-per-batch', type=int, default=None, help='배치당 작업 수 (기본: 용접공 수 x 2)')
+    parser.add_argument('--end-date', default=datetime.now().strftime('%Y-%m-%d'), help='이력 마지막 다음 날 (= 스케쥴 대상 날짜)')
+    parser.add_argument('--method', choices=['copy', 'executemany'], default=None, help='기본: PostgreSQL 이면 copy')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    app = create_app()
+
+    with app.app_context():
+        method = args.method or ('copy' if db.engine.dialect.name == 'postgresql' else 'executemany')
+        if method == 'copy' and db.engine.dialect.name != 'postgresql':
+            parser.error('--method copy requires PostgreSQL')
+
+        skills = Skill.query.order_by(Skill.skill_id).all()
+        if not skills:
+            parser.error('skills table is empty (기준정보 먼저 입력)')
+
+        end_date = datetime.strptime(args.end_date, '%Y-%m-%d').date()
+        start_date = end_date - timedelta(days=args.days)
+        jobs_per_batch = args.jobs_per_batch or args.welders * 2
+
+        print(f"\n🚀 Generating {args.welders:,} welders, {args.defects:,} defects, {args.days} days of history ({method})\n")
+        started = time.perf_counter()
+
+        welders, welder_skills = generate_welders(args.welders, end_date, skills)
+        pipes, defects = generate_defects(
+            args.defects,
+            datetime.combine(start_date, datetime.min.time()) - timedelta(days=3),
+            datetime.combine(end_date, datetime.min.time()) + timedelta(hours=8),
+            skills
+        )
+        batches, jobs, scheduled = generate_history(
+            defects, welders, welder_skills, skills, start_date, args.days, jobs_per_batch
+        )
+        print(f"🧮 Rows generated ({time.perf_counter() - started:.2f}s)")
+
+        clear_existing_data()
+
+        print("📥 Loading...")
+        bulk_load(Pipe, ['pipe_id', 'material', 'current_location_id'], pipes, method)
+        bulk_load(Welder, ['welder_id', 'welder_name', 'current_location_id', 'current_setup_id',
+                           'current_defect_id', 'status', 'shift_end_time'], welders, method)
+        bulk_load(WelderSkill, ['welder_id', 'skill_id'], welder_skills, method)
+        # COPY/executemany 는 ORM 이벤트를 안 거치니 심각도 점수는 여기서 한 번에 계산
+        scores = severity_scores(*zip(*[(row[3], row[4], row[5], row[8]) for row in defects]))
+        bulk_load(Defect, ['defect_id', 'pipe_id', 'location_id', 'defect_type', 'p_in', 'p_out',
+                           'required_skill_id', 'setup_type_id', 'priority_factor', 'rework_time',
+                           'status', 'created_at', 'severity_score'],
+                  [tuple(row) + (float(score),) for row, score in zip(defects, scores)], method)
+        bulk_load(ScheduleBatch, ['batch_id', 'target_date', 'target_session', 'status', 'created_at'], batches, method)
+        bulk_load(ScheduleJob, ['job_id', 'batch_id', 'welder_id', 'defect_id', 'job_order',
+                                'estimated_start_time', 'estimated_end_time', 'status'], jobs, method)
+        bulk_load(ScheduledDefect, ['defect_id', 'batch_id', 'target_date', 'session_order', 'confirmed_at'],
+                  scheduled, method)
+        reset_sequences()
+
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute(db.text('ANALYZE'))
+            db.session.commit()
+
+        pending = sum(1 for row in defects if row[10] == 'pending')
+        print("\n" + "=" * 80)
+        print(f"✨ Done in {time.perf_counter() - started:.2f}s")
+        print(f"   {len(welders):,} welders, {len(welder_skills):,} welder skills")
+        print(f"   {len(defects):,} defects ({pending:,} pending, {len(defects) - pending:,} completed)")
+        print(f"   {len(batches):,} confirmed batches, {len(jobs):,} jobs")
+        print("=" * 80)
+        print(f"\n💡 Tip: POST /api/schedules/optimize2 {{\"target_date\": \"{end_date}\", \"target_session\": \"morning\"}}\n")
+
+
+if __name__ == '__main__':
+    main()
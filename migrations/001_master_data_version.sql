@@ -0,0 +1,46 @@
+-- 기준정보 버전 카운터
+-- location, setup_types, skills, travel_matrix, concurrent_restrictions 가 바뀌면 version + 1
+-- → 각 프로세스의 MasterDataCache 가 version 만 보고 다시 로드
+
+CREATE TABLE IF NOT EXISTS master_data_version (
+    id INTEGER PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+INSERT INTO master_data_version (id, version) VALUES (1, 1)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_master_data_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE master_data_version
+    SET version = version + 1, updated_at = now() AT TIME ZONE 'utc'
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS location_master_data_version ON location;
+CREATE TRIGGER location_master_data_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON location
+FOR EACH STATEMENT EXECUTE FUNCTION bump_master_data_version();
+
+DROP TRIGGER IF EXISTS setup_types_master_data_version ON setup_types;
+CREATE TRIGGER setup_types_master_data_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON setup_types
+FOR EACH STATEMENT EXECUTE FUNCTION bump_master_data_version();
+
+DROP TRIGGER IF EXISTS skills_master_data_version ON skills;
+CREATE TRIGGER skills_master_data_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON skills
+FOR EACH STATEMENT EXECUTE FUNCTION bump_master_data_version();
+
+DROP TRIGGER IF EXISTS travel_matrix_master_data_version ON travel_matrix;
+CREATE TRIGGER travel_matrix_master_data_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON travel_matrix
+FOR EACH STATEMENT EXECUTE FUNCTION bump_master_data_version();
+
+DROP TRIGGER IF EXISTS concurrent_restrictions_master_data_version ON concurrent_restrictions;
+CREATE TRIGGER concurrent_restrictions_master_data_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON concurrent_restrictions
+FOR EACH STATEMENT EXECUTE FUNCTION bump_master_data_version();
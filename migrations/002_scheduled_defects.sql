@@ -0,0 +1,22 @@
+-- 확정 배치에 들어간 결함 색인 (/optimize2 후보 선택용)
+-- 후보 선택: 대상 날짜/세션보다 앞선 확정 배치에 있는 결함을 NOT EXISTS 로 제외
+
+CREATE TABLE IF NOT EXISTS scheduled_defects (
+    defect_id BIGINT NOT NULL REFERENCES defects (defect_id),
+    batch_id BIGINT NOT NULL REFERENCES schedule_batches (batch_id),
+    target_date DATE NOT NULL,
+    session_order SMALLINT NOT NULL,
+    confirmed_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+    PRIMARY KEY (defect_id, batch_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_scheduled_defects_batch_id ON scheduled_defects (batch_id);
+
+-- 기존 확정 배치 채워넣기
+INSERT INTO scheduled_defects (defect_id, batch_id, target_date, session_order)
+SELECT DISTINCT j.defect_id, b.batch_id, b.target_date,
+       CASE b.target_session WHEN 'morning' THEN 1 WHEN 'afternoon' THEN 2 WHEN 'night' THEN 3 ELSE 0 END
+FROM schedule_batches b
+JOIN schedule_jobs j ON j.batch_id = b.batch_id
+WHERE b.status = 'confirmed'
+ON CONFLICT (defect_id, batch_id) DO NOTHING;
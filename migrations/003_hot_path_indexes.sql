@@ -0,0 +1,27 @@
+-- 스케쥴링 hot path 인덱스 (모델 __table_args__ 와 같은 이름)
+-- welder_skills(welder_id) 는 PK (welder_id, skill_id) 가 이미 커버
+-- 큰 운영 DB 에서는 트랜잭션 밖에서 CREATE INDEX CONCURRENTLY 로 먼저 만들어 두면 이 파일은 건너뜀
+
+-- 스케쥴 후보 선택: status = 'pending' AND location_id NOT IN (...)
+CREATE INDEX IF NOT EXISTS ix_defects_pending_location
+    ON defects (location_id) WHERE status = 'pending';
+
+-- GET /api/defects: status 필터 + (created_at, defect_id) keyset
+CREATE INDEX IF NOT EXISTS ix_defects_status_created
+    ON defects (status, created_at, defect_id);
+
+-- 날짜/세션(/상태)별 가장 최근 배치: /query, 티켓, warm start
+CREATE INDEX IF NOT EXISTS ix_schedule_batches_slot
+    ON schedule_batches (target_date, target_session, status, created_at);
+
+-- 배치 작업 목록 (job_order 순)
+CREATE INDEX IF NOT EXISTS ix_schedule_jobs_batch_order
+    ON schedule_jobs (batch_id, job_order);
+
+-- 용접공 티켓: 배치 + 용접공
+CREATE INDEX IF NOT EXISTS ix_schedule_jobs_batch_welder
+    ON schedule_jobs (batch_id, welder_id);
+
+ANALYZE defects;
+ANALYZE schedule_batches;
+ANALYZE schedule_jobs;
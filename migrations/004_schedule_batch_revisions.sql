@@ -0,0 +1,7 @@
+-- repair 로 만든 배치 revision → 원래 배치
+-- (POST /api/schedules/<batch_id>/repair 는 원래 배치를 건드리지 않고 새 draft 를 만듦)
+
+ALTER TABLE schedule_batches
+    ADD COLUMN IF NOT EXISTS parent_batch_id BIGINT REFERENCES schedule_batches (batch_id);
+
+CREATE INDEX IF NOT EXISTS ix_schedule_batches_parent ON schedule_batches (parent_batch_id);
@@ -0,0 +1,15 @@
+-- /optimize2 결과 캐시 (입력 fingerprint → 배치), 오래 안 쓴 것부터 정리 (OPTIMIZATION_CACHE_SIZE)
+
+CREATE TABLE IF NOT EXISTS optimization_cache (
+    fingerprint VARCHAR(64) PRIMARY KEY,
+    batch_id BIGINT NOT NULL REFERENCES schedule_batches (batch_id) ON DELETE CASCADE,
+    target_date DATE NOT NULL,
+    target_session VARCHAR(10) NOT NULL,
+    formulation VARCHAR(20) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+    last_used_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS ix_optimization_cache_slot ON optimization_cache (target_date, target_session, last_used_at);
+CREATE INDEX IF NOT EXISTS ix_optimization_cache_last_used ON optimization_cache (last_used_at);
@@ -0,0 +1,7 @@
+-- 배치 최적화 지표를 컬럼으로 (예전에는 응답 만들 때만 있던 임시 속성 → 다시 조회하면 사라짐)
+
+ALTER TABLE schedule_batches
+    ADD COLUMN IF NOT EXISTS total_travel_cost INTEGER,
+    ADD COLUMN IF NOT EXISTS total_setup_cost INTEGER,
+    ADD COLUMN IF NOT EXISTS solver_time DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS formulation VARCHAR(20);
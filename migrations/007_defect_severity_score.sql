@@ -0,0 +1,20 @@
+-- 결함 심각도 점수 컬럼 (목록/스케쥴 응답/티켓/목적함수가 매번 계산하던 값)
+-- 앱은 Defect 저장할 때 갱신 (before_insert/before_update), 공식이 바뀌면 recompute_severity_scores.py
+-- 채워넣기 공식은 app/services/objective.py calculate_severity_score 와 같음 (무관용 결함 0, 1, 2 → 1.0)
+
+ALTER TABLE defects ADD COLUMN IF NOT EXISTS severity_score DOUBLE PRECISION;
+
+UPDATE defects
+SET severity_score = SQRT(POWER(
+    (CASE WHEN defect_type IN (0, 1, 2) THEN 1.0 ELSE GREATEST(p_in, p_out) END) * 10,
+    priority_factor
+))
+WHERE severity_score IS NULL;
+
+ALTER TABLE defects ALTER COLUMN severity_score SET NOT NULL;
+
+-- GET /api/defects?sort=severity: status 필터 + (severity_score, defect_id) 역순 keyset
+CREATE INDEX IF NOT EXISTS ix_defects_status_severity
+    ON defects (status, severity_score, defect_id);
+
+ANALYZE defects;
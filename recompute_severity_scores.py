@@ -0,0 +1,36 @@
+"""
+결함 심각도 점수 (defects.severity_score) 전체 재계산
+
+- app/services/objective.py 의 심각도 공식이나 CRITICAL_DEFECT_TYPES 를 바꾼 뒤 실행
+- defect_id 순으로 나눠 읽어서 numpy 로 한 번에 계산, 값이 바뀐 결함만 UPDATE (한 트랜잭션)
+
+실행 방법:
+    python recompute_severity_scores.py
+    python recompute_severity_scores.py --dry-run          # 바뀔 개수만 확인
+    python recompute_severity_scores.py --chunk-size 50000
+"""
+
+import argparse
+import time
+from app import create_app
+from app.services.severity import recompute_severity_scores, DEFAULT_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='defects.severity_score 전체 재계산')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='한 번에 읽는 결함 수')
+    parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 바뀔 개수만 출력')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        checked, changed = recompute_severity_scores(chunk_size=args.chunk_size, dry_run=args.dry_run)
+        elapsed = time.perf_counter() - started
+
+    mode = ' (dry run, not saved)' if args.dry_run else ''
+    print(f"✅ {checked:,} defects checked, {changed:,} severity scores updated in {elapsed:.2f}s{mode}")
+
+
+if __name__ == '__main__':
+    main()
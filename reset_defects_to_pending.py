@@ -1,4 +1,5 @@
 #python reset_defects_to_pending.py
+#서버 API 로 한 건씩 변경 → 결함이 많으면 flask --app app reset-defects (DB 직접, 한 트랜잭션) 사용
 import requests
 
 BASE_URL = "http://localhost:5000"
@@ -13,14 +14,24 @@ def reset_all_defects_to_pending():
     for status in ['pending', 'in_progress', 'completed']:
         print(f"\n'{status}' 상태의 결함 조회 중...")
         try:
-            response = requests.get(f"{BASE_URL}/api/defects?status={status}")
-            if response.status_code == 200:
+            # 페이지 단위 조회 → next_cursor 가 없을 때까지
+            defects = []
+            params = {'status': status, 'limit': 1000, 'fields': 'defect_id,status'}
+            while True:
+                response = requests.get(f"{BASE_URL}/api/defects", params=params)
+                if response.status_code != 200:
+                    print(f"  → 오류: {response.status_code}")
+                    break
+                
                 defects_data = response.json()
-                defects = defects_data.get('defects', [])
-                all_defects.extend(defects)
-                print(f"  → {len(defects)}개 발견")
-            else:
-                print(f"  → 오류: {response.status_code}")
+                defects.extend(defects_data.get('defects', []))
+                
+                if not defects_data.get('next_cursor'):
+                    break
+                params['cursor'] = defects_data['next_cursor']
+            
+            all_defects.extend(defects)
+            print(f"  → {len(defects)}개 발견")
         except Exception as e:
             print(f"  → 오류 발생: {e}")
     
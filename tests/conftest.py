@@ -0,0 +1,12 @@
+"""
+테스트 공용 설정
+
+- config.Config 가 import 시점에 환경변수를 읽으므로 app 을 import 하기 전에 설정
+- DB 는 임시 파일 SQLite (DATABASE_URL 무시). 분할 풀이 풀 프로세스(spawn)도 같은 파일을 보게 메모리 DB 대신 파일
+"""
+
+import os
+import tempfile
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bubansang-test-'), 'test.db')}"
+os.environ['MASTER_DATA_CHECK_INTERVAL'] = '3600'  # 테스트 중에 기준정보 version 확인 쿼리가 끼지 않게
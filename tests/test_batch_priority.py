@@ -0,0 +1,83 @@
+"""
+PATCH /api/defects/batch-priority 테스트
+
+- 하나라도 잘못된 항목이 있으면 400, 아무것도 안 바뀜 (전부 아니면 전무)
+- 정수만 받음 (숫자 문자열, true/false 는 잘못된 항목)
+- 없는 결함은 missing_ids 로, 나머지는 반영 + 새 severity_score 같이 저장
+
+실행 방법:
+    python -m pytest tests
+"""
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import MasterDataVersion, Location, SetupType, Skill, Pipe, Defect
+from app.services.objective import calculate_severity_score
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+        db.session.add(MasterDataVersion(id=1, version=1))
+        db.session.add(Location(location_id=2, location_name='구역 B'))
+        db.session.add(SetupType(setup_type_id=1, setup_name='SMAW', setup_cost_minutes=10))
+        db.session.add(Skill(skill_id=1, process='SMAW', position='1G', position_level=1, material='탄소강'))
+        for defect_id in range(1, 4):
+            db.session.add(Pipe(pipe_id=defect_id, material='탄소강', current_location_id=2))
+            db.session.add(Defect(defect_id=defect_id, pipe_id=defect_id, location_id=2, defect_type=3,
+                                  p_in=0.2 * defect_id, p_out=0.1, required_skill_id=1, setup_type_id=1,
+                                  priority_factor=1, rework_time=30, status='pending'))
+        db.session.commit()
+
+        yield app
+
+        db.session.remove()
+        db.drop_all()
+
+
+def priorities(app):
+    with app.app_context():
+        return dict(db.session.query(Defect.defect_id, Defect.priority_factor).all())
+
+
+@pytest.mark.parametrize('bad_item', [
+    {'defect_id': '2', 'priority_factor': 5},
+    {'defect_id': True, 'priority_factor': 5},
+    {'defect_id': 2, 'priority_factor': True},
+    {'defect_id': 2, 'priority_factor': 11},
+    {'defect_id': 1, 'priority_factor': 3},  # 중복
+])
+def test_any_invalid_item_rejects_the_whole_batch(app, bad_item):
+    response = app.test_client().patch('/api/defects/batch-priority', json={
+        'priorities': [{'defect_id': 1, 'priority_factor': 4}, bad_item]
+    })
+
+    assert response.status_code == 400
+    assert response.get_json()['errors']
+    assert priorities(app) == {1: 1, 2: 1, 3: 1}
+
+
+def test_valid_batch_updates_priority_and_severity(app):
+    response = app.test_client().patch('/api/defects/batch-priority', json={
+        'priorities': [
+            {'defect_id': 1, 'priority_factor': 4},
+            {'defect_id': 3, 'priority_factor': 2},
+            {'defect_id': 999, 'priority_factor': 2}
+        ]
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['updated_count'] == 2
+    assert body['missing_ids'] == [999]
+    assert priorities(app) == {1: 4, 2: 1, 3: 2}
+
+    with app.app_context():
+        for defect in Defect.query.all():
+            assert defect.severity_score == pytest.approx(calculate_severity_score(defect))
+        returned = {d['defect_id']: d['severity_score'] for d in body['defects']}
+        assert returned[1] == round(calculate_severity_score(db.session.get(Defect, 1)), 2)
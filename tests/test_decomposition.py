@@ -0,0 +1,85 @@
+"""
+분할 풀이(DecomposedScheduler) 동시작업 금지 구역 회귀 테스트
+
+- SMAW/탄소강 용접공 2명 + F구역 결함 4개, GTAW/스테인리스강 용접공 2명 + G구역 결함 4개 → 요소 2개
+- F 요소 모델에는 F 작업만 있어도 F,G 금지 쌍 cumulative 가 걸려야 함
+  (안 걸리면 F 끼리 겹친 구간이 G 요소 다시 풀이의 blocked_intervals 로 들어가서 INFEASIBLE)
+
+실행 방법:
+    python -m pytest tests
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import (
+    MasterDataVersion, Location, SetupType, Skill, TravelMatrix, ConcurrentRestriction,
+    Welder, WelderSkill, Pipe, Defect
+)
+from app.services.decomposition import DecomposedScheduler
+
+LOCATION_F = 6
+LOCATION_G = 7
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+        db.session.add(MasterDataVersion(id=1, version=1))
+        for location_id, name in enumerate('ABCDEFG', start=1):
+            db.session.add(Location(location_id=location_id, location_name=f'구역 {name}'))
+        for a in range(1, 8):
+            for b in range(1, 8):
+                if a != b:
+                    db.session.add(TravelMatrix(from_location_id=a, to_location_id=b, travel_time_minutes=abs(a - b) * 3))
+        db.session.add(ConcurrentRestriction(location_a_id=LOCATION_F, location_b_id=LOCATION_G))
+        db.session.add(ConcurrentRestriction(location_a_id=LOCATION_G, location_b_id=LOCATION_F))
+
+        db.session.add(SetupType(setup_type_id=1, setup_name='SMAW', setup_cost_minutes=10))
+        db.session.add(SetupType(setup_type_id=2, setup_name='GTAW', setup_cost_minutes=15))
+        db.session.add(Skill(skill_id=1, process='SMAW', position='1G', position_level=1, material='탄소강'))
+        db.session.add(Skill(skill_id=2, process='GTAW', position='1G', position_level=1, material='스테인리스강'))
+
+        for welder_id in range(1, 5):
+            skill_id = 1 if welder_id <= 2 else 2
+            db.session.add(Welder(welder_id=welder_id, welder_name=f'용접공{welder_id}', current_location_id=1,
+                                  status='available', shift_end_time=datetime(2025, 11, 18, 18, 0)))
+            db.session.add(WelderSkill(welder_id=welder_id, skill_id=skill_id))
+
+        for defect_id in range(1, 9):
+            on_f = defect_id <= 4
+            db.session.add(Pipe(pipe_id=defect_id, material='탄소강' if on_f else '스테인리스강', current_location_id=2))
+            db.session.add(Defect(defect_id=defect_id, pipe_id=defect_id,
+                                  location_id=LOCATION_F if on_f else LOCATION_G, defect_type=defect_id % 7,
+                                  p_in=0.5, p_out=0.3, required_skill_id=1 if on_f else 2,
+                                  setup_type_id=1 if on_f else 2, priority_factor=1, rework_time=20,
+                                  status='pending', created_at=datetime(2025, 11, 17) + timedelta(minutes=defect_id)))
+        db.session.commit()
+
+        yield app
+
+        db.session.remove()
+        db.drop_all()
+
+
+def test_decomposed_schedule_keeps_restricted_pair_jobs_apart(app):
+    with app.app_context():
+        defects = Defect.query.order_by(Defect.defect_id).all()
+        welders = Welder.query.order_by(Welder.welder_id).all()
+
+        scheduler = DecomposedScheduler(warm_start=False, max_workers=2, time_limit=10)
+        result = scheduler.solve(defects, welders, '2025-11-18', 'afternoon')
+
+    assert result['component_count'] == 2
+    assert sorted(a['defect_id'] for a in result['assignments']) == list(range(1, 9))
+
+    restricted = sorted(
+        (a['start_minutes'], a['end_minutes'], a['defect_id'])
+        for a in result['assignments'] if a['location_id'] in (LOCATION_F, LOCATION_G)
+    )
+    for (_, end, defect_id), (next_start, _, next_defect_id) in zip(restricted, restricted[1:]):
+        assert end <= next_start, f'defects {defect_id} and {next_defect_id} overlap in F/G'
@@ -0,0 +1,92 @@
+"""
+GET /api/defects 목록 테스트
+
+- limit/cursor 없으면 전부 (예전 응답 그대로, total 포함)
+- keyset 페이지네이션: 페이지끼리 겹치거나 빠지는 결함 없이 정렬 순서대로, total 은 전체 개수
+- fields 는 고른 키만
+
+실행 방법:
+    python -m pytest tests
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import MasterDataVersion, Location, SetupType, Skill, Pipe, Defect
+
+NUM_PENDING = 25
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+        db.session.add(MasterDataVersion(id=1, version=1))
+        for location_id, name in enumerate('ABCDEFG', start=1):
+            db.session.add(Location(location_id=location_id, location_name=f'구역 {name}'))
+        db.session.add(SetupType(setup_type_id=1, setup_name='SMAW', setup_cost_minutes=10))
+        db.session.add(Skill(skill_id=1, process='SMAW', position='1G', position_level=1, material='탄소강'))
+
+        # 같은 created_at 이 섞여도 defect_id 로 순서가 정해져야 함
+        for defect_id in range(1, NUM_PENDING + 3):
+            db.session.add(Pipe(pipe_id=defect_id, material='탄소강', current_location_id=2))
+            db.session.add(Defect(defect_id=defect_id, pipe_id=defect_id, location_id=2 + defect_id % 4,
+                                  defect_type=defect_id % 7, p_in=(defect_id % 10) / 10, p_out=0.3,
+                                  required_skill_id=1, setup_type_id=1, priority_factor=1 + defect_id % 3,
+                                  rework_time=30, status='pending' if defect_id <= NUM_PENDING else 'completed',
+                                  created_at=datetime(2025, 11, 17) + timedelta(minutes=defect_id // 2)))
+        db.session.commit()
+
+        yield app.test_client()
+
+        db.session.remove()
+        db.drop_all()
+
+
+def fetch_all_pages(client, **params):
+    pages = []
+    while True:
+        response = client.get('/api/defects', query_string=params)
+        assert response.status_code == 200
+        page = response.get_json()
+        pages.append(page)
+        if not page['next_cursor']:
+            return pages
+        params['cursor'] = page['next_cursor']
+
+
+def test_without_limit_returns_every_defect_with_total(client):
+    page = client.get('/api/defects').get_json()
+
+    assert page['total'] == NUM_PENDING
+    assert page['count'] == NUM_PENDING
+    assert page['next_cursor'] is None
+    assert [d['defect_id'] for d in page['defects']] == list(range(1, NUM_PENDING + 1))
+    assert page['defects'][0]['location_name'] == '구역 C'
+
+
+def test_created_pages_cover_every_defect_once(client):
+    pages = fetch_all_pages(client, limit=10)
+
+    assert [page['count'] for page in pages] == [10, 10, 5]
+    assert all(page['total'] == NUM_PENDING for page in pages)
+    assert [d['defect_id'] for page in pages for d in page['defects']] == list(range(1, NUM_PENDING + 1))
+
+
+def test_severity_pages_are_in_descending_order(client):
+    pages = fetch_all_pages(client, limit=7, sort='severity', fields='defect_id,severity_score')
+    defects = [d for page in pages for d in page['defects']]
+
+    assert sorted(d['defect_id'] for d in defects) == list(range(1, NUM_PENDING + 1))
+    keys = [(d['severity_score'], d['defect_id']) for d in defects]
+    assert keys == sorted(keys, reverse=True)
+    assert set(defects[0]) == {'defect_id', 'severity_score'}
+
+
+def test_invalid_cursor_and_limit_are_rejected(client):
+    assert client.get('/api/defects', query_string={'cursor': 'not-a-cursor'}).status_code == 400
+    assert client.get('/api/defects', query_string={'limit': 0}).status_code == 400
+    assert client.get('/api/defects', query_string={'fields': 'defect_id,nope'}).status_code == 400
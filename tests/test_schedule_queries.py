@@ -0,0 +1,92 @@
+"""
+GET /api/schedules/<batch_id> 쿼리 수 회귀 테스트
+
+- 작업 + 용접공 + 결함은 조인 쿼리 한 번 → 작업 수가 늘어도 쿼리 수는 그대로여야 함 (N+1 재발 방지)
+- DB 설정은 conftest.py
+
+실행 방법:
+    python -m pytest tests
+"""
+
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models import (
+    MasterDataVersion, Location, SetupType, Skill, Welder, Pipe, Defect, ScheduleBatch, ScheduleJob
+)
+
+SESSION_START = datetime(2025, 11, 18, 9, 0)
+
+
+def add_batch(batch_id, num_jobs, first_id):
+    """배치 하나 + 작업 num_jobs 개 (작업마다 결함 하나, 용접공 3명 번갈아)"""
+    db.session.add(ScheduleBatch(batch_id=batch_id, target_date=date(2025, 11, 18), target_session='morning',
+                                 status='draft'))
+    for k in range(num_jobs):
+        defect_id = first_id + k
+        db.session.add(Pipe(pipe_id=defect_id, material='탄소강', current_location_id=2))
+        db.session.add(Defect(defect_id=defect_id, pipe_id=defect_id, location_id=2 + k % 3, defect_type=k % 7,
+                              p_in=0.5, p_out=0.3, required_skill_id=1, setup_type_id=1, priority_factor=1,
+                              rework_time=30, status='pending'))
+        db.session.add(ScheduleJob(job_id=defect_id, batch_id=batch_id, welder_id=1 + k % 3, defect_id=defect_id,
+                                   job_order=k + 1,
+                                   estimated_start_time=SESSION_START + timedelta(minutes=k),
+                                   estimated_end_time=SESSION_START + timedelta(minutes=k + 30)))
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+        db.session.add(MasterDataVersion(id=1, version=1))
+        for location_id, name in enumerate('ABCDEFG', start=1):
+            db.session.add(Location(location_id=location_id, location_name=f'구역 {name}'))
+        db.session.add(SetupType(setup_type_id=1, setup_name='SMAW', setup_cost_minutes=10))
+        db.session.add(Skill(skill_id=1, process='SMAW', position='1G', position_level=1, material='탄소강'))
+        for welder_id in range(1, 4):
+            db.session.add(Welder(welder_id=welder_id, welder_name=f'용접공{welder_id}', current_location_id=1,
+                                  status='available', shift_end_time=datetime(2025, 11, 18, 18, 0)))
+
+        add_batch(1, 3, first_id=1)
+        add_batch(2, 60, first_id=100)
+        db.session.commit()
+
+        yield app
+
+        db.session.remove()
+        db.drop_all()
+
+
+def count_queries(app, client, url):
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert response.status_code == 200
+    return len(queries), response.get_json()
+
+
+def test_schedule_response_query_count_does_not_grow_with_jobs(app):
+    client = app.test_client()
+    client.get('/api/schedules/1')  # 기준정보 캐시 채우기
+
+    small_count, small = count_queries(app, client, '/api/schedules/1')
+    large_count, large = count_queries(app, client, '/api/schedules/2')
+
+    assert small['total_jobs'] == 3
+    assert large['total_jobs'] == 60
+    assert large['jobs'][0]['welder_name'] == '용접공1'
+    assert small_count == large_count
@@ -0,0 +1,83 @@
+"""
+defects.severity_score 유지 테스트
+
+- ORM 으로 저장(추가/수정)할 때마다 calculate_severity_score 값으로 다시 계산
+- severity_scores (numpy) 는 calculate_severity_score 와 같은 값
+- ORM 을 안 거친 벌크 UPDATE 로 어긋난 값은 recompute_severity_scores 가 바로잡음 (dry_run 은 세기만)
+
+실행 방법:
+    python -m pytest tests
+"""
+
+import pytest
+from sqlalchemy import update
+from app import create_app
+from app.extensions import db
+from app.models import MasterDataVersion, Location, SetupType, Skill, Pipe, Defect
+from app.services.objective import calculate_severity_score, severity_scores, CRITICAL_DEFECT_TYPES
+from app.services.severity import recompute_severity_scores
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+        db.session.add(MasterDataVersion(id=1, version=1))
+        db.session.add(Location(location_id=2, location_name='구역 B'))
+        db.session.add(SetupType(setup_type_id=1, setup_name='SMAW', setup_cost_minutes=10))
+        db.session.add(Skill(skill_id=1, process='SMAW', position='1G', position_level=1, material='탄소강'))
+        for defect_id in range(1, 15):
+            db.session.add(Pipe(pipe_id=defect_id, material='탄소강', current_location_id=2))
+            db.session.add(Defect(defect_id=defect_id, pipe_id=defect_id, location_id=2, defect_type=defect_id % 7,
+                                  p_in=(defect_id % 5) / 5, p_out=(defect_id % 3) / 3, required_skill_id=1,
+                                  setup_type_id=1, priority_factor=1 + defect_id % 4, rework_time=30,
+                                  status='pending'))
+        db.session.commit()
+
+        yield app
+
+        db.session.remove()
+        db.drop_all()
+
+
+def test_orm_saves_keep_severity_score_current(app):
+    with app.app_context():
+        for defect in Defect.query.all():
+            assert defect.severity_score == pytest.approx(calculate_severity_score(defect))
+
+    response = app.test_client().patch('/api/defects/4', json={'priority_factor': 7})
+    assert response.status_code == 200
+
+    with app.app_context():
+        defect = db.session.get(Defect, 4)
+        assert defect.severity_score == pytest.approx(calculate_severity_score(defect))
+        assert response.get_json()['severity_score'] == round(defect.severity_score, 2)
+
+
+def test_vectorized_scores_match_single_defect_formula(app):
+    with app.app_context():
+        defects = Defect.query.order_by(Defect.defect_id).all()
+        assert any(d.defect_type in CRITICAL_DEFECT_TYPES for d in defects)
+
+        scores = severity_scores(
+            [d.defect_type for d in defects], [d.p_in for d in defects], [d.p_out for d in defects],
+            [d.priority_factor for d in defects]
+        )
+        assert list(scores) == pytest.approx([calculate_severity_score(d) for d in defects])
+
+
+def test_recompute_fixes_scores_written_around_the_orm(app):
+    with app.app_context():
+        # ORM 이벤트를 안 거치는 벌크 UPDATE → 점수가 어긋남
+        db.session.execute(update(Defect).where(Defect.defect_id <= 5).values(priority_factor=9))
+        db.session.commit()
+
+        assert recompute_severity_scores(chunk_size=4, dry_run=True) == (14, 5)
+        assert recompute_severity_scores(chunk_size=4) == (14, 5)
+        assert recompute_severity_scores(chunk_size=4) == (14, 0)
+
+        db.session.expire_all()
+        for defect in Defect.query.all():
+            assert defect.severity_score == pytest.approx(calculate_severity_score(defect))